@@ -0,0 +1,102 @@
+"""Benchmark the client-side hash join executor.
+
+By default this times the join pipeline itself on synthetic data, both held
+in memory and with the build side forced to spill to disk. Given a SQLAlchemy
+URL and the names of two existing tables, it also compares the driver's own
+join against `paradox_hash_join=True` on the real thing.
+
+    python benchmarks/bench_hash_join.py --probe-rows 1000000 --build-rows 100000
+    python benchmarks/bench_hash_join.py --url "paradox+pyodbc://@dsn" --probe orders --build customers \\
+        --probe-key customer_id --build-key id
+"""
+# coding=utf-8
+
+from argparse import ArgumentParser
+from random import Random
+from time import perf_counter
+from typing import Any, Callable, Iterator, Tuple
+
+from sqlalchemy_paradox.emulation import HashJoin, HashJoinPipeline
+
+
+def timed(label: str, fn: Callable[[], Any]) -> Any:
+    """Run the supplied callable, printing how long it took."""
+    start = perf_counter()
+    ret_val = fn()
+    print(f"{label:<40} {perf_counter() - start:>10.3f}s")
+    return ret_val
+
+
+def synthetic(probe_rows: int, build_rows: int, seed: int = 0) -> Tuple[list, list]:
+    """Generate a fact-like probe side and a dimension-like build side."""
+    rng = Random(seed)
+    build = [(key, f"name-{key}", rng.random()) for key in range(build_rows)]
+    probe = [(row, rng.randrange(build_rows), rng.randrange(1000)) for row in range(probe_rows)]
+    return probe, build
+
+
+def pipeline(probe: list, build: list, budget: int) -> HashJoinPipeline:
+    """Join probe.1 to build.0, selecting probe.0, build.1 and probe.2."""
+
+    def probe_rows() -> Iterator[Tuple[Any, ...]]:
+        return iter(probe)
+
+    def build_rows() -> Iterator[Tuple[Any, ...]]:
+        return iter(build)
+
+    return HashJoinPipeline(
+        probe_rows,
+        [HashJoin(build_rows, build_key=[0], probe_key=[1], width=3, budget=budget)],
+        outputs=[0, 4, 2],
+        order_by=[],
+    )
+
+
+def bench_synthetic(probe_rows: int, build_rows: int) -> None:
+    """Time the join pipeline on synthetic rows."""
+    probe, build = timed("generate synthetic rows", lambda: synthetic(probe_rows, build_rows))
+
+    count = timed("hash join (in memory)", lambda: sum(1 for _ in pipeline(probe, build, len(build)).execute()))
+    print(f"{'joined rows':<40} {count:>10}")
+
+    timed("hash join (spilled to disk)", lambda: sum(1 for _ in pipeline(probe, build, len(build) // 10).execute()))
+
+
+def bench_database(url: str, probe: str, build: str, probe_key: str, build_key: str) -> None:
+    """Time the driver's join against the client-side hash join on real tables."""
+    from sqlalchemy import MetaData, Table, create_engine, select
+
+    engine = create_engine(url)
+    metadata = MetaData()
+    left = Table(probe, metadata, autoload_with=engine)
+    right = Table(build, metadata, autoload_with=engine)
+    statement = select([left, right]).select_from(left.join(right, left.c[probe_key] == right.c[build_key]))
+
+    with engine.connect() as connection:
+        timed("driver join", lambda: len(connection.execute(statement).fetchall()))
+        timed(
+            "client-side hash join",
+            lambda: len(connection.execution_options(paradox_hash_join=True).execute(statement).fetchall()),
+        )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--probe-rows", type=int, default=1000000)
+    parser.add_argument("--build-rows", type=int, default=100000)
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--probe", default=None)
+    parser.add_argument("--build", default=None)
+    parser.add_argument("--probe-key", default=None)
+    parser.add_argument("--build-key", default=None)
+    args = parser.parse_args()
+
+    bench_synthetic(args.probe_rows, args.build_rows)
+
+    if args.url:
+        bench_database(args.url, args.probe, args.build, args.probe_key, args.build_key)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Benchmark the semi-join rewrites of correlated EXISTS / NOT EXISTS.
+
+Creates two scratch tables in the database at the given SQLAlchemy URL, fills
+them with generated rows, and then times the same (NOT) EXISTS query with the
+driver's correlated evaluation, the uncorrelated `IN (SELECT ...)` rewrite and
+the inlined-keys rewrite. The scratch tables are dropped afterwards.
+
+    python benchmarks/bench_semijoin.py --url "paradox+pyodbc://@dsn" --outer-rows 20000 --inner-rows 5000
+"""
+# coding=utf-8
+
+from argparse import ArgumentParser
+from random import Random
+from time import perf_counter
+from typing import Any, Callable
+
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, exists, select
+
+
+def timed(label: str, fn: Callable[[], Any]) -> Any:
+    """Run the supplied callable, printing how long it took."""
+    start = perf_counter()
+    ret_val = fn()
+    print(f"{label:<40} {perf_counter() - start:>10.3f}s")
+    return ret_val
+
+
+def main() -> None:
+    """Run the benchmark."""
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", required=True)
+    parser.add_argument("--outer-rows", type=int, default=20000)
+    parser.add_argument("--inner-rows", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = Random(args.seed)
+    engine = create_engine(args.url)
+    metadata = MetaData()
+
+    # Paradox table names are limited to 8 characters
+    outer = Table("sjouter", metadata, Column("id", Integer), Column("val", Integer))
+    inner = Table("sjinner", metadata, Column("ref", Integer), Column("qty", Integer))
+
+    metadata.create_all(engine)
+    try:
+        with engine.connect() as connection:
+            timed(
+                "generate rows",
+                lambda: (
+                    connection.execute(
+                        outer.insert(), [{"id": key, "val": rng.randrange(100)} for key in range(args.outer_rows)]
+                    ),
+                    connection.execute(
+                        inner.insert(),
+                        [
+                            {"ref": rng.randrange(args.outer_rows * 2), "qty": rng.randrange(100)}
+                            for _ in range(args.inner_rows)
+                        ],
+                    ),
+                ),
+            )
+
+            semijoin = exists().where(inner.c.ref == outer.c.id).where(inner.c.qty > 50)
+
+            for label, predicate in (("EXISTS", semijoin), ("NOT EXISTS", ~semijoin)):
+                for strategy in (False, "subquery", "keys"):
+                    statement = select([outer.c.id]).where(predicate).execution_options(paradox_semijoin=strategy)
+                    count = timed(
+                        f"{label} ({strategy or 'correlated'})",
+                        lambda: len(connection.execute(statement).fetchall()),
+                    )
+                    print(f"{'rows':<40} {count:>10}")
+    finally:
+        metadata.drop_all(engine)
+
+
+if __name__ == "__main__":
+    main()
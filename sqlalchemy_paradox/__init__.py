@@ -1,7 +1,6 @@
 """SQLAlchemy support for Borland / Corel Paradox databases."""
 # coding=utf-8
 
-import pyodbc
 from sqlalchemy.dialects import registry as _registry
 
 from .base import (
@@ -12,6 +11,7 @@ from .base import (
     Time,
     cl_in,
     BigInt,
+    is_blob,
     Double,
     Binary,
     Decimal,
@@ -22,13 +22,25 @@ from .base import (
     LongVarChar,
     LongVarBinary,
 )
+from .orm import automap_base, defer_blob_columns
+from .lazy import LazyParadoxMetaData
+from .watcher import TableChange, SchemaWatcher
 
 __version__ = "0.0.1"
 
-pyodbc.pooling = True  # Makes the ODBC overhead a little more manageable
+try:
+    import pyodbc
+except ImportError:  # The paradox+native driver doesn't need it
+    pass
+else:
+    pyodbc.pooling = True  # Makes the ODBC overhead a little more manageable
+
 _registry.register(
     "paradox.pyodbc", "sqlalchemy_paradox.pyodbc", "ParadoxDialect_pyodbc"
 )
+_registry.register(
+    "paradox.native", "sqlalchemy_paradox.native", "ParadoxDialect_native"
+)
 
 __all__ = (
     "nc",
@@ -38,6 +50,7 @@ __all__ = (
     "Time",
     "cl_in",
     "BigInt",
+    "is_blob",
     "Double",
     "Binary",
     "Decimal",
@@ -48,4 +61,9 @@ __all__ = (
     "__version__",
     "LongVarChar",
     "LongVarBinary",
+    "TableChange",
+    "SchemaWatcher",
+    "automap_base",
+    "defer_blob_columns",
+    "LazyParadoxMetaData",
 )
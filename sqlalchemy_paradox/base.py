@@ -1,26 +1,61 @@
 """SQLAlchemy Support for the Borland / Corel Paradox databases."""
 # coding=utf-8
 
-from sqlalchemy import pool, types as sqla_types
+from sqlalchemy import and_, or_, event, pool, types as sqla_types, MetaData
 from sqlalchemy.util import raise_
-from sqlalchemy.exc import SQLAlchemyError, UnsupportedCompilationError, CompileError
+from sqlalchemy.exc import SQLAlchemyError, UnsupportedCompilationError, CompileError, InvalidRequestError
 from sqlalchemy.sql.sqltypes import STRINGTYPE
 from sqlalchemy.sql import (
     compiler,
     elements,
+    visitors,
     functions,
     operators as sqla_operators,
 )
-from sqlalchemy.sql import CompoundSelect
-from sqlalchemy.engine import default, reflection
-from typing import Any, Set, List, Dict, Tuple, Iterable, Callable, Optional
+from sqlalchemy.sql import Select, CompoundSelect
+from sqlalchemy.sql.selectable import Exists, FromClause, FromGrouping
+from sqlalchemy.sql.ddl import CreateTable, DropTable, CreateIndex
+from sqlalchemy.engine import Engine, default, reflection
+from typing import Any, Set, List, Dict, Tuple, Iterable, Iterator, Callable, Optional
 from datetime import date, time, datetime
 from decimal import Decimal as PyDecimal
 from numbers import Number
 from unicodedata import normalize
+from itertools import chain
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
-
-import pyodbc
+from weakref import WeakKeyDictionary
+import io
+import os
+import threading
+
+try:
+    import pyodbc
+except ImportError:  # Only the native driver (see native.py) works without pyodbc
+    pyodbc = None
+
+from . import pxfile, schema_cache
+from .schema_cache import ReflectionCache
+from .blobs import BlobReader, BlobParameters
+from .watcher import DATA, CREATED, DROPPED, TableChange, SchemaWatcher
+from .emulation import (
+    HashJoin,
+    conjuncts,
+    join_chain,
+    stream_rows,
+    WindowFunction,
+    DDLBatch,
+    SemiJoinKeys,
+    HashJoinPipeline,
+    ParallelCompound,
+    WindowEmulation,
+    GroupedAggregation,
+    unwrap_element,
+    order_direction,
+    compound_branches,
+    referenced_tables,
+)
 
 
 def normalize_caseless(text: Any) -> str:
@@ -349,6 +384,31 @@ ischema_names = {
     "TIMESTAMP": Timestamp,
 }
 
+# The field types whose values live in a table's .MB file rather than in its records
+blob_type_names = {"BINARY", "FORMATTEDMEMO", "GRAPHIC", "MEMO", "OLE"}
+
+
+def is_blob(column: Any) -> bool:
+    """Check whether a column's values are stored in its table's `.MB` file.
+
+    Reflected columns are marked as such (in `info["paradox_blob"]`), other
+    columns are judged by their type: binary, or text without a length.
+    """
+    for base_column in getattr(column, "base_columns", (column,)):
+        info = getattr(base_column, "info", dict())
+        if "paradox_blob" in info:
+            if info["paradox_blob"]:
+                return True
+            continue
+
+        column_type = getattr(base_column, "type", None)
+        if isinstance(column_type, (LongVarBinary, sqla_types.LargeBinary)):
+            return True
+        if isinstance(column_type, sqla_types.Text) and not column_type.length:
+            return True
+
+    return False
+
 
 sqla_functions = {
     functions.coalesce: "COALESCE",
@@ -382,11 +442,270 @@ class ParadoxTypeCompiler(compiler.GenericTypeCompiler):
 class ParadoxExecutionContext(default.DefaultExecutionContext):
     """Paradox Execution Context."""
 
+    # Set by pre_exec when a statement has been evaluated without the driver
+    client_cursor: Optional[Any] = None
+
+    @property
+    def _result_names(self) -> List[str]:
+        """The names of the compiled statement's result columns."""
+        return [column[0] for column in self.compiled._result_columns]
+
+    @property
+    def _bind_values(self) -> Dict[Any, Any]:
+        """The values being executed with, keyed by their bind parameter objects."""
+        return {
+            bindparam: self.compiled_parameters[0].get(name)
+            for bindparam, name in self.compiled.bind_names.items()
+        }
+
+    def _execute_aside(self, statement, cursor=None):
+        """Execute a statement derived from the one being executed, on a separate cursor.
+
+        Any bind parameters shared with the original statement are given the values
+        the original is being executed with.
+        """
+        compiled = statement.compile(dialect=self.dialect)
+        values = self._bind_values
+        processors = compiled._bind_processors
+        parameters = dict()
+
+        for bindparam, name in compiled.bind_names.items():
+            value = values.get(bindparam, bindparam.effective_value)
+            parameters[name] = processors[name](value) if name in processors else value
+
+        if cursor is None:
+            cursor = self._dbapi_connection.cursor()
+
+        self.dialect.do_execute(cursor, compiled.string, parameters)
+        return cursor
+
+    def pre_exec(self):
+        """Evaluate statements that bypass the driver's own execution of them."""
+        self._inline_semijoin_keys()
+
+        plan = self._plan_parallel_compound() or self._plan_hash_join()
+        if plan is not None:
+            self.client_cursor = plan.cursor(self.cursor, self._result_names)
+
+    def _inline_semijoin_keys(self):
+        """Fetch the inner keys of any semi-joins compiled with the "keys" strategy.
+
+        The keys are inlined into the statement as literal IN lists, which (like
+        everything else in the statement) gets %-formatted by `do_execute`. Each
+        set of an executemany's parameters could match different keys, so those
+        can't be inlined into the one statement.
+        """
+        jobs = getattr(self.compiled, "semijoin_keys", None)
+        if not jobs:
+            return
+        if self.executemany:
+            raise InvalidRequestError(
+                'The "keys" semi-join strategy can\'t be used with multiple sets of parameters, '
+                'use the "subquery" strategy instead'
+            )
+
+        parameters = self.parameters[0] if self.parameters else dict()
+        for job in jobs:
+            cursor = self._dbapi_connection.cursor()
+            try:
+                self.dialect.do_execute(cursor, job.statement, parameters)
+                keys = [row[0] for row in stream_rows(cursor, self.dialect.client_fetch_size)]
+            finally:
+                cursor.close()
+
+            predicate = job.predicate(keys, self.dialect.render_literal).replace("%", "%%")
+            self.statement = self.statement.replace(job.token, predicate)
+
+    def post_exec(self):
+        """Swap in a client-side cursor for statements the driver can't fully evaluate."""
+        if self.isddl or (self.statement or "").lstrip().casefold().startswith(("create", "drop", "alter")):
+            # Whatever the DDL changed, the connection's table listing may no longer match it
+            self.dialect._drop_table_listing(self.root_connection)
+
+        plan = getattr(self.compiled, "client_plan", None)
+        if self.client_cursor is not None:
+            self.cursor = self.client_cursor
+        elif plan is not None:
+            self.cursor = plan.cursor(self.cursor, self._result_names)
+
+    def _plan_parallel_compound(self) -> Optional[ParallelCompound]:
+        """Plan the concurrent execution of a UNION's branches, if it was asked for.
+
+        With the `paradox_parallel_union` execution option set (to True, or to a
+        maximum number of workers), each branch of a top-level UNION / UNION ALL
+        is executed as its own statement on a separate connection (from outside
+        the engine's pool, see `ParadoxDialect._worker_engine`) and the results
+        are merged on the client, rather than having the driver evaluate (and
+        materialize) the branches one after another.
+        """
+        workers = self.execution_options.get("paradox_parallel_union", False)
+        statement = getattr(self.compiled, "statement", None)
+
+        if not workers or not isinstance(statement, CompoundSelect):
+            return None
+
+        branches = compound_branches(statement)
+        if not branches or len(branches) < 2:
+            return None
+
+        engine = self.dialect._worker_engine(self.root_connection.engine)
+        values = self._bind_values
+
+        def branch_runner(branch) -> Callable[[], List[Any]]:
+            """Create a callable that executes the supplied branch on its own connection."""
+            compiled = branch.order_by(None).compile(dialect=self.dialect)
+            parameters = {
+                name: values.get(bindparam, bindparam.effective_value)
+                for bindparam, name in compiled.bind_names.items()
+            }
+
+            def run_branch() -> List[Any]:
+                """Execute the branch and fetch all of its raw rows."""
+                with engine.connect() as connection:
+                    result = connection.execute(compiled, parameters)
+                    try:
+                        return result.cursor.fetchall()
+                    finally:
+                        result.close()
+
+            return run_branch
+
+        return ParallelCompound(
+            [branch_runner(branch) for branch in branches],
+            distinct=statement.keyword == CompoundSelect.UNION,
+            order_by=self.compiled.compound_order_by,
+            workers=len(branches) if workers is True else int(workers),
+        )
+
+    def _plan_hash_join(self) -> Optional[HashJoinPipeline]:
+        """Plan a client-side hash join of a multi-table SELECT, if it was asked for.
+
+        With the `paradox_hash_join` execution option set, a SELECT of plain
+        columns from a left-deep chain of inner / left outer equi-joins is split
+        into one single-table SELECT per table, with the WHERE clause's
+        single-table filters and only the needed columns pushed down into each.
+        The first table's rows are streamed from the driver and joined against
+        hash tables built from the others, which are spilled to temporary files
+        if they hold more than `paradox_hash_join_budget` rows.
+        """
+        statement = getattr(self.compiled, "statement", None)
+
+        if any(
+            (
+                not self.execution_options.get("paradox_hash_join", False),
+                not isinstance(statement, Select),
+                getattr(self.compiled, "client_plan", None) is not None,
+            )
+        ) or any(
+            (
+                statement._group_by_clause.clauses,
+                statement._having is not None,
+                statement._distinct,
+                len(statement.froms) != 1,
+            )
+        ):
+            return None
+
+        tables = join_chain(statement.froms[0])
+        if tables is None:
+            return None
+
+        outer_tables = {table for table, _, outer in tables if outer}
+        filters: Dict[Any, List[Any]] = {table: list() for table, _, _ in tables}
+
+        for condition in conjuncts(statement._whereclause):
+            referenced = referenced_tables(condition)
+            # Filtering an outer-joined table before the join would change the result
+            if len(referenced) > 1 or referenced & outer_tables:
+                return None
+            filters[next(iter(referenced), tables[0][0])].append(condition)
+
+        selected = [unwrap_element(column) for column in statement.inner_columns]
+        if not all(
+            isinstance(column, elements.ColumnClause) and column.table in filters for column in selected
+        ):
+            return None
+
+        order_by = list()
+        for clause in statement._order_by_clause.clauses:
+            expression, descending = order_direction(clause)
+            pos = ParadoxSQLCompiler._selected_position(statement, expression)
+            if pos is None:
+                return None
+            order_by.append((pos, descending))
+
+        # Work out which columns of each table are needed, and where each
+        # of them will end up in the rows produced by the pipeline
+        projections: Dict[Any, List[Any]] = {table: list() for table, _, _ in tables}
+        for column in selected:
+            ParadoxSQLCompiler._projection_position(projections[column.table], column)
+        for _, pairs, _ in tables:
+            for earlier, column in pairs:
+                ParadoxSQLCompiler._projection_position(projections[earlier.table], earlier)
+                ParadoxSQLCompiler._projection_position(projections[column.table], column)
+
+        offsets, width = dict(), 0
+        for table, _, _ in tables:
+            offsets[table] = width
+            width += len(projections[table])
+
+        def position(column) -> int:
+            """The position of the supplied column in the pipeline's joined rows."""
+            return offsets[column.table] + ParadoxSQLCompiler._projection_position(
+                projections[column.table], column
+            )
+
+        def table_select(table):
+            """A SELECT of the needed columns of the supplied table, with its filters pushed down."""
+            return Select(
+                projections[table],
+                whereclause=and_(*filters[table]) if filters[table] else None,
+                from_obj=[table],
+            )
+
+        fetch_size = self.dialect.client_fetch_size
+        budget = int(self.execution_options.get("paradox_hash_join_budget", self.dialect.hash_join_budget))
+
+        def fetch(table) -> Callable[[], Iterator[Tuple[Any, ...]]]:
+            """Create a callable that streams the supplied table's pushed-down SELECT."""
+            return lambda: stream_rows(self._execute_aside(table_select(table)), fetch_size)
+
+        # The first table is executed straight away, on the context's own cursor
+        probe = stream_rows(self._execute_aside(table_select(tables[0][0]), self.cursor), fetch_size)
+
+        return HashJoinPipeline(
+            lambda: probe,
+            [
+                HashJoin(
+                    fetch(table),
+                    build_key=[projections[table].index(column) for _, column in pairs],
+                    probe_key=[position(earlier) for earlier, _ in pairs],
+                    width=len(projections[table]),
+                    outer=outer,
+                    budget=budget,
+                )
+                for table, pairs, outer in tables[1:]
+            ],
+            outputs=[position(column) for column in selected],
+            order_by=order_by,
+        )
+
     def get_lastrowid(self):
-        """Get the id of the last inserted row."""
-        # self.cursor.execute("SELECT @@identity AS lastrowid")
-        # return self.cursor.fetchone()[0]
-        super(ParadoxExecutionContext, self).get_lastrowid()
+        """Get the id of the row just inserted, if it's an AutoIncrement primary key, from the table's .PX index.
+
+        The driver has no way to report it, but a new AutoIncrement key is the
+        table's highest, so it's the last key in the index (see
+        `ParadoxDialect.last_key`). Only done with the dialect's
+        `lastrowid_from_index`, and only if the table's files can be reached
+        from here; otherwise there's no telling, and None is returned.
+        """
+        if not self.dialect.lastrowid_from_index or not self.isinsert:
+            return None
+        table = self.compiled.statement.table
+        column = table._autoincrement_column
+        if column is None or list(table.primary_key.columns)[:1] != [column]:
+            return None
+        return self.dialect.last_key(self.root_connection, table.name)
 
 
 class ParadoxSQLCompiler(compiler.SQLCompiler):
@@ -395,6 +714,16 @@ class ParadoxSQLCompiler(compiler.SQLCompiler):
     created_tables: Dict[str, Dict[str, Any]] = dict()
     deferred: Set[str] = set()
 
+    # Set when the compiled statement is only a projection of the requested
+    # query, the rest of which will be computed on the client
+    client_plan: Optional[Any] = None
+
+    # The (zero-indexed position, descending) ORDER BY of a top-level compound select
+    compound_order_by: List[Tuple[int, bool]] = list()
+
+    # Semi-joins whose inner keys have to be fetched (and inlined) before execution
+    semijoin_keys: List[SemiJoinKeys] = list()
+
     intersolv_type_map: Dict[str, str] = {
         "ARRAY": None,
         "BIGINT": "Long Integer",
@@ -858,33 +1187,50 @@ class ParadoxSQLCompiler(compiler.SQLCompiler):
             ret_val = f" ORDER BY {dispatch}"
             return ret_val
 
-        # Attempt to find the columns numeric position in the selectable
+        positions = self._compound_order_positions(select, **kw)
+
+        # Keep a record of the top-level compound select's ordering so that it
+        # can also be applied to branches that were executed separately
+        if len(self.stack) == 1:
+            self.compound_order_by = [
+                (col_index - 1, sort_order.casefold() == "desc")
+                for col_index, sort_order in positions
+            ]
+
+        return " ORDER BY " + ", ".join(
+            f"{col_index} {sort_order}".strip() for col_index, sort_order in positions
+        )
+
+    def _compound_order_positions(self, select, **kw) -> List[Tuple[int, str]]:
+        """Resolve a compound select's ORDER BY into numeric column positions."""
         # noinspection PyTypeChecker
         column_order: List[Tuple[int, str]] = list(enumerate(map(str, select.columns)))
-        col_index = next(
-            filter(lambda col: col[1] in dispatch, column_order), (-1, -1)
-        )[0]
+        positions = list()
 
-        sort_order = ""
+        for clause in select._order_by_clause.clauses:
+            dispatch = clause._compiler_dispatch(self, **kw)
 
-        if any(
-            (
-                dispatch.casefold().endswith(" desc"),
-                dispatch.casefold().endswith(" asc"),
-            )
-        ):
-            sort_order = dispatch.split(" ")[-1]
+            # Attempt to find the column's numeric position in the selectable
+            col_index = next(
+                filter(lambda col: col[1] in dispatch, column_order), (-1, -1)
+            )[0]
 
-        # Compensate for python's zero-indexing and then take the highest column number
-        # which will either be the correct one, or the index would have come back as -1
-        # which means we'll use 1 instead
-        col_index = max((col_index + 1, 1))
-        ret_val = f" ORDER BY {col_index}"
+            sort_order = ""
 
-        if sort_order:
-            ret_val += f" {sort_order}"
+            if any(
+                (
+                    dispatch.casefold().endswith(" desc"),
+                    dispatch.casefold().endswith(" asc"),
+                )
+            ):
+                sort_order = dispatch.split(" ")[-1]
 
-        return ret_val
+            # Compensate for python's zero-indexing and then take the highest column number
+            # which will either be the correct one, or the index would have come back as -1
+            # which means we'll use 1 instead
+            positions.append((max((col_index + 1, 1)), sort_order))
+
+        return positions
 
     def visit_compound_select(
         self, cs, asfrom=False, parens=True, compound_index=0, **kwargs
@@ -966,6 +1312,11 @@ class ParadoxSQLCompiler(compiler.SQLCompiler):
         **kwargs,
     ) -> str:
         """Emit correctly formatted SELECT statements."""
+        plan = None
+        if not any((asfrom, self.stack, compound_index)):
+            select = self._omit_blobs(self._rewrite_semijoins(select))
+            plan = self._plan_grouped_aggregation(select) or self._plan_window_emulation(select)
+
         ret_val = super(ParadoxSQLCompiler, self).visit_select(
             select,
             asfrom,
@@ -990,8 +1341,411 @@ class ParadoxSQLCompiler(compiler.SQLCompiler):
                 )
             )
 
+        if plan is not None:
+            # The requested statement has been compiled purely so that its result
+            # columns get recorded, what actually gets sent to the driver is the
+            # plan's projection
+            result_columns = list(self._result_columns)
+            ret_val = self.process(plan.statement, **kwargs)
+            self._result_columns = result_columns
+            self.client_plan = plan
+
         return ret_val
 
+    def _omit_blobs(self, select):
+        """Leave the Memo / BLOB columns out of whole-table SELECTs, if asked to.
+
+        With the `paradox_omit_blobs` execution option set, `select([table])`
+        selects all of the table's columns but those whose values would have to
+        be read from its `.MB` file. Blob columns selected explicitly are kept.
+        """
+        if not select._execution_options.get("paradox_omit_blobs", False):
+            return select
+
+        columns = list()
+        omitted = False
+        for column in select._raw_columns:
+            if isinstance(column, FromClause):
+                kept = [table_column for table_column in column.c if not is_blob(table_column)]
+                if kept and len(kept) < len(column.c):
+                    columns.extend(kept)
+                    omitted = True
+                    continue
+            columns.append(column)
+
+        return select.with_only_columns(columns) if omitted else select
+
+    def _rewrite_semijoins(self, select):
+        """Rewrite the correlated (NOT) EXISTS predicates in a SELECT's WHERE clause as semi-joins.
+
+        The Intersolv engine re-runs a correlated subquery for every row of the
+        outer query. An EXISTS that is AND-ed into the WHERE clause and correlated
+        on a single equality is instead rendered as `outer IN (SELECT inner ...)`
+        (or, for NOT EXISTS, `outer IS NULL OR outer NOT IN (...)` with the NULL
+        inner keys filtered out), which the driver only has to evaluate once.
+
+        The rewrite is opt-in. The `paradox_semijoin` execution option (or the
+        dialect's `semijoin_strategy`) selects the strategy: "subquery" renders
+        the above, "keys" fetches the distinct inner keys before the statement is
+        executed and inlines them as literal IN lists, and anything else
+        (including the default, None) leaves EXISTS alone.
+        """
+        strategy = select._execution_options.get("paradox_semijoin", self.dialect.semijoin_strategy)
+        if strategy not in ("subquery", "keys") or select._whereclause is None:
+            return select
+
+        outer_tables = set(chain.from_iterable(from_._from_objects for from_ in select.froms))
+        predicates = conjuncts(select._whereclause)
+        rewritten = [self._rewrite_semijoin(predicate, outer_tables, strategy) for predicate in predicates]
+
+        if all(new is None for new in rewritten):
+            return select
+
+        select = select._generate()
+        select._whereclause = and_(*(new if new is not None else old for new, old in zip(rewritten, predicates)))
+        return select
+
+    def _rewrite_semijoin(self, predicate, outer_tables: Set[Any], strategy: str) -> Optional[Any]:
+        """Rewrite a single (NOT) EXISTS predicate, if it is a simple enough semi-join."""
+        predicate = unwrap_element(predicate)
+        # Negating a grouped EXISTS compares it with false instead
+        negate = isinstance(predicate, elements.UnaryExpression) and predicate.operator in (
+            sqla_operators.inv,
+            sqla_operators.isfalse,
+        )
+        exists = unwrap_element(predicate.element) if negate else predicate
+
+        if not isinstance(exists, Exists):
+            return None
+
+        inner = unwrap_element(exists.element)
+        if isinstance(inner, FromGrouping):
+            # exists(select(...)) groups its SELECT the way a FROM list would
+            inner = inner.element
+        if not isinstance(inner, Select) or any(
+            (inner._group_by_clause.clauses, inner._having is not None, inner._limit_clause, inner._offset_clause)
+        ):
+            return None
+
+        # The inner FROM list (joins and all) is kept for the key query, less the outer tables it correlates to
+        inner_froms = [from_ for from_ in inner.froms if not set(from_._from_objects) <= outer_tables]
+        if any(set(from_._from_objects) & outer_tables for from_ in inner_froms):
+            # An inner join to an outer table can't be evaluated on its own
+            return None
+        inner_tables = set(chain.from_iterable(from_._from_objects for from_ in inner_froms))
+        correlation, filters = None, list()
+
+        for condition in conjuncts(inner._whereclause):
+            tables = referenced_tables(condition)
+            if tables <= inner_tables:
+                filters.append(condition)
+                continue
+
+            if correlation is not None or getattr(condition, "operator", None) is not sqla_operators.eq:
+                return None
+
+            left, right = unwrap_element(condition.left), unwrap_element(condition.right)
+            if not all(isinstance(side, elements.ColumnClause) for side in (left, right)):
+                return None
+
+            if left.table in outer_tables and right.table in inner_tables:
+                correlation = (left, right)
+            elif right.table in outer_tables and left.table in inner_tables:
+                correlation = (right, left)
+            else:
+                return None
+
+        if correlation is None:
+            return None
+
+        outer_column, inner_column = correlation
+        if negate:
+            filters.append(inner_column.isnot(None))
+
+        keys = Select([inner_column], whereclause=and_(*filters) if filters else None, from_obj=inner_froms)
+        keys = keys.correlate(None)
+
+        if strategy == "keys":
+            # Render the key query now (so that its bind parameters are
+            # included in the statement's parameters) and leave a token
+            # for the execution context to replace with the fetched keys
+            result_columns = list(self._result_columns)
+            job = SemiJoinKeys(
+                token=f"[PARADOX_SEMIJOIN_{len(self.semijoin_keys)}]",
+                column=self.process(outer_column),
+                statement=self.process(keys),
+                negate=negate,
+                chunk_size=self.dialect.semijoin_chunk_size,
+            )
+            self._result_columns = result_columns
+            self.semijoin_keys = self.semijoin_keys + [job]
+            return elements.literal_column(job.token)
+
+        if negate:
+            return or_(outer_column.is_(None), outer_column.notin_(keys))
+        return outer_column.in_(keys)
+
+    @staticmethod
+    def _selected_position(select, expression) -> Optional[int]:
+        """Find the position of the supplied expression (or label name) in the columns of `select`."""
+        for pos, column in enumerate(select.inner_columns):
+            if isinstance(expression, elements._textual_label_reference):
+                if expression.element in (getattr(column, "name", None), getattr(column, "key", None)):
+                    return pos
+            elif unwrap_element(column).compare(expression) or column is expression:
+                return pos
+        return None
+
+    @staticmethod
+    def _projection_position(projection: List[Any], expression) -> int:
+        """Find (or add) the supplied expression's position in a client plan's projection."""
+        for pos, existing in enumerate(projection):
+            if existing.compare(expression):
+                return pos
+        projection.append(expression)
+        return len(projection) - 1
+
+    @staticmethod
+    def _binary_sorted(clause: Any) -> bool:
+        """Whether the driver sorts a clause's values the way Python compares them, as it does non-text columns."""
+        return isinstance(clause, elements.ColumnClause) and not isinstance(clause.type, sqla_types.String)
+
+    def _plan_grouped_aggregation(self, select) -> Optional[GroupedAggregation]:
+        """Plan a client-side GROUP BY for groupings wider than the driver allows.
+
+        The Intersolv driver refuses to group (or order) by more than 20 columns.
+        When a SELECT exceeds that, the driver is instead asked for a pruned
+        projection of the group keys and aggregate arguments, sorted by as many
+        of the keys as it will allow, and the aggregates listed in
+        `intersolv_aggregate_functions` are computed as the rows stream in.
+
+        Only non-text columns are used to pre-sort the projection. The driver
+        sorts text in the table's sort order, which (for the usual "intl" ones)
+        ignores case and accents, so rows with keys that differ in Python could
+        interleave and a run of them couldn't be flushed as soon as it ended.
+        Text keys are only ever hashed, and if every key is text the groups are
+        all held until the projection has been read in full.
+
+        Returns None if the statement doesn't need (or can't use) the fallback.
+        """
+        group_by = [unwrap_element(clause) for clause in select._group_by_clause.clauses]
+
+        if any(
+            (
+                len(group_by) <= self.dialect.max_group_by_columns,
+                select._having is not None,
+                select._distinct,
+            )
+        ):
+            return None
+
+        # Plain, non-text columns can be used to pre-sort the projection, while
+        # any other expressions can only be hashed, so put those columns first
+        group_by.sort(key=lambda clause: not self._binary_sorted(clause))
+        projection = list(group_by)
+
+        outputs = list()
+        for column in select.inner_columns:
+            column = unwrap_element(column)
+            key = next((pos for pos, clause in enumerate(group_by) if clause.compare(column)), None)
+
+            if key is not None:
+                outputs.append(("key", key))
+                continue
+
+            if not isinstance(column, functions.FunctionElement) or not cl_in(
+                column.name, self.intersolv_aggregate_functions.keys()
+            ):
+                return None
+
+            arguments = list(column.clauses.clauses)
+            if len(arguments) > 1:
+                return None
+
+            argument = unwrap_element(arguments[0]) if arguments else None
+            distinct = isinstance(argument, elements.UnaryExpression) and (
+                argument.operator is sqla_operators.distinct_op
+            )
+            if distinct:
+                argument = unwrap_element(argument.element)
+
+            if argument is None or (
+                isinstance(argument, elements.ColumnClause) and argument.is_literal and argument.name == "*"
+            ):
+                outputs.append(("aggregate", (column.name, None, False)))
+            else:
+                outputs.append(
+                    ("aggregate", (column.name, self._projection_position(projection, argument), distinct))
+                )
+
+        # The final ORDER BY has to be applied to the aggregated rows, so every
+        # one of its elements has to be one of the selected columns
+        order_by = list()
+        for clause in select._order_by_clause.clauses:
+            expression, descending = order_direction(clause)
+            pos = self._selected_position(select, expression)
+            if pos is None:
+                return None
+            order_by.append((pos, descending))
+
+        presorted = min(
+            sum(1 for clause in group_by if self._binary_sorted(clause)),
+            self.dialect.max_order_by_columns,
+        )
+
+        statement = (
+            select.with_only_columns(projection)
+            .select_from(*select.froms)
+            .group_by(None)
+            .order_by(None)
+            .order_by(*group_by[:presorted])
+        )
+
+        return GroupedAggregation(
+            statement,
+            key_count=len(group_by),
+            presorted=presorted,
+            outputs=outputs,
+            order_by=order_by,
+            chunk_size=self.dialect.client_fetch_size,
+        )
+
+    def _plan_window_emulation(self, select) -> Optional[WindowEmulation]:
+        """Plan the client-side evaluation of any window functions in a SELECT.
+
+        Paradox SQL has no window functions at all. Instead, the driver is asked
+        for the statement's rows (plus anything the windows need) ordered by their
+        shared PARTITION BY columns, and ROW_NUMBER, RANK, DENSE_RANK, LAG, LEAD
+        and running SUM/AVG/COUNT/MIN/MAX are computed one partition at a time.
+
+        Returns None if the statement has no window functions, or uses them in a
+        way that can't be emulated.
+        """
+        columns = [unwrap_element(column) for column in select.inner_columns]
+        overs = [column for column in columns if isinstance(column, elements.Over)]
+
+        if not overs or any((select._group_by_clause.clauses, select._having is not None, select._distinct)):
+            return None
+
+        # Window functions buried inside other expressions can't be emulated
+        if any(
+            isinstance(element, elements.Over)
+            for column in columns
+            if not isinstance(column, elements.Over)
+            for element in visitors.iterate(column, {})
+        ):
+            return None
+
+        partition_by = [
+            unwrap_element(clause)
+            for clause in getattr(overs[0].partition_by, "clauses", list())
+        ]
+
+        # Rows can only be streamed partition-by-partition if the driver can sort
+        # them by the partition keys, and every window agrees on what they are
+        if any(
+            (
+                len(partition_by) > self.dialect.max_order_by_columns,
+                not all(isinstance(clause, elements.ColumnClause) for clause in partition_by),
+                any(
+                    len(clauses) != len(partition_by)
+                    or not all(clause.compare(other) for clause, other in zip(clauses, partition_by))
+                    for clauses in (
+                        [unwrap_element(clause) for clause in getattr(over.partition_by, "clauses", list())]
+                        for over in overs[1:]
+                    )
+                ),
+            )
+        ):
+            return None
+
+        frames = {
+            None: "peers",
+            (elements.RANGE_UNBOUNDED, elements.RANGE_CURRENT): "peers",
+            (elements.RANGE_UNBOUNDED, elements.RANGE_UNBOUNDED): "partition",
+        }
+
+        projection = list(partition_by)
+        windows, outputs = list(), list()
+
+        for column in columns:
+            if not isinstance(column, elements.Over):
+                outputs.append(("column", self._projection_position(projection, column)))
+                continue
+
+            function = column.element
+            name = str(getattr(function, "name", "")).upper()
+            arguments = [unwrap_element(argument) for argument in getattr(function, "clauses", list())]
+
+            if name not in WindowFunction.supported:
+                return None
+
+            if column.rows is not None:
+                frame = {
+                    (elements.RANGE_UNBOUNDED, elements.RANGE_CURRENT): "rows",
+                    (elements.RANGE_UNBOUNDED, elements.RANGE_UNBOUNDED): "partition",
+                }.get(column.rows)
+            else:
+                frame = frames.get(column.range_)
+
+            if frame is None:
+                return None
+
+            argument, offset, default = None, 1, None
+
+            if name in WindowFunction.offsets:
+                if not arguments or not all(
+                    isinstance(argument, elements.BindParameter) for argument in arguments[1:3]
+                ):
+                    return None
+                argument = self._projection_position(projection, arguments[0])
+                if len(arguments) > 1:
+                    offset = int(arguments[1].effective_value)
+                if len(arguments) > 2:
+                    default = arguments[2].effective_value
+
+            elif name in WindowFunction.aggregates:
+                if len(arguments) > 1:
+                    return None
+                if arguments and not (
+                    isinstance(arguments[0], elements.ColumnClause)
+                    and arguments[0].is_literal
+                    and arguments[0].name == "*"
+                ):
+                    argument = self._projection_position(projection, arguments[0])
+
+            order_by = list()
+            for clause in getattr(column.order_by, "clauses", list()):
+                expression, descending = order_direction(clause)
+                order_by.append((self._projection_position(projection, expression), descending))
+
+            outputs.append(("window", len(windows)))
+            windows.append(WindowFunction(name, argument, order_by, frame, offset=offset, default=default))
+
+        order_by = list()
+        for clause in select._order_by_clause.clauses:
+            expression, descending = order_direction(clause)
+            pos = self._selected_position(select, expression)
+            if pos is None:
+                return None
+            order_by.append((pos, descending))
+
+        statement = (
+            select.with_only_columns(projection)
+            .select_from(*select.froms)
+            .order_by(None)
+            .order_by(*partition_by)
+        )
+
+        return WindowEmulation(
+            statement,
+            partition_count=len(partition_by),
+            windows=windows,
+            outputs=outputs,
+            order_by=order_by,
+            chunk_size=self.dialect.client_fetch_size,
+        )
+
     def visit_unary(self, unary, **kw):
         """Render unary statements."""
         if unary.operator:
@@ -1627,7 +2381,8 @@ class ParadoxDialect(default.DefaultDialect):
 
     # Supported parameter styles: ["qmark", "numeric", "named", "format", "pyformat"]
     default_paramstyle = "pyformat"
-    dbapi.paramstyle = default_paramstyle
+    if dbapi is not None:
+        dbapi.paramstyle = default_paramstyle
 
     poolclass = pool.SingletonThreadPool
     statement_compiler = ParadoxSQLCompiler
@@ -1657,6 +2412,69 @@ class ParadoxDialect(default.DefaultDialect):
     supports_server_side_cursors = False
     supports_simple_order_by_label = False
 
+    # Limits reported by the Intersolv driver (see paradox_odbc_capabilities.json)
+    max_group_by_columns = 20
+    max_order_by_columns = 20
+
+    # How many rows to fetch at a time for statements evaluated on the client
+    client_fetch_size = 500
+
+    # How many build-side rows a client-side hash join may hold in memory
+    # before it starts spilling to temporary files
+    hash_join_budget = 250000
+
+    # How correlated (NOT) EXISTS predicates are rewritten as semi-joins
+    # ("subquery" or "keys"; None or False leaves them alone), and how many
+    # inlined keys go in each IN list
+    semijoin_strategy: Any = None
+    semijoin_chunk_size = 250
+
+    # Persist reflected schemas between processes: True to store them under
+    # ~/.cache/sqlalchemy-paradox, or the path of a directory to store them in
+    reflection_cache: Any = False
+
+    # How many connections bulk reflection may spread per-table catalog calls across
+    reflection_workers = 4
+
+    # Bind Memo / BLOB values as parameters rather than inlining them in statements,
+    # and how many bytes of each one pyodbc hands to the driver (or reads) at a time
+    bind_blobs = True
+    blob_chunk_size = 65536
+
+    # The longest value an Alpha field can hold; longer strings can only be Memos
+    max_alpha_length = 255
+
+    # Read the keys of inserted AutoIncrement rows from the end of their table's
+    # .PX index (see ParadoxExecutionContext.get_lastrowid), which needs the
+    # table files to be reachable from here
+    lastrowid_from_index = False
+
+    def __init__(
+        self,
+        semijoin_strategy: Any = None,
+        reflection_cache: Any = None,
+        reflection_workers: Optional[int] = None,
+        blob_chunk_size: Optional[int] = None,
+        lastrowid_from_index: Optional[bool] = None,
+        **kwargs: Any,
+    ):
+        super(ParadoxDialect, self).__init__(**kwargs)
+        if blob_chunk_size is not None:
+            self.blob_chunk_size = blob_chunk_size
+        if lastrowid_from_index is not None:
+            self.lastrowid_from_index = self.postfetch_lastrowid = lastrowid_from_index
+        if reflection_workers is not None:
+            self.reflection_workers = reflection_workers
+        if semijoin_strategy is not None:
+            self.semijoin_strategy = semijoin_strategy
+        if reflection_cache is not None:
+            self.reflection_cache = reflection_cache
+        self._schema_caches: Dict[str, ReflectionCache] = dict()
+        self._schema_watchers: Dict[str, SchemaWatcher] = dict()
+        self._schema_generations: Dict[Optional[str], int] = dict()
+        self._table_listings: WeakKeyDictionary = WeakKeyDictionary()
+        self._reflection_runs: WeakKeyDictionary = WeakKeyDictionary()
+
     @staticmethod
     def _check_unicode_returns(*args: Any, **kwargs: Any):
         """Check if the local system supplies unicode returns."""
@@ -1665,7 +2483,7 @@ class ParadoxDialect(default.DefaultDialect):
         # always get a unicode string back for string values
         return True
 
-    @reflection.cache
+    @schema_cache.cache
     def has_table(self, connection, table_name, schema=None, **kw):
         """Check the existence of a particular table in the database.
 
@@ -1673,20 +2491,31 @@ class ParadoxDialect(default.DefaultDialect):
         `table_name`, return True if the given table (possibly within
         the specified `schema`) exists in the database, False
         otherwise.
+
+        The first check on a connection lists every table in the database with
+        a single SQLTables call (rather than a catalog call per check, as a
+        `MetaData.create_all` / `drop_all` would otherwise make), and later ones
+        are answered from that listing, case-insensitively. It's let go of when
+        the connection runs any DDL or its create_all / drop_all run ends, and
+        listed again once a SchemaWatcher reports a table created or dropped.
         """
-        table_name = self.identifier_preparer.quote(table_name)
-        try:
-            return (
-                connection.engine.raw_connection()
-                .cursor()
-                .tables(table_name)
-                .fetchone()
-                is not None
-            )
-        except pyodbc.Error:
-            return False
+        listing = self._table_listings.get(connection, None)
+        generation = self.schema_generation()
+        if listing is None or listing[0] != generation:
+            try:
+                with self._catalog_cursor(connection) as cursor:
+                    names = {row.table_name.casefold() for row in cursor.tables().fetchall()}
+            except self.dbapi.Error:
+                return False
+            listing = self._table_listings[connection] = (generation, names)
+
+        return table_name.casefold() in listing[1]
 
-    @reflection.cache
+    def _drop_table_listing(self, connection) -> None:
+        """Let go of the table listing `has_table` keeps for a connection."""
+        self._table_listings.pop(connection, None)
+
+    @schema_cache.cache
     def get_table_names(self, connection, schema=None, **kw):
         """Get the names of all the local tables."""
 
@@ -1699,65 +2528,61 @@ class ParadoxDialect(default.DefaultDialect):
         #             or a data source-specific type name.
         # remarks: A description of the table.
 
-        cursor = connection.engine.raw_connection().cursor()
-        table_names = {
-            table.table_name for table in cursor.tables(tableType="TABLE").fetchall()
-        }
+        with self._catalog_cursor(connection) as cursor:
+            table_names = {
+                table.table_name for table in cursor.tables(tableType="TABLE").fetchall()
+            }
         return list(table_names)
 
-    @reflection.cache
+    @schema_cache.cache
     def get_view_names(self, connection, schema=None, **kw):
         """Get the names of all local views."""
-        return [
-            row[2]
-            for row in connection.engine.raw_connection()
-            .cursor()
-            .tables(tableType="VIEW")
-            .fetchall()
-        ]
+        with self._catalog_cursor(connection) as cursor:
+            return [row[2] for row in cursor.tables(tableType="VIEW").fetchall()]
+
+    def _column_info(self, column: Any) -> Dict[str, Any]:
+        """Convert a row returned by `cursor.columns()` into a reflected column."""
+        column_class = ischema_names[column.type_name]
+        column_type = column_class()
+        if issubclass(column_class, (sqla_types.String, sqla_types.Text)):
+            column_type.length = column.column_size
+        elif issubclass(column_class, (sqla_types.DECIMAL, sqla_types.Float)):
+            column_type.precision = column.column_size
+            column_type.scale = column.decimal_digits
+        return {
+            "name": column.column_name,
+            "type": column_type,
+            "info": {"paradox_blob": column.type_name in blob_type_names},
+            "nullable": bool(all((strtobool(column.nullable), strtobool(column.is_nullable)))),
+            "default": column.column_def,
+            "autoincrement": all(
+                (
+                    column.ordinal_position == 1,
+                    column.column_def is None,
+                    cl_in("id", column.column_name),
+                    cl_in(column.type_name, "LONG INTEGER"),
+                    strtobool(column.nullable) is False,
+                    strtobool(column.is_nullable) is False,
+                )
+            ),
+        }
 
+    @schema_cache.cache
     def get_columns(self, connection, table_name, schema=None, **kw):
         """Get the column names and data-types for a given table."""
 
-        table_name = self.identifier_preparer.quote(table_name)
-        pyodbc_connection = connection.engine.raw_connection()
-        pyodbc_cursor = pyodbc_connection.cursor()
-        result = []
-
-        for column in pyodbc_cursor.columns(table=table_name):
-
-            column_class = ischema_names[column.type_name]
-            column_type = column_class()
-            if issubclass(column_class, (sqla_types.String, sqla_types.Text)):
-                column_type.length = column.column_size
-            elif issubclass(column_class, (sqla_types.DECIMAL, sqla_types.Float)):
-                column_type.precision = column.column_size
-                column_type.scale = column.decimal_digits
-            result.append(
-                {
-                    "name": column.column_name,
-                    "type": column_type,
-                    "nullable": bool(
-                        all((strtobool(column.nullable), strtobool(column.is_nullable)))
-                    ),
-                    "default": column.column_def,
-                    "autoincrement": all(
-                        (
-                            column.ordinal_position == 1,
-                            column.column_def is None,
-                            cl_in("id", column.column_name),
-                            cl_in(column.type_name, "LONG INTEGER"),
-                            strtobool(column.nullable) is False,
-                            strtobool(column.is_nullable) is False,
-                        )
-                    ),
-                }
-            )
-        return result
+        cached = self._cached_reflection("get_columns", connection, table_name, kw)
+        if cached is not None:
+            return cached
 
-    def get_pk_constraint(
-        self, connection, table_name, schema=None, *args: Any, **kwargs: Any
-    ):
+        quoted_name = self.identifier_preparer.quote(table_name)
+        with self._catalog_cursor(connection) as pyodbc_cursor:
+            columns = [self._column_info(column) for column in pyodbc_cursor.columns(table=quoted_name).fetchall()]
+
+        return self._remember_reflection("get_columns", connection, table_name, columns)
+
+    @schema_cache.cache
+    def get_pk_constraint(self, connection, table_name, schema=None, *args, **kwargs):
         """ Return information about the primary key constraint on `table_name`.
 
             Given a :class:`_engine.Connection`, a string
@@ -1770,40 +2595,36 @@ class ParadoxDialect(default.DefaultDialect):
             name
               optional name of the primary key constraint.
         """
-        table_name = self.identifier_preparer.quote(table_name)
-        pks = (
-            connection.engine.raw_connection()
-            .cursor()
-            .primaryKeys(table_name)
-            .fetchall()
-        )
+        cached = self._cached_reflection("get_pk_constraint", connection, table_name, kwargs)
+        if cached is not None:
+            return cached
+
+        quoted_name = self.identifier_preparer.quote(table_name)
+        with self._catalog_cursor(connection) as cursor:
+            pks = cursor.primaryKeys(quoted_name).fetchall()
 
         if not pks:
-            return {
+            constraint = {
                 "name": None,
                 "constrained_columns": [],
             }
+        else:
+            constraint = {
+                "name": max(set((row[5] for row in pks)) or {"PRIMARY"}),
+                "constrained_columns": [row[3] for row in pks],
+            }
 
-        pk_name = max(set((row[5] for row in pks)) or {"PRIMARY"})
-
-        return {
-            "name": pk_name,
-            "constrained_columns": [row[3] for row in pks],
-        }
+        return self._remember_reflection("get_pk_constraint", connection, table_name, constraint)
 
     def get_foreign_keys(self, connection, table_name, schema=None, **kw):
         """Get the list of foreign keys from a given table."""
         # The Intersolv driver's support for foreign keys is semantic, at best
         # so it's *extremely* likely that this list will always be empty
         table_name = self.identifier_preparer.quote(table_name)
-        return [
-            key[3]
-            for key in connection.engine.raw_connection()
-            .cursor()
-            .foreignKeys(table_name)
-        ]
+        with self._catalog_cursor(connection) as cursor:
+            return [key[3] for key in cursor.foreignKeys(table_name).fetchall()]
 
-    @reflection.cache
+    @schema_cache.cache
     def get_indexes(self, connection, table_name, *args, **kwargs):
         """Return information about indexes in `table_name`.
 
@@ -1821,12 +2642,15 @@ class ParadoxDialect(default.DefaultDialect):
           boolean
         """
 
+        cached = self._cached_reflection("get_indexes", connection, table_name, kwargs)
+        if cached is not None:
+            return cached
+
         catalog = kwargs.get("catalog", None)
         schema = kwargs.get("schema", None)
         unique = kwargs.get("unique", False)
         quick = kwargs.get("catalog", False)
-        pyodbc_cursor = connection.engine.raw_connection().cursor()
-        table_name = self.identifier_preparer.quote(table_name)
+        quoted_name = self.identifier_preparer.quote(table_name)
 
         stat_cols = (
             "table_cat",
@@ -1846,9 +2670,12 @@ class ParadoxDialect(default.DefaultDialect):
 
         indexes = dict()
 
-        for row in pyodbc_cursor.statistics(
-            table_name, catalog=catalog, schema=schema, unique=unique, quick=quick
-        ).fetchall():
+        with self._catalog_cursor(connection) as pyodbc_cursor:
+            statistics = pyodbc_cursor.statistics(
+                quoted_name, catalog=catalog, schema=schema, unique=unique, quick=quick
+            ).fetchall()
+
+        for row in statistics:
             if getattr(row, "index_name", None) is not None:
                 if row.index_name in indexes.keys():
                     indexes[row.index_name]["column_names"].append(row.column_name)
@@ -1864,9 +2691,9 @@ class ParadoxDialect(default.DefaultDialect):
                         {key: getattr(row, key, None) for key in stat_cols}
                     )
 
-        return list(indexes.values())
+        return self._remember_reflection("get_indexes", connection, table_name, list(indexes.values()))
 
-    @reflection.cache
+    @schema_cache.cache
     def get_temp_table_names(self, connection, schema=None, **kw):
         """Get the names of any extant temporary tables."""
         return []
@@ -1883,7 +2710,7 @@ class ParadoxDialect(default.DefaultDialect):
         # Paradox doesn't supply View functionality
         return {}
 
-    @reflection.cache
+    @schema_cache.cache
     def get_unique_constraints(self, *args, **kwargs):
         r"""Return information about unique constraints in `table_name`.
 
@@ -1909,7 +2736,7 @@ class ParadoxDialect(default.DefaultDialect):
         """The Intersolv driver doesn't really support constraints, other than NOT NULL."""
         return []
 
-    @reflection.cache
+    @schema_cache.cache
     def get_table_comment(self, connection, table_name, *args, **kwargs):
         r"""Return the "comment" for the table identified by `table_name`.
 
@@ -1923,19 +2750,336 @@ class ParadoxDialect(default.DefaultDialect):
         comments.
         """
 
+        bulk = self._bulk_reflected("get_table_comment", table_name, kwargs)
+        if bulk is not None:
+            return bulk
+
         catalog = kwargs.get("catalog", None)
         schema = kwargs.get("schema", None)
         table_type = kwargs.get("tableType", None)
-        pyodbc_cursor = connection.engine.raw_connection().cursor()
         table_name = self.identifier_preparer.quote(table_name)
 
-        table_data = pyodbc_cursor.tables(
-            table=table_name, catalog=catalog, schema=schema, tableType=table_type
-        ).fetchone()
+        with self._catalog_cursor(connection) as pyodbc_cursor:
+            tables = pyodbc_cursor.tables(
+                table=table_name, catalog=catalog, schema=schema, tableType=table_type
+            ).fetchall()
+
+        table_data = tables[0] if tables else None
         comments = getattr(table_data, "remarks", "")
 
         return {"text": comments}
 
+    @contextmanager
+    def _catalog_cursor(self, connection) -> Iterator[Any]:
+        """Get a cursor for catalog calls on the supplied connection's own DBAPI connection.
+
+        Catalog calls made while one is already open (e.g. over the course of
+        reflecting a whole table) share its cursor, which is closed once the
+        outermost caller is done with it.
+        """
+        if not hasattr(connection, "connection"):
+            # An Inspector created from an Engine hands that Engine to the dialect
+            with connection.connect() as engine_connection, self._catalog_cursor(engine_connection) as cursor:
+                yield cursor
+            return
+
+        catalog = connection.info.get("paradox_catalog_cursor", None)
+        if catalog is not None:
+            yield catalog
+            return
+
+        cursor = connection.connection.cursor()
+        connection.info["paradox_catalog_cursor"] = cursor
+        try:
+            yield cursor
+        finally:
+            connection.info.pop("paradox_catalog_cursor", None)
+            cursor.close()
+
+    def _worker_engine(self, engine) -> Any:
+        """Get an engine that connects the way the supplied one does, but doesn't keep its connections.
+
+        The dialect's SingletonThreadPool keeps a connection per thread, and
+        once it holds `pool_size` of them closes others to make room, whether
+        they're in use or not. Worker threads (which come and go) connect
+        through this instead, and their connections are closed as they're done
+        with. The engine's pool events (and so the dialect's `on_connect`) still
+        apply to them.
+        """
+        workers = pool.NullPool(engine.pool._creator, dialect=self, _dispatch=engine.pool.dispatch)
+        return Engine(workers, self, engine.url)
+
+    def _multi_table_names(self, connection, schema, filter_names, info_cache) -> List[str]:
+        """The names of the tables a `get_multi_*` call should cover."""
+        if filter_names:
+            return list(filter_names)
+        return self.get_table_names(connection, schema, info_cache=info_cache)
+
+    def _multi_result(
+        self, method: str, schema: Optional[str], results: Dict[str, Any], info_cache: Optional[Dict[Any, Any]]
+    ) -> List[Tuple[Tuple[Optional[str], str], Any]]:
+        """Record bulk-reflected, per-table results in `info_cache` for `method` to serve."""
+        if info_cache is not None:
+            info_cache.setdefault(("paradox_multi", method), dict()).update(
+                {
+                    table_name.casefold(): (self.schema_generation(table_name), value)
+                    for table_name, value in results.items()
+                }
+            )
+        return [((schema, table_name), value) for table_name, value in results.items()]
+
+    def _bulk_reflected(self, method: str, table_name: str, kwargs: Dict[str, Any]) -> Optional[Any]:
+        """Get `method`'s result for a table from an earlier `get_multi_*` call, if there was one."""
+        info_cache = kwargs.get("info_cache", None) or dict()
+        generation, value = info_cache.get(("paradox_multi", method), dict()).get(table_name.casefold(), (None, None))
+        return value if generation == self.schema_generation(table_name) else None
+
+    def _data_directory(self, connection) -> Optional[str]:
+        """Get the directory holding the tables the supplied connection (or engine) is connected to."""
+        try:
+            if hasattr(connection, "connection"):
+                directory = connection.connection.getinfo(self.dbapi.SQL_DATABASE_NAME)
+            else:
+                with connection.connect() as engine_connection:
+                    directory = engine_connection.connection.getinfo(self.dbapi.SQL_DATABASE_NAME)
+        except (AttributeError, self.dbapi.Error):
+            return None
+
+        return directory if directory and os.path.isdir(directory) else None
+
+    def _schema_cache(self, connection) -> Optional[ReflectionCache]:
+        """Get the persistent reflection cache for the connection's table directory, if caching is enabled."""
+        if not self.reflection_cache:
+            return None
+
+        directory = self._data_directory(connection)
+        if directory is None:
+            return None
+
+        if directory not in self._schema_caches:
+            cache_dir = self.reflection_cache if isinstance(self.reflection_cache, str) else None
+            cache = self._schema_caches.setdefault(directory, ReflectionCache(directory, cache_dir))
+            cache.watched = directory in self._schema_watchers
+        return self._schema_caches[directory]
+
+    def schema_generation(self, table_name: Optional[str] = None) -> int:
+        """Count the structural changes a SchemaWatcher has seen to a table (or, without one, to the table list)."""
+        return self._schema_generations.get(table_name.casefold() if table_name else None, 0)
+
+    def watch_schema(self, bind, interval: float = 0.5, backend: str = "poll") -> Optional[SchemaWatcher]:
+        """Watch the table directory of the supplied engine (or connection) for changes.
+
+        Structural changes to a table (and tables being created or dropped) are
+        reflected again the next time they're asked for, rather than being served
+        from any Inspector's `info_cache` or the persistent reflection cache.
+        Subscribe to the returned SchemaWatcher to invalidate other caches (of
+        query results, say) when a table's data changes.
+        """
+        directory = self._data_directory(bind)
+        if directory is None:
+            return None
+
+        if directory not in self._schema_watchers:
+            watcher = SchemaWatcher(directory, interval=interval, backend=backend)
+            watcher.subscribe(lambda change: self._schema_changed(directory, change))
+            self._schema_watchers[directory] = watcher.start()
+            if directory in self._schema_caches:
+                self._schema_caches[directory].watched = True
+
+        return self._schema_watchers[directory]
+
+    def _schema_changed(self, directory: str, change: TableChange) -> None:
+        """Invalidate what's been reflected about a table whose structure has changed."""
+        if change.kind == DATA:
+            return
+
+        key = change.table.casefold()
+        self._schema_generations[key] = self._schema_generations.get(key, 0) + 1
+        if change.kind in (CREATED, DROPPED):
+            self._schema_generations[None] = self._schema_generations.get(None, 0) + 1
+
+        if directory in self._schema_caches:
+            self._schema_caches[directory].invalidate(change.table)
+
+    def _flush_schema_cache(self, connection) -> None:
+        """Write out any newly reflected results to the persistent cache (if enabled)."""
+        cache = self._schema_cache(connection)
+        if cache is not None:
+            cache.flush()
+
+    def _cached_reflection(self, method: str, connection, table_name: str, kwargs: Dict[str, Any]) -> Optional[Any]:
+        """Get `method`'s result for a table from a `get_multi_*` call or the persistent cache, if possible."""
+        bulk = self._bulk_reflected(method, table_name, kwargs)
+        if bulk is not None:
+            return bulk
+
+        cache = self._schema_cache(connection)
+        return cache.get(table_name, method) if cache is not None else None
+
+    def _remember_reflection(self, method: str, connection, table_name: str, value: Any) -> Any:
+        """Record a freshly reflected result in the persistent cache (if enabled), and return it."""
+        cache = self._schema_cache(connection)
+        if cache is not None:
+            cache.put(table_name, method, value)
+        return value
+
+    def get_multi_columns(self, connection, schema=None, filter_names=None, **kw):
+        """Get the columns of many tables at once, from a single catalog call.
+
+        Rather than calling `cursor.columns()` once per table, it's called once
+        without a table name and the rows are partitioned by table. When given an
+        `info_cache`, each table's columns are also stored in it, so that per-table
+        `get_columns` calls made through the same Inspector need no round trips.
+        The catalog call is skipped entirely if every table's columns can be
+        served from the persistent reflection cache.
+        """
+        info_cache = kw.get("info_cache", None)
+        table_names = self._multi_table_names(connection, schema, filter_names, info_cache)
+        cache = self._schema_cache(connection)
+        results = {
+            table_name: cache.get(table_name, "get_columns") if cache is not None else None
+            for table_name in table_names
+        }
+        missing = [table_name for table_name, columns in results.items() if columns is None]
+
+        if missing:
+            by_table: Dict[str, List[Dict[str, Any]]] = dict()
+            with self._catalog_cursor(connection) as cursor:
+                catalog = cursor.columns().fetchall()
+
+            for column in catalog:
+                by_table.setdefault(column.table_name.casefold(), list()).append(self._column_info(column))
+
+            for table_name in missing:
+                results[table_name] = self._remember_reflection(
+                    "get_columns", connection, table_name, by_table.get(table_name.casefold(), list())
+                )
+
+            if cache is not None:
+                self._flush_schema_cache(connection)
+
+        return self._multi_result("get_columns", schema, results, info_cache)
+
+    def _reflect_each(
+        self, connection, method: Callable[..., Any], table_names: List[str], schema: Optional[str]
+    ) -> Dict[str, Any]:
+        """Call a per-table reflection method for each of the supplied tables, concurrently.
+
+        The calls are spread over at most `reflection_workers` threads, each of
+        which reflects through its own connection (and catalog cursor), outside
+        of the engine's pool (see `_worker_engine`). With a single worker (or a
+        single table) they're simply made one after another on the supplied
+        connection.
+        """
+        workers = max(1, min(int(self.reflection_workers or 1), len(table_names)))
+        if workers == 1:
+            return {table_name: method(connection, table_name, schema) for table_name in table_names}
+
+        engine = self._worker_engine(connection.engine)
+        local = threading.local()
+        opened: List[Any] = list()
+
+        def reflect(table_name: str) -> Any:
+            """Reflect one table on the current worker's connection."""
+            worker_connection = getattr(local, "connection", None)
+            if worker_connection is None:
+                worker_connection = local.connection = engine.connect()
+                opened.append(worker_connection)
+            with self._catalog_cursor(worker_connection):
+                return method(worker_connection, table_name, schema)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="paradox-reflect") as executor:
+                return dict(zip(table_names, executor.map(reflect, table_names)))
+        finally:
+            for worker_connection in opened:
+                worker_connection.close()
+
+    def get_multi_pk_constraint(self, connection, schema=None, filter_names=None, **kw):
+        """Get the primary keys of many tables at once.
+
+        ODBC's SQLPrimaryKeys only accepts a single table, so this still makes one
+        catalog call per table, but they're spread across `reflection_workers`
+        connections and the results land in `info_cache` (when given).
+        """
+        info_cache = kw.get("info_cache", None)
+        table_names = self._multi_table_names(connection, schema, filter_names, info_cache)
+        results = self._reflect_each(connection, self.get_pk_constraint, table_names, schema)
+        self._flush_schema_cache(connection)
+        return self._multi_result("get_pk_constraint", schema, results, info_cache)
+
+    def get_multi_indexes(self, connection, schema=None, filter_names=None, **kw):
+        """Get the indexes of many tables at once.
+
+        ODBC's SQLStatistics only accepts a single table, so this still makes one
+        catalog call per table, but they're spread across `reflection_workers`
+        connections and the results land in `info_cache` (when given).
+        """
+        info_cache = kw.get("info_cache", None)
+        table_names = self._multi_table_names(connection, schema, filter_names, info_cache)
+        results = self._reflect_each(connection, self.get_indexes, table_names, schema)
+        self._flush_schema_cache(connection)
+        return self._multi_result("get_indexes", schema, results, info_cache)
+
+    def get_multi_table_comment(self, connection, schema=None, filter_names=None, **kw):
+        """Get the "comments" of many tables at once, from a single catalog call."""
+        info_cache = kw.get("info_cache", None)
+        table_names = self._multi_table_names(connection, schema, filter_names, info_cache)
+        with self._catalog_cursor(connection) as cursor:
+            remarks = {
+                table.table_name.casefold(): getattr(table, "remarks", "")
+                for table in cursor.tables(tableType="TABLE")
+            }
+
+        return self._multi_result(
+            "get_table_comment",
+            schema,
+            {table_name: {"text": remarks.get(table_name.casefold(), "")} for table_name in table_names},
+            info_cache,
+        )
+
+    def reflecttable(self, connection, table, include_columns, exclude_columns, resolve_fks, **opts):
+        """Reflect a table, sharing one bulk-primed `info_cache` across a `MetaData.reflect()` run.
+
+        SQLAlchemy 1.3's `MetaData.reflect()` reflects each table with a new
+        Inspector (and so an empty `info_cache`). Every table reflected during the
+        same run (as identified by the run's `_extend_on` set) is instead reflected
+        with one cache, whose columns and comments are filled by a single catalog
+        call each when the run starts. Primary keys and indexes take a catalog call
+        per table, which are made then too, spread across `reflection_workers`
+        connections (see `get_multi_pk_constraint`), for every table in the
+        database: the run's tables aren't known up front.
+        """
+        with self._catalog_cursor(connection):
+            return self._reflect_table(connection, table, include_columns, exclude_columns, resolve_fks, **opts)
+
+    def _reflect_table(self, connection, table, include_columns, exclude_columns, resolve_fks, **opts):
+        """Reflect a table, with the `info_cache` of the `MetaData.reflect()` run it's part of (if any)."""
+        extend_on = opts.get("_extend_on", None)
+        inspector = reflection.Inspector.from_engine(connection)
+
+        if extend_on is not None:
+            # `Inspector.reflecttable` adds each table to `_extend_on` as it goes,
+            # so the set is empty only for the first table of a run. The run's cache
+            # is held against the MetaData being reflected into, and is let go of
+            # along with it (or replaced by the next run's)
+            run_id, info_cache = self._reflection_runs.get(table.metadata, (None, None))
+            if extend_on and run_id == id(extend_on):
+                inspector.info_cache = info_cache
+            else:
+                for method in (
+                    self.get_multi_columns,
+                    self.get_multi_table_comment,
+                    self.get_multi_pk_constraint,
+                    self.get_multi_indexes,
+                ):
+                    method(connection, table.schema, info_cache=inspector.info_cache)
+                self._reflection_runs[table.metadata] = (id(extend_on), inspector.info_cache)
+
+        ret_val = inspector.reflecttable(table, include_columns, exclude_columns, resolve_fks, **opts)
+        self._flush_schema_cache(connection)
+        return ret_val
+
     @staticmethod
     def has_sequence(*args, **kwargs):
         """Paradox doesn't support sequences, so it will never have a queried sequence."""
@@ -1976,6 +3120,101 @@ class ParadoxDialect(default.DefaultDialect):
         # This probably needs to be revisited, to account for extraneous types
         return f"{value}"
 
+    def _is_blob_value(self, value: Any, escape: Optional[str] = None) -> bool:
+        """Check whether a parameter value should be bound rather than inlined as a literal.
+
+        Binary values, and strings too long for an Alpha field (which can only
+        be destined for a Memo), are passed to pyodbc as they are. pyodbc hands
+        values larger than the connection's `maxwrite` to the driver with
+        SQLPutData, `blob_chunk_size` bytes at a time.
+        """
+        if not self.bind_blobs:
+            return False
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return True
+        return isinstance(value, str) and escape is None and len(value) > self.max_alpha_length
+
+    def on_connect(self):
+        """Set up each new pyodbc connection to stream large parameter values in chunks."""
+        chunk_size = self.blob_chunk_size
+
+        def set_maxwrite(dbapi_connection):
+            """Have pyodbc send values larger than a chunk with SQLPutData."""
+            if chunk_size and hasattr(dbapi_connection, "maxwrite"):
+                dbapi_connection.maxwrite = chunk_size
+
+        return set_maxwrite
+
+    def open_blob(self, connection, column, whereclause, encoding: str = "utf8", buffer_size: Optional[int] = None):
+        """Open a Memo / BLOB value for reading, as a file-like object.
+
+        The value of `column` in the (single) row matching `whereclause` is
+        fetched when the object is first read from, on the supplied connection,
+        and then read in chunks of `buffer_size` (by default,
+        `blob_chunk_size`) bytes. Memo values are read as text, in `encoding`:
+
+            with engine.dialect.open_blob(connection, documents.c.scan, documents.c.id == 42) as scan:
+                shutil.copyfileobj(scan, output)
+        """
+        statement = Select([column], whereclause=whereclause)
+        reader = io.BufferedReader(
+            BlobReader(lambda: connection.execute(statement).scalar(), encoding),
+            buffer_size=buffer_size or self.blob_chunk_size or io.DEFAULT_BUFFER_SIZE,
+        )
+        if isinstance(column.type, sqla_types.String):
+            return io.TextIOWrapper(reader, encoding=encoding)
+        return reader
+
+    def table_stats(self, bind, table_name: str) -> Optional[pxfile.TableStats]:
+        """Summarize a table from its .DB file's header, without the driver scanning it.
+
+        The header keeps count of the table's rows and data blocks, so this is
+        a cheap `SELECT COUNT(*)` (see `pxfile.TableStats`). Returns None if
+        the table's files can't be reached from here, or can't be read:
+
+            stats = engine.dialect.table_stats(engine, "orders")
+            rows = stats.rows if stats is not None else connection.execute(count_orders).scalar()
+        """
+        directory = self._data_directory(bind)
+        path = pxfile.find_table(directory, table_name) if directory is not None else None
+        if path is None:
+            return None
+        try:
+            return pxfile.table_stats(path)
+        except (OSError, ValueError):
+            return None
+
+    def last_key(self, bind, table_name: str) -> Optional[Any]:
+        """Get the highest value of a table's (leading) primary key field, from the end of its .PX index.
+
+        Only the index blocks on the way to the table's last data block, and
+        that data block, are read, rather than the driver scanning the table
+        for `SELECT MAX(key)`. Returns None if the table is empty, has no
+        primary index, or its files can't be reached from here (or read).
+        """
+        directory = self._data_directory(bind)
+        path = pxfile.find_table(directory, table_name) if directory is not None else None
+        if path is None:
+            return None
+        try:
+            table = pxfile.TableFile(path)
+        except (OSError, ValueError):
+            return None
+        try:
+            index = table.primary_index
+            if index is None:
+                return None
+            records = table.records(index.data_blocks(reverse=True), [0], reverse=True)
+            return next((key for key, in records if key is not None), None)
+        except (OSError, ValueError):
+            return None
+        finally:
+            table.close()
+
+    def render_literal(self, value: Any) -> str:
+        """Render the supplied value as a literal the driver will accept in a statement."""
+        return self.__stringify(value)
+
     def do_executemany(self, cursor, statement, parameters, context=None):
         """Insert DocString Here."""
         for num, param_set in enumerate(parameters):
@@ -1984,6 +3223,10 @@ class ParadoxDialect(default.DefaultDialect):
     def do_execute(self, cursor, statement, parameters, context=None):
         """Insert DocString Here."""
 
+        if getattr(context, "client_cursor", None) is not None:
+            # The statement has already been evaluated without the driver's help
+            return
+
         def log_statement(st, prms=tuple()):
             """Log the supplied about-to-be-executed statement."""
             from pathlib import Path
@@ -2025,17 +3268,91 @@ class ParadoxDialect(default.DefaultDialect):
                 statement[statement.find(" \u0192") : statement.rfind("\u0192") + 1], ""
             )
 
-        parameters = {
-            key: self.__stringify(value, escape=escape)
-            for key, value in parameters.items()
-        }
+        blobs = {key: value for key, value in parameters.items() if self._is_blob_value(value, escape)}
+        parameters = BlobParameters(
+            {
+                key: self.__stringify(value, escape=escape)
+                for key, value in parameters.items()
+                if key not in blobs
+            },
+            blobs,
+        )
         statement %= parameters
 
+        def execute(st):
+            """Execute the supplied (already formatted) statement."""
+            log_statement(st)
+            cursor.execute(st)
+
+        batch = self._ddl_batch(context)
+        element = getattr(context, "compiled", None) if getattr(context, "isddl", False) else None
+        element = getattr(element, "statement", None)
+
+        if batch is not None:
+            if not isinstance(element, (CreateTable, CreateIndex, DropTable)):
+                # Whatever comes after the batch's CREATE statements (usually
+                # loading the new tables) gets their primary indexes to work with
+                batch.build(execute, secondary=not batch.defer_indexes)
+            elif isinstance(element, DropTable):
+                batch.discard(element.element.name)
+            elif isinstance(element, CreateIndex) and statement:
+                batch.add(element.element.table.name, statement)
+                statement = ""
+
         if statement:
             log_statement(statement, parameters)
-            cursor.execute(statement)
+            cursor.execute(statement, *parameters.bound)
 
         while self.statement_compiler.deferred:
             statement = self.statement_compiler.deferred.pop()
-            log_statement(statement)
-            cursor.execute(statement)
+            if batch is not None and isinstance(element, (CreateTable, CreateIndex)):
+                table = element.element if isinstance(element, CreateTable) else element.element.table
+                batch.add(table.name, statement)
+            else:
+                execute(statement)
+
+    @staticmethod
+    def _ddl_batch(context) -> Optional[DDLBatch]:
+        """Get the DDL batch in progress on the connection a statement is being executed on, if there is one."""
+        connection = getattr(context, "root_connection", None)
+        if connection is None:
+            return None
+        return connection.info.get("paradox_ddl_batch", None)
+
+    @contextmanager
+    def ddl_batch(self, connection, defer_indexes: bool = False) -> Iterator[DDLBatch]:
+        """Batch the index builds of the tables created on the supplied connection.
+
+        Tables are created as their CREATE TABLE statements are executed, but
+        their PRIMARY indexes are only built once something other than a CREATE
+        statement is executed (or the batch ends), and then each table's
+        secondary indexes in turn. With `defer_indexes`, secondary indexes
+        aren't built until the batch ends, so bulk loads inside the batch
+        don't have to maintain them row by row:
+
+            with engine.connect() as connection:
+                with engine.dialect.ddl_batch(connection, defer_indexes=True):
+                    metadata.create_all(connection)
+                    connection.execute(table.insert(), rows)
+
+        If the block raises, any index builds still queued are abandoned.
+        """
+        batch = connection.info["paradox_ddl_batch"] = DDLBatch(defer_indexes)
+        try:
+            yield batch
+        finally:
+            connection.info.pop("paradox_ddl_batch", None)
+
+        cursor = connection.connection.cursor()
+        try:
+            batch.build(cursor.execute)
+        finally:
+            cursor.close()
+
+
+@event.listens_for(MetaData, "after_create")
+@event.listens_for(MetaData, "after_drop")
+def _end_ddl_run(target, connection, **kw):
+    """Drop the table listing a Paradox connection's `has_table` checks were answered from during a DDL run."""
+    if isinstance(connection.dialect, ParadoxDialect):
+        connection.dialect._drop_table_listing(connection)
@@ -0,0 +1,77 @@
+"""Streaming Memo / BLOB values to and from the Intersolv Paradox driver."""
+# coding=utf-8
+
+import io
+from typing import Any, Dict, List, Callable, Optional
+
+
+class BlobParameters(dict):
+    """A statement's parameters, rendered as literals except for its Memo / BLOB values.
+
+    Formatting a statement with this mapping (`statement % parameters`) renders
+    each of the values in `blobs` as a `?` placeholder rather than as a literal,
+    and collects them in `bound`, in the order their placeholders appear in the
+    statement, to be passed to the driver alongside it.
+    """
+
+    def __init__(self, literals: Dict[str, str], blobs: Dict[str, Any]):
+        super(BlobParameters, self).__init__(literals)
+        self.blobs = blobs
+        self.bound: List[Any] = list()
+
+    def __getitem__(self, key: str) -> str:
+        if key in self.blobs:
+            self.bound.append(self.blobs[key])
+            return "?"
+        return super(BlobParameters, self).__getitem__(key)
+
+
+class BlobReader(io.RawIOBase):
+    """A read-only, file-like view of a single Memo / BLOB value.
+
+    The value isn't fetched until the first read, and is then served in slices
+    of a memoryview over it rather than copied. Memo (text) values are served
+    encoded as `encoding`.
+    """
+
+    def __init__(self, fetch: Callable[[], Any], encoding: str = "utf8"):
+        super(BlobReader, self).__init__()
+        self.fetch = fetch
+        self.encoding = encoding
+        self.value: Optional[memoryview] = None
+        self.position = 0
+
+    def _load(self) -> memoryview:
+        """Fetch the value, if it hasn't been already."""
+        if self.value is None:
+            value = self.fetch()
+            if value is None:
+                value = b""
+            elif isinstance(value, str):
+                value = value.encode(self.encoding)
+            self.value = memoryview(value).cast("B")
+        return self.value
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        value = self._load()
+        chunk = value[self.position : self.position + len(buffer)]
+        memoryview(buffer).cast("B")[: len(chunk)] = chunk
+        self.position += len(chunk)
+        return len(chunk)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: len(self._load())}[whence]
+        self.position = max(0, base + offset)
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+    def __len__(self) -> int:
+        return len(self._load())
@@ -0,0 +1,600 @@
+"""A read-only DBAPI 2.0 module that reads Paradox tables straight from their files.
+
+The "database" is a directory of Paradox tables, which are memory-mapped as
+they're first queried. Queries are either SELECTs prepared by the
+`paradox+native` dialect (anything with an `execute(connection)` method
+returning the result's column names and rows), or plain SQL of the form
+
+    SELECT * | COUNT(*) | <column>[, <column> ...] FROM <table>
+
+Cursors also implement the catalog methods of pyodbc's cursors (`tables`,
+`columns`, `primaryKeys`, `foreignKeys` and `statistics`), so the dialect's
+reflection works the same way with either driver.
+"""
+# coding=utf-8
+
+from concurrent.futures import ProcessPoolExecutor
+from collections import namedtuple
+from datetime import date, time, datetime
+from threading import RLock
+from itertools import islice
+from operator import itemgetter
+from typing import Any, Dict, List, Tuple, Iterable, Iterator, Optional
+import os
+import re
+
+from . import pxfile, vectorized as columnar
+
+apilevel = "2.0"
+threadsafety = 1
+paramstyle = "qmark"
+
+# The SQLGetInfo code pyodbc's `Connection.getinfo` reports the database (directory) for
+SQL_DATABASE_NAME = 16
+
+# Tables with fewer data blocks than this are always scanned in-process, as
+# shipping their records back from worker processes would cost more than it saves
+PARALLEL_MIN_BLOCKS = 64
+
+
+class Warning(Exception):  # noqa: A001
+    """Important warnings, like data truncations."""
+
+
+class Error(Exception):
+    """Base class of all the other error exceptions."""
+
+
+class InterfaceError(Error):
+    """Errors related to the DBAPI module rather than the database."""
+
+
+class DatabaseError(Error):
+    """Errors related to the database."""
+
+
+class DataError(DatabaseError):
+    """Errors due to problems with the processed data."""
+
+
+class OperationalError(DatabaseError):
+    """Errors related to the database's operation, e.g. missing or unreadable files."""
+
+
+class IntegrityError(DatabaseError):
+    """Errors due to the relational integrity of the database being affected."""
+
+
+class InternalError(DatabaseError):
+    """Errors due to the database being in an inconsistent state."""
+
+
+class ProgrammingError(DatabaseError):
+    """Errors due to mistakes in the SQL, e.g. a table that doesn't exist."""
+
+
+class NotSupportedError(DatabaseError):
+    """Errors due to asking for something the reader can't do, like writing to a table."""
+
+
+class DBAPITypeObject:
+    """A DBAPI type object, comparing equal to each of the Paradox field types it describes."""
+
+    def __init__(self, *values: Any):
+        self.values = frozenset(values)
+
+    def __eq__(self, other: Any) -> bool:
+        return other in self.values
+
+    def __ne__(self, other: Any) -> bool:
+        return other not in self.values
+
+    def __hash__(self) -> int:
+        return hash(self.values)
+
+
+STRING = DBAPITypeObject(pxfile.ALPHA, pxfile.MEMO)
+BINARY = DBAPITypeObject(pxfile.BLOB, pxfile.FORMATTED_MEMO, pxfile.OLE, pxfile.GRAPHIC, pxfile.BYTES)
+NUMBER = DBAPITypeObject(
+    pxfile.SHORT, pxfile.LONG, pxfile.MONEY, pxfile.NUMBER, pxfile.LOGICAL, pxfile.AUTOINCREMENT, pxfile.BCD
+)
+DATETIME = DBAPITypeObject(pxfile.DATE, pxfile.TIME, pxfile.TIMESTAMP)
+ROWID = DBAPITypeObject(pxfile.AUTOINCREMENT)
+
+Date = date
+Time = time
+Timestamp = datetime
+Binary = bytes
+
+
+def DateFromTicks(ticks: float) -> date:  # noqa: N802
+    """Construct a date from a POSIX timestamp."""
+    return date.fromtimestamp(ticks)
+
+
+def TimeFromTicks(ticks: float) -> time:  # noqa: N802
+    """Construct a time from a POSIX timestamp."""
+    return datetime.fromtimestamp(ticks).time()
+
+
+def TimestampFromTicks(ticks: float) -> datetime:  # noqa: N802
+    """Construct a datetime from a POSIX timestamp."""
+    return datetime.fromtimestamp(ticks)
+
+
+# The rows returned by the catalog methods, named as pyodbc names them
+TableRow = namedtuple("TableRow", "table_cat table_schem table_name table_type remarks")
+ColumnRow = namedtuple(
+    "ColumnRow",
+    "table_cat table_schem table_name column_name data_type type_name column_size buffer_length "
+    "decimal_digits num_prec_radix nullable remarks column_def sql_data_type sql_datetime_sub "
+    "char_octet_length ordinal_position is_nullable",
+)
+PrimaryKeyRow = namedtuple("PrimaryKeyRow", "table_cat table_schem table_name column_name key_seq pk_name")
+ForeignKeyRow = namedtuple(
+    "ForeignKeyRow",
+    "pktable_cat pktable_schem pktable_name pkcolumn_name fktable_cat fktable_schem fktable_name "
+    "fkcolumn_name key_seq update_rule delete_rule fk_name pk_name deferrability",
+)
+StatisticsRow = namedtuple(
+    "StatisticsRow",
+    "table_cat table_schem table_name non_unique index_qualifier index_name type ordinal_position "
+    "column_name asc_or_desc cardinality pages filter_condition",
+)
+
+SIMPLE_SELECT = re.compile(
+    r"^\s*SELECT\s+(?P<columns>.+?)\s+FROM\s+(?P<table>[`\"\[]?[^`\"\]\s;]+[`\"\]]?)\s*;?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def unquote(name: str) -> str:
+    """Strip the quotes (or brackets) from around an identifier."""
+    name = name.strip()
+    if name[:1] in ("`", '"', "[") and name[-1:] in ("`", '"', "]"):
+        return name[1:-1]
+    return name
+
+
+class TableScan:
+    """A query reading some (or all) of the columns of every record in a table, or just counting them."""
+
+    def __init__(self, table: str, columns: Optional[List[str]] = None, count: bool = False):
+        self.table = table
+        self.columns = columns
+        self.count = count
+
+    @classmethod
+    def parse(cls, operation: str) -> "TableScan":
+        """Parse the (very limited) SQL the module understands on its own."""
+        match = SIMPLE_SELECT.match(operation)
+        if match is None:
+            raise NotSupportedError(
+                "The native Paradox reader only executes SELECTs prepared by the paradox+native dialect, "
+                "or SQL of the form SELECT * | COUNT(*) | <columns> FROM <table>"
+            )
+
+        table, columns = unquote(match.group("table")), match.group("columns").strip()
+        if re.fullmatch(r"COUNT\s*\(\s*\*\s*\)", columns, re.IGNORECASE):
+            return cls(table, count=True)
+        if columns == "*":
+            return cls(table)
+        return cls(table, [unquote(column) for column in columns.split(",")])
+
+    def execute(self, connection: "Connection") -> Tuple[List[str], Iterable[Tuple[Any, ...]]]:
+        """Read the table."""
+        table = connection.table(self.table)
+        if self.count:
+            # The header keeps count of the table's records
+            return ["COUNT(*)"], [(table.header.num_records,)]
+
+        names = [field.name for field in table.fields]
+        if self.columns is None:
+            positions = list(range(len(names)))
+        else:
+            folded = [name.casefold() for name in names]
+            try:
+                positions = [folded.index(column.casefold()) for column in self.columns]
+            except ValueError:
+                raise ProgrammingError(f"Unknown column in {self.columns} for table {self.table}")
+
+        # Only the selected fields are decoded, each once however many times it's selected
+        fields = list(dict.fromkeys(positions)) if self.columns is not None else None
+        selected = [fields.index(number) for number in positions] if fields is not None else positions
+        # Memo / BLOB values are read, rather than returned as handles on them, unless the connection says otherwise
+        getters = [
+            (lambda record, position=position: pxfile.load(record[position]))
+            if table.fields[number].type in pxfile.BLOB_TYPES and not connection.lazy_blobs
+            else itemgetter(position)
+            for number, position in zip(positions, selected)
+        ]
+        records = connection.scan(table, fields=fields)
+        names = [names[number] for number in positions]
+        if selected == list(range(len(selected))) and all(isinstance(getter, itemgetter) for getter in getters):
+            return names, records
+        return names, (tuple(getter(record) for getter in getters) for record in records)
+
+
+class Cursor:
+    """A cursor over the results of a query against a directory of Paradox tables."""
+
+    arraysize = 1
+
+    def __init__(self, connection: "Connection"):
+        self.connection = connection
+        self.description: Optional[List[Tuple[Any, ...]]] = None
+        self.rowcount = -1
+        self._rows: Iterator[Tuple[Any, ...]] = iter(())
+
+    def _check(self) -> "Connection":
+        """Make sure the cursor (and its connection) is still usable."""
+        if self.connection is None:
+            raise InterfaceError("Cursor is closed")
+        if self.connection.closed:
+            raise InterfaceError("Connection is closed")
+        return self.connection
+
+    def _serve(self, names: Iterable[str], rows: Iterable[Tuple[Any, ...]], rowcount: int = -1) -> "Cursor":
+        """Serve the supplied rows as the cursor's results."""
+        self.description = [(name, None, None, None, None, None, True) for name in names]
+        self.rowcount = rowcount
+        self._rows = iter(rows)
+        return self
+
+    def execute(self, operation: Any, parameters: Any = None) -> "Cursor":
+        """Execute a query, either SQL (see `TableScan`) or one prepared by the paradox+native dialect."""
+        connection = self._check()
+        if isinstance(operation, str):
+            operation = TableScan.parse(operation)
+
+        try:
+            names, rows = operation.execute(connection)
+        except (OSError, ValueError) as error:
+            raise OperationalError(str(error)) from error
+        return self._serve(names, rows)
+
+    def executemany(self, operation: Any, seq_of_parameters: Iterable[Any]) -> None:
+        """Nothing the reader executes takes parameters, so there's nothing to execute many times."""
+        raise NotSupportedError("The native Paradox reader is read-only")
+
+    def fetchone(self) -> Optional[Tuple[Any, ...]]:
+        """Fetch the next row."""
+        self._check()
+        return next(self._rows, None)
+
+    def fetchmany(self, size: Optional[int] = None) -> List[Tuple[Any, ...]]:
+        """Fetch the next `size` rows."""
+        self._check()
+        return list(islice(self._rows, size or self.arraysize))
+
+    def fetchall(self) -> List[Tuple[Any, ...]]:
+        """Fetch all the remaining rows."""
+        self._check()
+        return list(self._rows)
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        return self._rows
+
+    def setinputsizes(self, sizes: Any) -> None:
+        """Does nothing, as allowed by the DBAPI."""
+
+    def setoutputsize(self, size: Any, column: Any = None) -> None:
+        """Does nothing, as allowed by the DBAPI."""
+
+    def close(self) -> None:
+        """Close the cursor, discarding any remaining rows."""
+        self._rows = iter(())
+        self.connection = None
+
+    def _table_names(self, table: Optional[str]) -> List[str]:
+        """The names of the tables a catalog method was asked about (all of them, without a name)."""
+        connection = self._check()
+        names = pxfile.list_tables(connection.database)
+        if table is None:
+            return names
+        return [name for name in names if name.casefold() == unquote(table).casefold()]
+
+    def tables(self, table: Optional[str] = None, catalog: Any = None, schema: Any = None, tableType: Any = None):
+        """List the directory's tables (there are no views, or system tables)."""
+        table_types = {kind.strip().strip("'").upper() for kind in (tableType or "TABLE").split(",")}
+        if "TABLE" not in table_types:
+            return self._serve(TableRow._fields, list())
+        rows = [TableRow(None, None, name, "TABLE", "") for name in self._table_names(table)]
+        return self._serve(TableRow._fields, rows)
+
+    def columns(self, table: Optional[str] = None, catalog: Any = None, schema: Any = None, column: Any = None):
+        """Describe the fields of one table (or of every table), as read from their headers."""
+        rows = list()
+        for name in self._table_names(table):
+            for number, field in enumerate(self.connection.table(name).fields, 1):
+                if column is not None and unquote(column).casefold() != field.name.casefold():
+                    continue
+                rows.append(
+                    ColumnRow(
+                        None,
+                        None,
+                        name,
+                        field.name,
+                        field.type,
+                        field.type_name,
+                        32 if field.type == pxfile.BCD else field.size,
+                        field.width,
+                        field.size if field.type == pxfile.BCD else None,
+                        10,
+                        1,
+                        None,
+                        None,
+                        field.type,
+                        None,
+                        field.width,
+                        number,
+                        "YES",
+                    )
+                )
+        return self._serve(ColumnRow._fields, rows)
+
+    def primaryKeys(self, table: str, catalog: Any = None, schema: Any = None):  # noqa: N802
+        """Describe a table's primary key: its leading `pk_fields` fields."""
+        rows = list()
+        for name in self._table_names(table):
+            header = self.connection.table(name).header
+            for number, field in enumerate(header.fields[: header.pk_fields], 1):
+                rows.append(PrimaryKeyRow(None, None, name, field.name, number, "PRIMARY"))
+        return self._serve(PrimaryKeyRow._fields, rows)
+
+    def foreignKeys(self, *args: Any, **kwargs: Any):  # noqa: N802
+        """Paradox tables don't record foreign keys (only the .VAL files of Paradox itself do)."""
+        self._check()
+        return self._serve(ForeignKeyRow._fields, list())
+
+    def statistics(
+        self, table: str, catalog: Any = None, schema: Any = None, unique: bool = False, quick: bool = True
+    ):
+        """Describe a table's secondary indexes (Paradox's are never unique)."""
+        rows = list()
+        if not unique:
+            for name in self._table_names(table):
+                for index in self.connection.table(name).secondary_indexes:
+                    for number, field in enumerate(index.fields, 1):
+                        row = (None, None, name, 1, None, index.name, 3, number, field, "A", None, None, None)
+                        rows.append(StatisticsRow(*row))
+        return self._serve(StatisticsRow._fields, rows)
+
+
+class Connection:
+    """A (read-only) connection to a directory of Paradox tables.
+
+    With `scan_workers` above 1, full scans of larger tables are split by
+    block range across that many worker processes (see `pxfile.parallel_records`),
+    yielding records in table order unless `scan_ordered` is False.
+
+    With `lazy_blobs`, queries return Memo / BLOB values as `pxfile.Blob`
+    handles, which only read them from the .MB file when they're used.
+
+    With `vectorized`, scans decode records a column at a time with NumPy
+    (see the `vectorized` module), which must be installed.
+    """
+
+    def __init__(
+        self,
+        database: str,
+        scan_workers: int = 0,
+        scan_ordered: bool = True,
+        lazy_blobs: bool = False,
+        vectorized: bool = False,
+    ):
+        self.database = os.path.abspath(database)
+        if not os.path.isdir(self.database):
+            raise OperationalError(f"{database} isn't a directory")
+        if vectorized and columnar.numpy is None:
+            raise NotSupportedError("Vectorized decoding needs NumPy to be installed")
+        self.scan_workers = scan_workers
+        self.scan_ordered = scan_ordered
+        self.lazy_blobs = lazy_blobs
+        self.vectorized = vectorized
+        self.closed = False
+        self.lock = RLock()
+        self._tables: Dict[str, pxfile.TableFile] = dict()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_workers = 0
+
+    def table(self, name: str) -> pxfile.TableFile:
+        """Get a table's (memory-mapped) file, mapping it again if it's changed since it was last mapped."""
+        with self.lock:
+            key = name.casefold()
+            table = self._tables.get(key, None)
+            if table is None or table.changed():
+                # A stale mapping is left for any cursors still reading from it to release
+                path = pxfile.find_table(self.database, name)
+                if path is None:
+                    raise ProgrammingError(f"No such table: {name}")
+                try:
+                    table = pxfile.TableFile(path)
+                except (OSError, ValueError) as error:
+                    raise OperationalError(f"Can't read {path}: {error}") from error
+                if table.header.encryption:
+                    table.close()
+                    raise NotSupportedError(f"{name} is encrypted")
+                self._tables[key] = table
+
+            return table
+
+    def scan(
+        self,
+        table: pxfile.TableFile,
+        workers: Optional[int] = None,
+        ordered: Optional[bool] = None,
+        vectorized: Optional[bool] = None,
+        where: Optional[Tuple[Any, ...]] = None,
+        fields: Optional[List[int]] = None,
+    ) -> Iterator[Tuple[Any, ...]]:
+        """Read every record in a table, in worker processes if the table's big enough and workers are enabled.
+
+        Vectorized scans skip the records that don't match the `where`
+        predicate (see `vectorized.block_mask`), others ignore it. With
+        `fields`, only the fields at those positions are decoded, and the
+        records only hold their values (see `pxfile.TableFile.records`).
+        """
+        workers = self.scan_workers if workers is None else workers
+        ordered = self.scan_ordered if ordered is None else ordered
+        vectorized = self.vectorized if vectorized is None else vectorized
+        if vectorized and columnar.numpy is None:
+            raise NotSupportedError("Vectorized decoding needs NumPy to be installed")
+        if not workers or workers < 2 or table.header.file_blocks < PARALLEL_MIN_BLOCKS:
+            return columnar.records(table, where=where, fields=fields) if vectorized else table.records(None, fields)
+
+        with self.lock:
+            if self._executor is None or self._executor_workers < workers:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                self._executor, self._executor_workers = ProcessPoolExecutor(workers), workers
+            executor = self._executor
+
+        return pxfile.parallel_records(
+            table, executor, workers, ordered, vectorized, where if vectorized else None, fields
+        )
+
+    def table_stats(self, name: str) -> pxfile.TableStats:
+        """Summarize a table from its header: its row count, how full its data blocks are, and so on.
+
+        See `pxfile.TableStats`.
+        """
+        return self.table(name).stats
+
+    def columns(self, name: str, columns: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """Read some (or all) of a table's columns as NumPy arrays, a batch of blocks at a time.
+
+        See `vectorized.column_batches`.
+        """
+        if columnar.numpy is None:
+            raise NotSupportedError("Reading columns needs NumPy to be installed")
+        table = self.table(name)
+        fields = table.fields
+        if columns is not None:
+            folded = {field.name.casefold(): field for field in fields}
+            try:
+                fields = tuple(folded[column.casefold()] for column in columns)
+            except KeyError as error:
+                raise ProgrammingError(f"{name} has no field named {error.args[0]}")
+        return columnar.column_batches(table, fields=fields)
+
+    def index_blocks(
+        self,
+        table: pxfile.TableFile,
+        low: Optional[Tuple[Any, ...]],
+        high: Optional[Tuple[Any, ...]],
+        reverse: bool = False,
+    ) -> Optional[List[int]]:
+        """Find the data blocks that can hold primary keys from `low` to `high`, via the table's .PX index.
+
+        Returns None if the table has no usable primary index, in which case
+        it'll have to be scanned instead.
+        """
+        index = table.primary_index
+        if index is None:
+            return None
+        try:
+            return list(index.data_blocks(low, high, reverse))
+        except (TypeError, pxfile.IndexOrderError):
+            # The bounds can't be compared with the keys, or the keys can't be compared at all
+            return None
+
+    def key_range(
+        self,
+        table: pxfile.TableFile,
+        low: Optional[Tuple[Any, ...]],
+        high: Optional[Tuple[Any, ...]],
+        fields: Optional[List[int]] = None,
+        reverse: bool = False,
+    ) -> Optional[Iterator[Tuple[Any, ...]]]:
+        """Read the records in the data blocks that can hold primary keys from `low` to `high` (see index_blocks).
+
+        With `fields`, only the fields at those positions are decoded. With
+        `reverse`, the records are read in reverse key order. Without bounds,
+        the whole index is still read (and checked to be in order) before any
+        records are, but they're read as they're wanted, so reading only the
+        first few (in either order) only touches the data blocks they're in.
+        """
+        blocks = self.index_blocks(table, low, high, reverse)
+        return table.records(blocks, fields, reverse) if blocks is not None else None
+
+    def secondary_range(
+        self,
+        table: pxfile.TableFile,
+        index: pxfile.SecondaryIndex,
+        low: Optional[Tuple[Any, ...]],
+        high: Optional[Tuple[Any, ...]],
+        fields: Optional[List[int]] = None,
+    ) -> Optional[Iterator[Tuple[Any, ...]]]:
+        """Read the records whose values of a secondary index's fields are from `low` to `high`, in its order.
+
+        Returns None if the index is stale or can't be searched with the
+        supplied bounds, in which case the table will have to be scanned instead.
+        The index entries in range are all read (and checked to be in order)
+        before any records are, which are then read as they're wanted, for
+        queries that only want the first few in its order. With `fields`, only
+        the fields at those positions are decoded.
+        """
+        if index.stale:
+            return None
+        try:
+            locations = list(index.locate(low, high))
+        except (TypeError, pxfile.IndexOrderError):
+            return None
+        return index.fetch(locations, fields)
+
+    def get(self, name: str, key: Any) -> Optional[Tuple[Any, ...]]:
+        """Look up the record with the supplied primary key (a value, or a tuple of one per key field)."""
+        table = self.table(name)
+        key = key if isinstance(key, tuple) else (key,)
+        if not 0 < len(key) <= table.header.pk_fields:
+            raise ProgrammingError(f"{name}'s primary key has {table.header.pk_fields} field(s), not {len(key)}")
+
+        blocks = self.index_blocks(table, key, key)
+        record = table.find(table.blocks() if blocks is None else blocks, key)
+        if record is None or self.lazy_blobs:
+            return record
+        return tuple(pxfile.load(value) for value in record)
+
+    def cursor(self) -> Cursor:
+        """Open a new cursor."""
+        if self.closed:
+            raise InterfaceError("Connection is closed")
+        return Cursor(self)
+
+    def getinfo(self, info_type: int) -> Any:
+        """Answer the only one of ODBC's SQLGetInfo questions the dialect asks: which directory this is."""
+        if info_type == SQL_DATABASE_NAME:
+            return self.database
+        raise NotSupportedError(f"Unsupported getinfo type: {info_type}")
+
+    def commit(self) -> None:
+        """Does nothing, the reader never writes anything."""
+
+    def rollback(self) -> None:
+        """Does nothing, the reader never writes anything."""
+
+    def close(self) -> None:
+        """Unmap every table file mapped by the connection, and stop its scan workers."""
+        with self.lock:
+            for table in self._tables.values():
+                table.close()
+            self._tables.clear()
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+            self.closed = True
+
+
+def connect(
+    database: str,
+    scan_workers: int = 0,
+    scan_ordered: bool = True,
+    lazy_blobs: bool = False,
+    vectorized: bool = False,
+    **kwargs: Any,
+) -> Connection:
+    """Connect to the directory of Paradox tables at the supplied path."""
+    return Connection(
+        database, scan_workers=scan_workers, scan_ordered=scan_ordered, lazy_blobs=lazy_blobs, vectorized=vectorized
+    )
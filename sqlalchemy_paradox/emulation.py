@@ -0,0 +1,752 @@
+"""Client-side emulation of SQL features the Intersolv Paradox driver lacks."""
+# coding=utf-8
+
+from sqlalchemy.sql import elements, visitors, operators as sqla_operators
+from sqlalchemy.sql.selectable import Join, Alias, TableClause, CompoundSelect, FromGrouping
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+from itertools import chain, islice
+from tempfile import TemporaryFile
+import pickle
+from typing import Any, List, Dict, Tuple, Callable, Iterable, Iterator, Optional
+
+
+def unwrap_element(element: Any) -> Any:
+    """Strip any labels, label references and groupings from the supplied element."""
+    while isinstance(
+        element,
+        (
+            elements.Label,
+            elements.Grouping,
+            elements._label_reference,
+        ),
+    ):
+        element = element.element
+    return element
+
+
+def order_direction(element: Any) -> Tuple[Any, bool]:
+    """Split an ORDER BY element into its expression and whether it sorts descending."""
+    descending = False
+    element = unwrap_element(element)
+    while isinstance(element, elements.UnaryExpression) and element.modifier in (
+        sqla_operators.desc_op,
+        sqla_operators.asc_op,
+        sqla_operators.nullsfirst_op,
+        sqla_operators.nullslast_op,
+    ):
+        if element.modifier is sqla_operators.desc_op:
+            descending = True
+        element = unwrap_element(element.element)
+    return element, descending
+
+
+def stream_rows(cursor: Any, chunk_size: int = 500) -> Iterator[Tuple[Any, ...]]:
+    """Lazily yield every row of the supplied DBAPI cursor, fetching them in chunks."""
+    while True:
+        chunk = cursor.fetchmany(chunk_size)
+        if not chunk:
+            return
+        for row in chunk:
+            yield tuple(row)
+
+
+def sorted_indexes(rows: List[Tuple[Any, ...]], keys: List[Tuple[int, bool]]) -> List[int]:
+    """Get the indexes of the supplied rows in (position, descending) key order, NULLs first."""
+    indexes = list(range(len(rows)))
+    # Python's sort is stable, so sorting by each key from last to first
+    # gives the same result as a single multi-column ORDER BY would
+    for position, descending in reversed(keys):
+        indexes.sort(key=lambda index: (rows[index][position] is not None, rows[index][position]), reverse=descending)
+    return indexes
+
+
+def sort_rows(rows: Iterable[Tuple[Any, ...]], keys: List[Tuple[int, bool]]) -> List[Tuple[Any, ...]]:
+    """Sort the supplied rows by the given (position, descending) keys, NULLs first."""
+    rows = list(rows)
+    return [rows[index] for index in sorted_indexes(rows, keys)]
+
+
+class ClientCursor:
+    """A DBAPI cursor stand-in that serves rows computed on the client.
+
+    The driver cursor the rows are (usually) sourced from is kept around so that
+    closing the client cursor releases it, and so any attribute not implemented
+    here is still answered by the driver's cursor.
+    """
+
+    rowcount = -1
+
+    def __init__(self, cursor: Any, description: List[Tuple[Any, ...]], rows: Iterable[Tuple[Any, ...]]):
+        self._cursor = cursor
+        self._rows = iter(rows)
+        self.description = description
+        self.arraysize = getattr(cursor, "arraysize", 1) or 1
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self._cursor, item)
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        return self._rows
+
+    def fetchone(self) -> Optional[Tuple[Any, ...]]:
+        """Fetch the next row."""
+        return next(self._rows, None)
+
+    def fetchmany(self, size: Optional[int] = None) -> List[Tuple[Any, ...]]:
+        """Fetch the next `size` rows."""
+        return list(islice(self._rows, size or self.arraysize))
+
+    def fetchall(self) -> List[Tuple[Any, ...]]:
+        """Fetch all the remaining rows."""
+        return list(self._rows)
+
+    def close(self) -> None:
+        """Close the underlying driver cursor, if there is one."""
+        self._rows = iter(())
+        if self._cursor is not None:
+            self._cursor.close()
+
+
+def describe(names: Iterable[str]) -> List[Tuple[Any, ...]]:
+    """Build a DBAPI cursor description for client-computed columns."""
+    return [(name, None, None, None, None, None, True) for name in names]
+
+
+class Aggregate:
+    """Accumulator for one of the aggregate functions the driver supports."""
+
+    def __init__(self, name: str, distinct: bool = False, count_rows: bool = False):
+        self.name = name.upper()
+        self.count_rows = count_rows
+        self.seen = set() if distinct else None
+        self.count = 0
+        self.total: Any = None
+
+    def step(self, value: Any) -> None:
+        """Fold the supplied value into the running aggregate."""
+        if self.count_rows:
+            self.count += 1
+            return
+        # Aggregates ignore NULL values, exactly as they would on the server
+        if value is None:
+            return
+        if self.seen is not None:
+            if value in self.seen:
+                return
+            self.seen.add(value)
+        self.count += 1
+        if self.total is None:
+            self.total = value
+        elif self.name in ("SUM", "AVG"):
+            self.total += value
+        elif self.name == "MIN":
+            self.total = min(self.total, value)
+        elif self.name == "MAX":
+            self.total = max(self.total, value)
+
+    def result(self) -> Any:
+        """The final value of the aggregate."""
+        if self.name == "COUNT":
+            return self.count
+        if self.name == "AVG" and self.total is not None:
+            return self.total / self.count
+        return self.total
+
+
+class ClientPlan:
+    """Base class for statements partially evaluated on the client.
+
+    `statement` is what actually gets compiled and sent to the driver. Its rows
+    are handed to `evaluate`, and the resulting rows are then sorted on the
+    client by any (position, descending) keys in `order_by`, as the statement's
+    own ORDER BY can only be applied after evaluation.
+    """
+
+    def __init__(self, statement: Any, order_by: List[Tuple[int, bool]], chunk_size: int = 500):
+        self.statement = statement
+        self.order_by = order_by
+        self.chunk_size = chunk_size
+
+    def evaluate(self, rows: Iterator[Tuple[Any, ...]]) -> Iterator[Tuple[Any, ...]]:
+        """Compute the statement's rows from the rows the driver returned."""
+        raise NotImplementedError()
+
+    def cursor(self, cursor: Any, names: List[str]) -> ClientCursor:
+        """Wrap the driver cursor the statement was executed on."""
+        rows = self.evaluate(stream_rows(cursor, self.chunk_size))
+        if self.order_by:
+            rows = iter(sort_rows(rows, self.order_by))
+        return ClientCursor(cursor, describe(names), rows)
+
+
+class GroupedAggregation(ClientPlan):
+    """A GROUP BY evaluated on the client from a pruned, pre-sorted projection.
+
+    The projection fetched from the driver holds the group keys first (with the
+    `presorted` leading keys also used as the base query's ORDER BY) followed by
+    the aggregate arguments. Groups are hashed only within each run of equal
+    presorted keys and flushed as soon as that run ends, so memory use is bounded
+    by the largest run rather than by the size of the table. The presorted keys
+    have to be sorted the way Python compares them (see
+    `ParadoxSQLCompiler._plan_grouped_aggregation`); with none, every group is
+    held until the rows run out.
+
+    Group keys are compared the way Python compares them, so text keys are
+    case-sensitive, unlike the driver's own GROUP BY (which collates text
+    without case): "Acme" and "ACME" make two groups here where the driver
+    would make one. Grouping by `func.upper(column)` makes one group of them
+    either way.
+    """
+
+    def __init__(
+        self,
+        statement: Any,
+        key_count: int,
+        presorted: int,
+        outputs: List[Tuple[str, Any]],
+        order_by: List[Tuple[int, bool]],
+        chunk_size: int = 500,
+    ):
+        super().__init__(statement, order_by, chunk_size)
+        self.key_count = key_count
+        self.presorted = presorted
+        self.outputs = outputs
+
+    def _new_aggregates(self) -> List[Aggregate]:
+        """Create a fresh set of accumulators for a newly-seen group."""
+        return [
+            Aggregate(spec[0], distinct=spec[2], count_rows=spec[1] is None)
+            for kind, spec in self.outputs
+            if kind == "aggregate"
+        ]
+
+    def _flush(self, groups: Dict[Tuple[Any, ...], List[Aggregate]]) -> Iterator[Tuple[Any, ...]]:
+        """Emit one output row for each of the supplied groups."""
+        for key, aggregates in groups.items():
+            results = iter([aggregate.result() for aggregate in aggregates])
+            yield tuple(key[spec] if kind == "key" else next(results) for kind, spec in self.outputs)
+
+    def evaluate(self, rows: Iterator[Tuple[Any, ...]]) -> Iterator[Tuple[Any, ...]]:
+        """Aggregate the supplied projection rows, one presorted run at a time."""
+        arguments = [spec[1] for kind, spec in self.outputs if kind == "aggregate"]
+        groups: Dict[Tuple[Any, ...], List[Aggregate]] = dict()
+        run = None
+
+        for row in rows:
+            prefix = row[: self.presorted]
+            if prefix != run:
+                yield from self._flush(groups)
+                groups, run = dict(), prefix
+
+            key = row[: self.key_count]
+            aggregates = groups.get(key)
+            if aggregates is None:
+                aggregates = groups[key] = self._new_aggregates()
+
+            for aggregate, position in zip(aggregates, arguments):
+                aggregate.step(None if position is None else row[position])
+
+        yield from self._flush(groups)
+
+
+class WindowFunction:
+    """A single `func.xxx().over(...)` column being emulated on the client.
+
+    `argument` is the projection position of the function's argument (None for
+    ROW_NUMBER, COUNT(*) and friends), `order_by` holds the window's own
+    (position, descending) ordering, and `frame` is one of "partition" (the
+    whole partition), "peers" (the SQL default RANGE frame, running through
+    the current row's peers) or "rows" (running through the current row).
+    """
+
+    ranking = {"ROW_NUMBER", "RANK", "DENSE_RANK"}
+    offsets = {"LAG", "LEAD"}
+    aggregates = {"SUM", "AVG", "COUNT", "MIN", "MAX"}
+    supported = ranking | offsets | aggregates
+
+    def __init__(
+        self,
+        name: str,
+        argument: Optional[int],
+        order_by: List[Tuple[int, bool]],
+        frame: str,
+        offset: int = 1,
+        default: Any = None,
+    ):
+        self.name = name.upper()
+        self.argument = argument
+        self.order_by = order_by
+        self.frame = frame
+        self.offset = offset
+        self.default = default
+
+    def _peer_groups(self, rows: List[Tuple[Any, ...]]) -> Iterator[List[int]]:
+        """Split the (already ordered) partition into runs of peer rows."""
+        positions = [pos for pos, _ in self.order_by]
+        group: List[int] = list()
+        previous = None
+        for index, row in enumerate(rows):
+            key = tuple(row[pos] for pos in positions)
+            if group and key != previous:
+                yield group
+                group = list()
+            group.append(index)
+            previous = key
+        if group:
+            yield group
+
+    def compute(self, partition: List[Tuple[Any, ...]]) -> List[Any]:
+        """Compute the function's value for every row of the supplied partition."""
+        order = sorted_indexes(partition, self.order_by)
+        rows = [partition[index] for index in order]
+
+        values: List[Any] = [None] * len(rows)
+
+        if self.name in self.ranking:
+            dense = 0
+            for group in self._peer_groups(rows):
+                dense += 1
+                for index in group:
+                    if self.name == "ROW_NUMBER":
+                        values[index] = index + 1
+                    elif self.name == "RANK":
+                        values[index] = group[0] + 1
+                    else:
+                        values[index] = dense
+
+        elif self.name in self.offsets:
+            step = -self.offset if self.name == "LAG" else self.offset
+            for index in range(len(rows)):
+                other = index + step
+                values[index] = rows[other][self.argument] if 0 <= other < len(rows) else self.default
+
+        else:
+            aggregate = Aggregate(self.name, count_rows=self.argument is None)
+            if self.frame == "partition" or not self.order_by:
+                for row in rows:
+                    aggregate.step(None if self.argument is None else row[self.argument])
+                values = [aggregate.result()] * len(rows)
+            else:
+                groups = self._peer_groups(rows) if self.frame == "peers" else ([index] for index in range(len(rows)))
+                for group in groups:
+                    for index in group:
+                        aggregate.step(None if self.argument is None else rows[index][self.argument])
+                    for index in group:
+                        values[index] = aggregate.result()
+
+        ret_val: List[Any] = [None] * len(partition)
+        for sorted_index, original_index in enumerate(order):
+            ret_val[original_index] = values[sorted_index]
+        return ret_val
+
+
+class WindowEmulation(ClientPlan):
+    """Window functions evaluated on the client over a partition-ordered projection.
+
+    The projection fetched from the driver holds the PARTITION BY keys first
+    (and is ordered by them), followed by every other column the statement and
+    its window functions need. Rows are buffered one partition at a time, so
+    memory use is bounded by the largest partition rather than the whole result.
+    """
+
+    def __init__(
+        self,
+        statement: Any,
+        partition_count: int,
+        windows: List[WindowFunction],
+        outputs: List[Tuple[str, int]],
+        order_by: List[Tuple[int, bool]],
+        chunk_size: int = 500,
+    ):
+        super().__init__(statement, order_by, chunk_size)
+        self.partition_count = partition_count
+        self.windows = windows
+        self.outputs = outputs
+
+    def _emit(self, partition: List[Tuple[Any, ...]]) -> Iterator[Tuple[Any, ...]]:
+        """Compute the window functions for a complete partition and emit its rows."""
+        values = [window.compute(partition) for window in self.windows]
+        for index in sorted_indexes(partition, self.windows[0].order_by):
+            row = partition[index]
+            yield tuple(row[spec] if kind == "column" else values[spec][index] for kind, spec in self.outputs)
+
+    def evaluate(self, rows: Iterator[Tuple[Any, ...]]) -> Iterator[Tuple[Any, ...]]:
+        """Evaluate the window functions, one partition at a time."""
+        partition: List[Tuple[Any, ...]] = list()
+        current = None
+
+        for row in rows:
+            key = row[: self.partition_count]
+            if partition and key != current:
+                yield from self._emit(partition)
+                partition = list()
+            partition.append(row)
+            current = key
+
+        if partition:
+            yield from self._emit(partition)
+
+
+def compound_branches(compound: CompoundSelect) -> Optional[List[Any]]:
+    """Flatten a UNION / UNION ALL into its individual SELECTs.
+
+    Nested compound selects are only flattened if they use the same keyword as
+    their parent, as `a UNION ALL b UNION c` means something different when
+    split apart. Returns None for anything else (INTERSECT, EXCEPT or a mix).
+    """
+    if compound.keyword not in (CompoundSelect.UNION, CompoundSelect.UNION_ALL):
+        return None
+
+    branches = list()
+    for select in compound.selects:
+        select = unwrap_element(select)
+        # Nested compound selects are parenthesized in their parent's list of SELECTs
+        if isinstance(select, FromGrouping):
+            select = select.element
+        if isinstance(select, CompoundSelect):
+            if select.keyword != compound.keyword:
+                return None
+            nested = compound_branches(select)
+            if nested is None:
+                return None
+            branches.extend(nested)
+        else:
+            branches.append(select)
+
+    return branches
+
+
+class ParallelCompound:
+    """A UNION / UNION ALL whose branches are executed concurrently.
+
+    Each of `branches` is a callable that executes one SELECT on its own pooled
+    connection and returns that SELECT's raw rows. The results are merged on the
+    client, de-duplicated for UNION or concatenated for UNION ALL, and then sorted
+    by any (position, descending) keys in `order_by`.
+    """
+
+    def __init__(
+        self,
+        branches: List[Callable[[], List[Tuple[Any, ...]]]],
+        distinct: bool,
+        order_by: List[Tuple[int, bool]],
+        workers: int,
+    ):
+        self.branches = branches
+        self.distinct = distinct
+        self.order_by = order_by
+        self.workers = max(1, min(workers, len(branches)))
+
+    def execute(self) -> Iterator[Tuple[Any, ...]]:
+        """Execute every branch and merge their results."""
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="paradox-union") as executor:
+            results = [future.result() for future in [executor.submit(branch) for branch in self.branches]]
+
+        rows: Iterable[Tuple[Any, ...]] = (tuple(row) for row in chain.from_iterable(results))
+
+        if self.distinct:
+            rows = iter(dict.fromkeys(rows))
+
+        if self.order_by:
+            rows = sort_rows(rows, self.order_by)
+
+        return iter(rows)
+
+    def cursor(self, cursor: Any, names: List[str]) -> ClientCursor:
+        """Serve the merged results in place of the (unused) driver cursor."""
+        return ClientCursor(cursor, describe(names), self.execute())
+
+
+def conjuncts(clause: Any) -> List[Any]:
+    """Split the supplied clause into the expressions AND-ed together in it."""
+    clause = unwrap_element(clause)
+    if clause is None:
+        return list()
+    if isinstance(clause, elements.BooleanClauseList) and clause.operator is sqla_operators.and_:
+        return list(chain.from_iterable(conjuncts(element) for element in clause.clauses))
+    return [clause]
+
+
+def referenced_tables(clause: Any) -> set:
+    """Get the set of tables whose columns are referenced by the supplied clause."""
+    return {
+        element.table
+        for element in chain((clause,), visitors.iterate(clause, {}))
+        if isinstance(element, elements.ColumnClause) and getattr(element, "table", None) is not None
+    }
+
+
+def join_chain(from_clause: Any) -> Optional[List[Tuple[Any, List[Tuple[Any, Any]], bool]]]:
+    """Break a left-deep chain of equi-joins into its tables.
+
+    Returns a list of (table, [(earlier column, table column)...], is outer)
+    tuples, with the first table (which has no join condition) first, or None
+    if the FROM clause isn't made up solely of inner and left outer joins on
+    column equalities.
+    """
+    if isinstance(from_clause, (TableClause, Alias)):
+        return [(from_clause, list(), False)]
+
+    if not isinstance(from_clause, Join) or from_clause.full:
+        return None
+
+    # Right-nested joins aren't supported by the driver either
+    if not isinstance(from_clause.right, (TableClause, Alias)):
+        return None
+
+    chained = join_chain(from_clause.left)
+    if chained is None:
+        return None
+
+    earlier = {table for table, _, _ in chained}
+    right = from_clause.right
+    pairs = list()
+
+    for condition in conjuncts(from_clause.onclause):
+        if not (
+            isinstance(condition, elements.BinaryExpression)
+            and condition.operator is sqla_operators.eq
+            and isinstance(condition.left, elements.ColumnClause)
+            and isinstance(condition.right, elements.ColumnClause)
+        ):
+            return None
+
+        left_column, right_column = condition.left, condition.right
+        if left_column.table is right:
+            left_column, right_column = right_column, left_column
+
+        if right_column.table is not right or left_column.table not in earlier:
+            return None
+
+        pairs.append((left_column, right_column))
+
+    if not pairs:
+        return None
+
+    return chained + [(right, pairs, from_clause.isouter)]
+
+
+class HashJoin:
+    """One equi-join of a streamed probe side against a hashed build side.
+
+    The build side's rows are loaded into a hash table keyed on `build_key`.
+    If more than `budget` rows turn up, the join switches to a grace hash join:
+    both sides are partitioned into temporary files by key hash, and each
+    partition is then joined in memory on its own. As in SQL, rows with a NULL
+    in their join key never match anything.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[], Iterator[Tuple[Any, ...]]],
+        build_key: List[int],
+        probe_key: List[int],
+        width: int,
+        outer: bool = False,
+        budget: int = 250000,
+        partitions: int = 16,
+    ):
+        self.build = build
+        self.build_key = build_key
+        self.probe_key = probe_key
+        self.nulls = (None,) * width
+        self.outer = outer
+        self.budget = budget
+        self.partitions = partitions
+
+    def _probe(
+        self, table: Dict[Tuple[Any, ...], List[Tuple[Any, ...]]], rows: Iterable[Tuple[Any, ...]]
+    ) -> Iterator[Tuple[Any, ...]]:
+        """Probe the supplied hash table with each of the supplied rows."""
+        for row in rows:
+            matches = table.get(tuple(row[pos] for pos in self.probe_key))
+            if matches:
+                for match in matches:
+                    yield row + match
+            elif self.outer:
+                yield row + self.nulls
+
+    @staticmethod
+    def _spill(rows: Iterable[Tuple[Tuple[Any, ...], Tuple[Any, ...]]], files: List[Any]) -> None:
+        """Write each (key, row) pair to the partition file its key hashes to."""
+        for key, row in rows:
+            pickle.dump(row, files[hash(key) % len(files)], pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _unspill(partition: Any) -> Iterator[Tuple[Any, ...]]:
+        """Read back every row written to the supplied partition file."""
+        partition.seek(0)
+        while True:
+            try:
+                yield pickle.load(partition)
+            except EOFError:
+                return
+
+    def _grace(
+        self,
+        table: Dict[Tuple[Any, ...], List[Tuple[Any, ...]]],
+        build: Iterator[Tuple[Any, ...]],
+        probe: Iterator[Tuple[Any, ...]],
+    ) -> Iterator[Tuple[Any, ...]]:
+        """Join the two sides one on-disk partition at a time."""
+        build_files = [TemporaryFile() for _ in range(self.partitions)]
+        probe_files = [TemporaryFile() for _ in range(self.partitions)]
+
+        try:
+            self._spill(((key, row) for key, rows in table.items() for row in rows), build_files)
+            table.clear()
+            self._spill(self._keyed(build, self.build_key), build_files)
+
+            for row in probe:
+                key = tuple(row[pos] for pos in self.probe_key)
+                if None in key:
+                    if self.outer:
+                        yield row + self.nulls
+                    continue
+                self._spill(((key, row),), probe_files)
+
+            for build_file, probe_file in zip(build_files, probe_files):
+                partition: Dict[Tuple[Any, ...], List[Tuple[Any, ...]]] = defaultdict(list)
+                for row in self._unspill(build_file):
+                    partition[tuple(row[pos] for pos in self.build_key)].append(row)
+                yield from self._probe(partition, self._unspill(probe_file))
+        finally:
+            for partition in chain(build_files, probe_files):
+                partition.close()
+
+    @staticmethod
+    def _keyed(
+        rows: Iterable[Tuple[Any, ...]], positions: List[int]
+    ) -> Iterator[Tuple[Tuple[Any, ...], Tuple[Any, ...]]]:
+        """Pair each row with its join key, skipping rows whose key contains a NULL."""
+        for row in rows:
+            key = tuple(row[pos] for pos in positions)
+            if None not in key:
+                yield key, row
+
+    def join(self, probe: Iterator[Tuple[Any, ...]]) -> Iterator[Tuple[Any, ...]]:
+        """Join the supplied probe rows against the build side."""
+        table: Dict[Tuple[Any, ...], List[Tuple[Any, ...]]] = defaultdict(list)
+        build = self.build()
+        count = 0
+
+        for key, row in self._keyed(build, self.build_key):
+            table[key].append(row)
+            count += 1
+            if count > self.budget:
+                yield from self._grace(table, build, probe)
+                return
+
+        yield from self._probe(table, probe)
+
+
+class HashJoinPipeline:
+    """A multi-table SELECT evaluated as a left-deep pipeline of client-side hash joins.
+
+    The first table's rows are streamed from `probe` through each of `joins` in
+    turn, and the selected columns are then picked out of the combined rows by
+    their positions in `outputs`.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], Iterator[Tuple[Any, ...]]],
+        joins: List[HashJoin],
+        outputs: List[int],
+        order_by: List[Tuple[int, bool]],
+    ):
+        self.probe = probe
+        self.joins = joins
+        self.outputs = outputs
+        self.order_by = order_by
+
+    def execute(self) -> Iterator[Tuple[Any, ...]]:
+        """Run the pipeline."""
+        rows = self.probe()
+        for join in self.joins:
+            rows = join.join(rows)
+
+        rows = (tuple(row[pos] for pos in self.outputs) for row in rows)
+
+        if self.order_by:
+            return iter(sort_rows(rows, self.order_by))
+        return rows
+
+    def cursor(self, cursor: Any, names: List[str]) -> ClientCursor:
+        """Serve the joined rows in place of the driver's own join."""
+        return ClientCursor(cursor, describe(names), self.execute())
+
+
+class SemiJoinKeys:
+    """A semi-join whose inner keys are fetched up front and inlined as literals.
+
+    The compiler renders `token` in place of the (NOT) EXISTS predicate, and
+    `statement` is the uncorrelated SELECT of the inner key column. Once its
+    distinct keys are known, `predicate` renders the replacement for `token`:
+    `column` tested against the keys in IN lists of at most `chunk_size` values.
+    """
+
+    def __init__(self, token: str, column: str, statement: Any, negate: bool, chunk_size: int = 250):
+        self.token = token
+        self.column = column
+        self.statement = statement
+        self.negate = negate
+        self.chunk_size = max(1, chunk_size)
+
+    def predicate(self, keys: Iterable[Any], literal: Callable[[Any], str]) -> str:
+        """Render the predicate matching (or, negated, excluding) the supplied keys."""
+        values = [literal(key) for key in dict.fromkeys(keys) if key is not None]
+
+        if not values:
+            return "1 = 1" if self.negate else "1 = 0"
+
+        lists = " OR ".join(
+            f"{self.column} IN ({', '.join(values[pos : pos + self.chunk_size])})"
+            for pos in range(0, len(values), self.chunk_size)
+        )
+
+        if self.negate:
+            return f"({self.column} IS NULL OR NOT ({lists}))"
+        return f"({lists})"
+
+
+class DDLBatch:
+    """Index builds held back while a batch of tables is created (and, optionally, loaded).
+
+    Each CREATE TABLE still runs as it's executed, but the PRIMARY and secondary
+    index builds for the tables are queued here, per table, and `build` runs
+    them in a predictable order: every table's primary index first (in the
+    order the tables were created), then each table's secondary indexes, one
+    table at a time. With `defer_indexes`, secondary indexes are left for the
+    end of the batch, so they're built once over the loaded rows rather than
+    maintained for each inserted row.
+    """
+
+    def __init__(self, defer_indexes: bool = False):
+        self.defer_indexes = defer_indexes
+        self.primary: Dict[str, List[str]] = dict()
+        self.secondary: Dict[str, List[str]] = dict()
+
+    def add(self, table_name: str, statement: str) -> None:
+        """Queue a CREATE INDEX statement for the named table."""
+        words = statement.split()
+        is_primary = any(
+            word.casefold() == "index" and following.strip("`").casefold() == "primary"
+            for word, following in zip(words, words[1:])
+        )
+        queue = self.primary if is_primary else self.secondary
+        queue.setdefault(table_name.casefold(), list()).append(statement)
+
+    def discard(self, table_name: str) -> None:
+        """Forget any queued index builds for a table (e.g. because it's been dropped)."""
+        self.primary.pop(table_name.casefold(), None)
+        self.secondary.pop(table_name.casefold(), None)
+
+    def build(self, execute: Callable[[str], Any], secondary: bool = True) -> None:
+        """Run the queued primary index builds and (unless told not to) secondary ones."""
+        queues = (self.primary, self.secondary) if secondary else (self.primary,)
+        for queue in queues:
+            while queue:
+                for statement in queue.pop(next(iter(queue))):
+                    execute(statement)
@@ -0,0 +1,152 @@
+"""On-demand table reflection for large Paradox directories."""
+# coding=utf-8
+
+from sqlalchemy import MetaData, Table, inspect
+from threading import Thread, Lock, RLock
+from typing import Any, Dict, List, Iterable, Iterator, Optional
+
+from .watcher import DATA, CREATED, DROPPED, TableChange, SchemaWatcher
+
+
+class LazyParadoxMetaData:
+    """A MetaData whose tables are only reflected when they're first asked for.
+
+    Legacy Paradox directories routinely hold thousands of tables, most of which
+    any one application never touches. Only the directory's table names are
+    fetched up front (with a single SQLTables call); each table's columns,
+    primary key and indexes are reflected into `metadata` the first time it's
+    looked up. Lookups are case-insensitive and thread-safe: tables that have
+    already been reflected are returned without taking any lock, and each
+    table is only reflected by one thread at a time, while other threads go on
+    reflecting (or looking up) other tables.
+
+    `hot_tables` are reflected by a background thread as soon as the object is
+    created (unless `warmup` is False), so that the tables an application is
+    known to use are usually ready by the time it asks for them. When the
+    engine's dialect has a persistent `reflection_cache`, reflection is served
+    from that wherever the tables' files haven't changed.
+
+    Given a SchemaWatcher (see `ParadoxDialect.watch_schema`), tables whose
+    structure changes are dropped from `metadata` and reflected again the next
+    time they're looked up, and the list of table names is refreshed whenever a
+    table is created or dropped.
+    """
+
+    def __init__(
+        self,
+        bind: Any,
+        metadata: Optional[MetaData] = None,
+        hot_tables: Optional[Iterable[str]] = None,
+        warmup: bool = True,
+        watcher: Optional[SchemaWatcher] = None,
+    ):
+        self.bind = bind
+        self.metadata = metadata if metadata is not None else MetaData()
+        self.lock = RLock()
+        self._names: Optional[Dict[str, str]] = None
+        self._reflected: Dict[str, Table] = dict()
+        self._table_locks: Dict[str, Lock] = dict()
+        self.hot_tables = list(hot_tables or list())
+        self.warmup_thread: Optional[Thread] = None
+
+        if watcher is not None:
+            watcher.subscribe(self.invalidate)
+
+        if warmup and self.hot_tables:
+            self.warmup()
+
+    def _catalog(self) -> Dict[str, str]:
+        """Map the case-folded names of the directory's tables to their catalog spellings."""
+        names = self._names
+        if names is not None:
+            return names
+        with self.lock:
+            if self._names is None:
+                self._names = {name.casefold(): name for name in inspect(self.bind).get_table_names()}
+            return self._names
+
+    @property
+    def table_names(self) -> List[str]:
+        """The names of every table in the directory."""
+        return list(self._catalog().values())
+
+    def reflect_table(self, name: str) -> Table:
+        """Get a table, reflecting it first if it hasn't been already."""
+        key = name.casefold()
+        table = self._reflected.get(key, None)
+        if table is not None:
+            return table
+
+        table_name = self._catalog().get(key, None)
+        if table_name is None:
+            raise KeyError(name)
+
+        with self._table_lock(key):
+            table = self._reflected.get(key, None)
+            if table is None:
+                if table_name not in self.metadata.tables:
+                    Table(table_name, self.metadata, autoload_with=self.bind, resolve_fks=False)
+                table = self._reflected[key] = self.metadata.tables[table_name]
+            return table
+
+    def _table_lock(self, key: str) -> Lock:
+        """Get the lock that serializes reflecting (and forgetting) one (case-folded) table name."""
+        with self.lock:
+            return self._table_locks.setdefault(key, Lock())
+
+    def invalidate(self, change: TableChange) -> None:
+        """Forget what's been reflected about a table that's been restructured, created or dropped."""
+        if change.kind == DATA:
+            return
+
+        if change.kind in (CREATED, DROPPED):
+            with self.lock:
+                self._names = None
+
+        key = change.table.casefold()
+        with self._table_lock(key):
+            self._reflected.pop(key, None)
+            for table in list(self.metadata.tables.values()):
+                if table.name.casefold() == key:
+                    self.metadata.remove(table)
+
+    def warmup(self, names: Optional[Iterable[str]] = None) -> Thread:
+        """Reflect the supplied tables (by default, `hot_tables`) on a background thread."""
+        names = list(names) if names is not None else list(self.hot_tables)
+
+        def reflect_all() -> None:
+            """Reflect each of the tables, skipping any that don't exist."""
+            for name in names:
+                try:
+                    self.reflect_table(name)
+                except KeyError:
+                    continue
+
+        self.warmup_thread = Thread(target=reflect_all, name="paradox-warmup", daemon=True)
+        self.warmup_thread.start()
+        return self.warmup_thread
+
+    @property
+    def tables(self) -> Dict[str, Table]:
+        """The tables that have been reflected so far."""
+        with self.lock:
+            return dict(self.metadata.tables)
+
+    def __getitem__(self, name: str) -> Table:
+        return self.reflect_table(name)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Get a table if the directory has one by the supplied name, or `default` if not."""
+        try:
+            return self.reflect_table(name)
+        except KeyError:
+            return default
+
+    def __contains__(self, name: str) -> bool:
+        return name.casefold() in self._catalog()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.table_names)
+
+    def __len__(self) -> int:
+        return len(self.table_names)
@@ -0,0 +1,1198 @@
+"""SQLAlchemy support for reading Paradox tables straight from their files, without ODBC."""
+# coding=utf-8
+
+from sqlalchemy import and_, select
+from sqlalchemy.sql import elements, functions, operators as sqla_operators
+from sqlalchemy.sql.selectable import Alias, TableClause
+from sqlalchemy.engine.url import URL
+from collections.abc import Sequence, Sized
+from datetime import date, datetime
+from decimal import Decimal as PyDecimal
+from functools import lru_cache
+from itertools import islice
+import operator
+import re
+from typing import Any, List, Dict, Tuple, Callable, Iterable, Iterator, Optional, Set
+
+from . import dbapi as native_dbapi, pxfile
+from .base import ParadoxDialect, ParadoxSQLCompiler, ParadoxExecutionContext, LongVarBinary, strtobool
+from .emulation import Aggregate, order_direction, sorted_indexes
+
+Row = Tuple[Any, ...]
+Evaluate = Callable[[Row], Any]
+
+# The aggregate functions a SelectQuery computes itself (see emulation.Aggregate)
+AGGREGATE_FUNCTIONS = ("count", "min", "max", "sum", "avg")
+
+COMPARISONS = {
+    sqla_operators.eq: operator.eq,
+    sqla_operators.ne: operator.ne,
+    sqla_operators.lt: operator.lt,
+    sqla_operators.le: operator.le,
+    sqla_operators.gt: operator.gt,
+    sqla_operators.ge: operator.ge,
+}
+
+ARITHMETIC = {
+    sqla_operators.add: operator.add,
+    sqla_operators.sub: operator.sub,
+    sqla_operators.mul: operator.mul,
+    sqla_operators.div: operator.truediv,
+    sqla_operators.truediv: operator.truediv,
+    sqla_operators.mod: operator.mod,
+    sqla_operators.concat_op: lambda left, right: f"{left}{right}",
+}
+
+# The comparisons a key range can be planned from, and what each one becomes with its sides swapped
+RANGE_OPERATORS = {
+    sqla_operators.eq: sqla_operators.eq,
+    sqla_operators.lt: sqla_operators.gt,
+    sqla_operators.le: sqla_operators.ge,
+    sqla_operators.gt: sqla_operators.lt,
+    sqla_operators.ge: sqla_operators.le,
+}
+
+# The comparisons a vectorized scan can test records with (see vectorized.block_mask), by name
+PUSHDOWN_COMPARISONS = {
+    sqla_operators.eq: "eq",
+    sqla_operators.ne: "ne",
+    sqla_operators.lt: "lt",
+    sqla_operators.le: "le",
+    sqla_operators.gt: "gt",
+    sqla_operators.ge: "ge",
+}
+
+# SQLAlchemy 1.4 renamed the negated operators, keeping the old names as aliases
+NOT_IN = getattr(sqla_operators, "not_in_op", sqla_operators.notin_op)
+NOT_LIKE = getattr(sqla_operators, "not_like_op", sqla_operators.notlike_op)
+NOT_ILIKE = getattr(sqla_operators, "not_ilike_op", sqla_operators.notilike_op)
+NOT_BETWEEN = getattr(sqla_operators, "not_between_op", sqla_operators.notbetween_op)
+IS_NOT = getattr(sqla_operators, "is_not", sqla_operators.isnot)
+
+STRING_TESTS = {
+    sqla_operators.startswith_op: (str.startswith, False),
+    sqla_operators.notstartswith_op: (str.startswith, True),
+    sqla_operators.endswith_op: (str.endswith, False),
+    sqla_operators.notendswith_op: (str.endswith, True),
+    sqla_operators.contains_op: (lambda value, part: part in value, False),
+    sqla_operators.notcontains_op: (lambda value, part: part in value, True),
+}
+
+SCALAR_FUNCTIONS = {
+    "lower": str.lower,
+    "upper": str.upper,
+    "trim": str.strip,
+    "ltrim": str.lstrip,
+    "rtrim": str.rstrip,
+    "abs": abs,
+    "length": len,
+    "char_length": len,
+    "round": round,
+}
+
+
+@lru_cache(maxsize=256)
+def like_pattern(pattern: str, escape: Optional[str] = None, ignore_case: bool = False) -> Any:
+    """Translate a LIKE pattern into a compiled regular expression."""
+    translated, escaped = list(), False
+    for character in pattern:
+        if escaped:
+            translated.append(re.escape(character))
+            escaped = False
+        elif escape is not None and character == escape:
+            escaped = True
+        elif character == "%":
+            translated.append(".*")
+        elif character == "_":
+            translated.append(".")
+        else:
+            translated.append(re.escape(character))
+    return re.compile("".join(translated), re.DOTALL | (re.IGNORECASE if ignore_case else 0))
+
+
+def conjunction(values: Iterable[Any]) -> Optional[bool]:
+    """AND together the supplied values, with SQL's three-valued logic."""
+    result: Optional[bool] = True
+    for value in values:
+        if value is None:
+            result = None
+        elif not value:
+            return False
+    return result
+
+
+def disjunction(values: Iterable[Any]) -> Optional[bool]:
+    """OR together the supplied values, with SQL's three-valued logic."""
+    result: Optional[bool] = False
+    for value in values:
+        if value is None:
+            result = None
+        elif value:
+            return True
+    return result
+
+
+def negation(value: Any) -> Optional[bool]:
+    """Negate the supplied value, with SQL's three-valued logic."""
+    return None if value is None else not value
+
+
+class Evaluator:
+    """Compiles SQLAlchemy expressions into functions evaluating them against a row.
+
+    `resolve` is asked about every (sub-)expression first, and answers with the
+    position in the row holding its value, or None if the expression should be
+    evaluated from its parts. `parameters` holds the values of the statement's
+    bind parameters. Anything that can't be evaluated raises NotSupportedError.
+
+    The values at the `blobs` positions are Memo / BLOB handles (see
+    `pxfile.Blob`), which are read when an expression uses them.
+    """
+
+    def __init__(
+        self, resolve: Callable[[Any], Optional[int]], parameters: Dict[Any, Any], blobs: Iterable[int] = ()
+    ):
+        self.resolve = resolve
+        self.parameters = parameters
+        self.blobs = frozenset(blobs)
+
+    def __call__(self, element: Any) -> Evaluate:
+        position = self.resolve(element)
+        if position is not None:
+            if position in self.blobs:
+                return lambda row: pxfile.load(row[position])
+            return operator.itemgetter(position)
+
+        if isinstance(element, (elements.Label, elements.Grouping)):
+            return self(element.element)
+        if isinstance(element, elements.TypeCoerce):
+            return self(element.clause)
+        if isinstance(element, elements.BindParameter):
+            value = self.value(element)
+            return lambda row: value
+        if isinstance(element, elements.Null):
+            return lambda row: None
+        if isinstance(element, elements.True_):
+            return lambda row: True
+        if isinstance(element, elements.False_):
+            return lambda row: False
+        if isinstance(element, elements.BooleanClauseList):
+            return self.boolean(element)
+        if isinstance(element, elements.BinaryExpression):
+            return self.binary(element)
+        if isinstance(element, elements.UnaryExpression):
+            return self.unary(element)
+        if isinstance(element, elements.Case):
+            return self.case(element)
+        if isinstance(element, elements.Cast):
+            return self.cast(element)
+        if isinstance(element, functions.FunctionElement):
+            return self.function(element)
+
+        raise native_dbapi.NotSupportedError(f"The native Paradox reader can't evaluate {element!r}")
+
+    def value(self, bindparam: Any) -> Any:
+        """Get the value a bind parameter is being executed with."""
+        if bindparam in self.parameters:
+            return self.parameters[bindparam]
+        return bindparam.effective_value
+
+    def boolean(self, element: Any) -> Evaluate:
+        """Evaluate AND / OR."""
+        clauses = [self(clause) for clause in element.clauses]
+        combine = conjunction if element.operator is sqla_operators.and_ else disjunction
+        if element.operator not in (sqla_operators.and_, sqla_operators.or_):
+            raise native_dbapi.NotSupportedError(f"Unsupported clause list operator {element.operator}")
+        return lambda row: combine(clause(row) for clause in clauses)
+
+    def binary(self, element: Any) -> Evaluate:
+        """Evaluate comparisons, arithmetic and the SQL predicates (IN, LIKE, BETWEEN, IS...)."""
+        op = element.operator
+        left = self(element.left)
+
+        if op in (sqla_operators.in_op, NOT_IN):
+            return self.membership(left, element.right, op is NOT_IN)
+        if op in (sqla_operators.between_op, NOT_BETWEEN):
+            return self.between(left, element.right, op is NOT_BETWEEN)
+
+        right = self(element.right)
+        if op in (sqla_operators.is_, IS_NOT):
+            negate = op is IS_NOT
+
+            def evaluate(row: Row) -> bool:
+                first, second = left(row), right(row)
+                same = first is second if first is None or second is None else first == second
+                return same is not negate
+
+            return evaluate
+
+        if op in (sqla_operators.like_op, NOT_LIKE, sqla_operators.ilike_op, NOT_ILIKE):
+            escape = element.modifiers.get("escape", None)
+            ignore_case = op in (sqla_operators.ilike_op, NOT_ILIKE)
+            negate = op in (NOT_LIKE, NOT_ILIKE)
+
+            def evaluate(row: Row) -> Optional[bool]:
+                value, pattern = left(row), right(row)
+                if value is None or pattern is None:
+                    return None
+                matched = like_pattern(pattern, escape, ignore_case).fullmatch(str(value)) is not None
+                return matched is not negate
+
+            return evaluate
+
+        if op in STRING_TESTS:
+            test, negate = STRING_TESTS[op]
+
+            def evaluate(row: Row) -> Optional[bool]:
+                value, part = left(row), right(row)
+                if value is None or part is None:
+                    return None
+                return test(str(value), str(part)) is not negate
+
+            return evaluate
+
+        function = COMPARISONS.get(op, None) or ARITHMETIC.get(op, None)
+        if function is None:
+            raise native_dbapi.NotSupportedError(f"The native Paradox reader doesn't support the {op} operator")
+
+        def evaluate(row: Row) -> Any:
+            first, second = left(row), right(row)
+            if first is None or second is None:
+                return None
+            return function(first, second)
+
+        return evaluate
+
+    def membership(self, left: Evaluate, right: Any, negate: bool) -> Evaluate:
+        """Evaluate (NOT) IN, over a list of values or an expanding bind parameter."""
+        if isinstance(right, elements.Grouping):
+            right = right.element
+        if isinstance(right, elements.BindParameter):
+            values = self.value(right)
+            candidates = [lambda row, value=value: value for value in values]
+        elif isinstance(right, elements.ClauseList):
+            candidates = [self(clause) for clause in right.clauses]
+        else:
+            raise native_dbapi.NotSupportedError("The native Paradox reader only supports IN over a list of values")
+
+        def evaluate(row: Row) -> Optional[bool]:
+            value = left(row)
+            if value is None:
+                return None
+            found = disjunction(
+                None if candidate is None else value == candidate for candidate in (each(row) for each in candidates)
+            )
+            return found if found is None else found is not negate
+
+        return evaluate
+
+    def between(self, left: Evaluate, right: Any, negate: bool) -> Evaluate:
+        """Evaluate (NOT) BETWEEN."""
+        lower, upper = (self(clause) for clause in right.clauses)
+
+        def evaluate(row: Row) -> Optional[bool]:
+            value, low, high = left(row), lower(row), upper(row)
+            result = conjunction(
+                (
+                    None if value is None or low is None else low <= value,
+                    None if value is None or high is None else value <= high,
+                )
+            )
+            return result if result is None else result is not negate
+
+        return evaluate
+
+    def unary(self, element: Any) -> Evaluate:
+        """Evaluate NOT and negation."""
+        operand = self(element.element)
+        if element.operator is sqla_operators.inv or element.operator is sqla_operators.isfalse:
+            return lambda row: negation(operand(row))
+        if element.operator is sqla_operators.istrue:
+            return lambda row: None if operand(row) is None else bool(operand(row))
+        if element.operator is sqla_operators.neg:
+            return lambda row: None if operand(row) is None else -operand(row)
+        raise native_dbapi.NotSupportedError(f"The native Paradox reader can't evaluate {element!r}")
+
+    def case(self, element: Any) -> Evaluate:
+        """Evaluate CASE, in either its searched or its simple form."""
+        subject = self(element.value) if element.value is not None else None
+        whens = [(self(condition), self(result)) for condition, result in element.whens]
+        otherwise = self(element.else_) if element.else_ is not None else (lambda row: None)
+
+        def evaluate(row: Row) -> Any:
+            value = subject(row) if subject is not None else None
+            for condition, result in whens:
+                test = condition(row)
+                if (test == value and value is not None) if subject is not None else test:
+                    return result(row)
+            return otherwise(row)
+
+        return evaluate
+
+    def cast(self, element: Any) -> Evaluate:
+        """Evaluate CAST, for the types with a Python equivalent."""
+        operand = self(element.clause)
+        try:
+            python_type = element.type.python_type
+        except NotImplementedError:
+            return operand
+        convert = (lambda value: PyDecimal(str(value))) if python_type is PyDecimal else python_type
+        return lambda row: None if operand(row) is None else convert(operand(row))
+
+    def function(self, element: Any) -> Evaluate:
+        """Evaluate the scalar SQL functions with an obvious Python equivalent."""
+        name = element.name.lower()
+        arguments = [self(clause) for clause in element.clauses.clauses]
+
+        if name == "coalesce":
+            return lambda row: next((value for value in (each(row) for each in arguments) if value is not None), None)
+        if name == "concat":
+            return lambda row: "".join(str(value) for value in (each(row) for each in arguments) if value is not None)
+        if name not in SCALAR_FUNCTIONS:
+            raise native_dbapi.NotSupportedError(f"The native Paradox reader can't evaluate {name}()")
+
+        function = SCALAR_FUNCTIONS[name]
+
+        def evaluate(row: Row) -> Any:
+            values = [each(row) for each in arguments]
+            if any(value is None for value in values):
+                return None
+            return function(*values)
+
+        return evaluate
+
+
+class BlankRecords(Sequence):
+    """Some number of records, none of whose values are needed, e.g. by a query that only counts them."""
+
+    def __init__(self, count: int):
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [()] * len(range(self.count)[index])
+        if not -self.count <= index < self.count:
+            raise IndexError(index)
+        return ()
+
+
+class SelectQuery:
+    """A SELECT against a single Paradox table, evaluated as the table's records are read.
+
+    Only the fields the statement refers to are decoded from each record,
+    and the WHERE clause filters the decoded records. Aggregates (with or
+    without a GROUP BY, and any HAVING) are accumulated by
+    emulation.Aggregate, and ORDER BY, DISTINCT, LIMIT and OFFSET are
+    applied in Python. Statements needing anything else (joins, subqueries,
+    window functions...) raise NotSupportedError.
+
+    A statement that refers to no fields and has no WHERE clause, like an
+    unfiltered COUNT(*), doesn't read any records: the table's header says
+    how many there are.
+
+    `scan_workers`, `scan_ordered` and `vectorized` override the connection's
+    settings for scans (see `dbapi.Connection`). Records of sorted or
+    aggregated queries are scanned in whatever order they're decoded, unless
+    `scan_ordered` says otherwise.
+
+    Memo / BLOB values are only read from the .MB file if the query uses them
+    (in its WHERE clause, say), or once a record is selected. With
+    `lazy_blobs` (by default, the connection's setting), selected Memo / BLOB
+    columns are returned as `pxfile.Blob` handles, to be read as and if needed.
+    """
+
+    def __init__(
+        self,
+        select: Any,
+        parameters: Dict[Any, Any],
+        names: List[str],
+        scan_workers: Optional[int] = None,
+        scan_ordered: Optional[bool] = None,
+        lazy_blobs: Optional[bool] = None,
+        vectorized: Optional[bool] = None,
+    ):
+        self.select = select
+        self.parameters = parameters
+        self.names = names
+        self.scan_workers = scan_workers
+        self.scan_ordered = scan_ordered
+        self.lazy_blobs = lazy_blobs
+        self.vectorized = vectorized
+
+        froms = select.froms
+        if len(froms) > 1:
+            raise native_dbapi.NotSupportedError("The native Paradox reader can only SELECT from one table")
+        self.source = froms[0] if froms else None
+
+        table = self.source.element if isinstance(self.source, Alias) else self.source
+        if table is not None and not isinstance(table, TableClause):
+            raise native_dbapi.NotSupportedError("The native Paradox reader can only SELECT from a table")
+        self.table_name = getattr(table, "name", None)
+
+    def _is_source(self, table: Any) -> bool:
+        """Check whether a column's table is the one being selected from."""
+        if table is self.source or table is getattr(self.source, "element", None):
+            return True
+        return getattr(table, "name", None) == getattr(self.source, "name", ())
+
+    def _field_resolver(self, fields: Iterable[Any]) -> Callable[[Any], Optional[int]]:
+        """Resolve the source's columns to the positions of the corresponding fields in its records."""
+        positions = {field.name.casefold(): position for position, field in enumerate(fields)}
+
+        def resolve(element: Any) -> Optional[int]:
+            if not isinstance(element, elements.ColumnClause) or element.is_literal:
+                return None
+            if element.table is None or not self._is_source(element.table):
+                raise native_dbapi.NotSupportedError(f"{element} doesn't belong to {self.table_name}")
+            position = positions.get(element.name.casefold(), None)
+            if position is None:
+                raise native_dbapi.ProgrammingError(f"{self.table_name} has no field named {element.name}")
+            return position
+
+        return resolve
+
+    def _conjuncts(self) -> List[Any]:
+        """Split the WHERE clause into the predicates that are ANDed together at its top level."""
+        pending, conjuncts = [self.select._whereclause], list()
+        while pending:
+            clause = pending.pop(0)
+            while isinstance(clause, elements.Grouping):
+                clause = clause.element
+            if isinstance(clause, elements.BooleanClauseList) and clause.operator is sqla_operators.and_:
+                pending.extend(clause.clauses)
+            elif clause is not None:
+                conjuncts.append(clause)
+        return conjuncts
+
+    def _constant(self, element: Any) -> Tuple[bool, Any]:
+        """Evaluate an expression that doesn't depend on any record, returning whether it could be."""
+
+        def resolve(column: Any) -> None:
+            if isinstance(column, elements.ColumnClause):
+                raise native_dbapi.NotSupportedError("Not a constant")
+
+        try:
+            return True, Evaluator(resolve, self.parameters)(element)(())
+        except (native_dbapi.NotSupportedError, TypeError, ValueError):
+            return False, None
+
+    def _field_name(self, element: Any) -> Optional[str]:
+        """Get the (case-folded) name of the field a column of the source refers to."""
+        while isinstance(element, (elements.Label, elements.Grouping)):
+            element = element.element
+        if isinstance(element, elements.ColumnClause) and not element.is_literal and element.table is not None:
+            if self._is_source(element.table):
+                return element.name.casefold()
+        return None
+
+    def _projection(self, fields: Tuple[Any, ...]) -> Optional[List[int]]:
+        """Find the positions of the fields the query uses anywhere, in the table's order, so only those are decoded.
+
+        Returns None (decode every field) if the query uses all of them, or
+        refers to columns that aren't the source's fields, which `rows` will
+        then complain about.
+        """
+        select = self.select
+        clauses = [
+            *select.inner_columns,
+            *([select._whereclause] if select._whereclause is not None else []),
+            *select._group_by_clause.clauses,
+            *([select._having] if select._having is not None else []),
+            *select._order_by_clause.clauses,
+        ]
+        positions = {field.name.casefold(): position for position, field in enumerate(fields)}
+        used: Set[int] = set()
+        pending = list(clauses)
+        while pending:
+            element = pending.pop()
+            if isinstance(element, elements.ColumnClause) and not element.is_literal:
+                name = self._field_name(element)
+                if name not in positions:
+                    return None
+                used.add(positions[name])
+            else:
+                pending.extend(element.get_children())
+        return sorted(used) if len(used) < len(fields) else None
+
+    def _bounds(self) -> Dict[str, List[Tuple[Any, Any]]]:
+        """Collect the comparisons between a field and a constant the WHERE clause requires, by field."""
+        bounds: Dict[str, List[Tuple[Any, Any]]] = dict()
+        for clause in self._conjuncts():
+            if not isinstance(clause, elements.BinaryExpression):
+                continue
+
+            if clause.operator is sqla_operators.between_op:
+                name = self._field_name(clause.left)
+                values = [self._constant(each) for each in clause.right.clauses]
+                if name is not None and all(known and value is not None for known, value in values):
+                    bounds.setdefault(name, list()).extend(
+                        ((sqla_operators.ge, values[0][1]), (sqla_operators.le, values[1][1]))
+                    )
+                continue
+
+            if clause.operator not in RANGE_OPERATORS:
+                continue
+            op, column, other = clause.operator, clause.left, clause.right
+            if self._field_name(column) is None:
+                op, column, other = RANGE_OPERATORS[op], other, column
+            name, (known, value) = self._field_name(column), self._constant(other)
+            if name is not None and known and value is not None:
+                bounds.setdefault(name, list()).append((op, value))
+
+        return bounds
+
+    def _key_range(
+        self, key_names: List[str], equal_only: Iterable[str] = ()
+    ) -> Optional[Tuple[Optional[Row], Optional[Row]]]:
+        """Work out the (inclusive) range of an index key the WHERE clause restricts records to.
+
+        The range covers equalities on the key's leading fields, then at most
+        one more field's lower and / or upper bounds (unless it's one of the
+        `equal_only` fields). Returns None if the WHERE clause doesn't restrict
+        the key's first field.
+        """
+        bounds = self._bounds()
+        low: List[Any] = list()
+        high: List[Any] = list()
+        try:
+            for name in key_names:
+                comparisons = bounds.get(name, list())
+                equal = [value for op, value in comparisons if op is sqla_operators.eq]
+                if equal:
+                    low.append(equal[0])
+                    high.append(equal[0])
+                    continue
+
+                if name in equal_only:
+                    break
+                lower = [value for op, value in comparisons if op in (sqla_operators.gt, sqla_operators.ge)]
+                upper = [value for op, value in comparisons if op in (sqla_operators.lt, sqla_operators.le)]
+                if lower:
+                    low.append(max(lower))
+                if upper:
+                    high.append(min(upper))
+                break
+        except TypeError:
+            return None
+
+        if not (low or high):
+            return None
+        return tuple(low) or None, tuple(high) or None
+
+    def _pushdown(self, table: Any) -> Optional[Tuple[Any, ...]]:
+        """Plan the part of the WHERE clause a vectorized scan can test whole batches of records against.
+
+        The predicate (see `vectorized.block_mask`) matches every record the
+        WHERE clause does, and perhaps others: `rows` still applies the whole
+        clause to the records that match it.
+        """
+        if self.select._whereclause is None:
+            return None
+        fields = {field.name.casefold(): field for field in table.fields}
+        return self._predicate(self.select._whereclause, fields, table.encoding)[0]
+
+    def _predicate(
+        self, clause: Any, fields: Dict[str, Any], encoding: str
+    ) -> Tuple[Optional[Tuple[Any, ...]], bool]:
+        """Translate a (part of a) WHERE clause into a block predicate, and whether it's exact.
+
+        A predicate that isn't exact only narrows records down (e.g. an AND
+        missing the parts that couldn't be translated), so can't be negated.
+        """
+        while isinstance(clause, elements.Grouping):
+            clause = clause.element
+
+        if isinstance(clause, elements.BooleanClauseList):
+            parts = [self._predicate(each, fields, encoding) for each in clause.clauses]
+            predicates = [predicate for predicate, _ in parts if predicate is not None]
+            exact = all(predicate is not None and exact for predicate, exact in parts)
+            if clause.operator is sqla_operators.and_:
+                return ("and", *predicates) if predicates else None, exact
+            if clause.operator is sqla_operators.or_ and len(predicates) == len(parts):
+                return ("or", *predicates), exact
+            return None, False
+
+        if isinstance(clause, elements.UnaryExpression) and clause.operator is sqla_operators.inv:
+            predicate, exact = self._predicate(clause.element, fields, encoding)
+            return (("not", predicate), True) if predicate is not None and exact else (None, False)
+
+        if not isinstance(clause, elements.BinaryExpression):
+            return None, False
+        predicate = self._comparison(clause, fields, encoding)
+        return predicate, predicate is not None
+
+    def _comparison(self, clause: Any, fields: Dict[str, Any], encoding: str) -> Optional[Tuple[Any, ...]]:
+        """Translate a comparison of a field with constants into a block predicate, if it can be."""
+        op, column, other = clause.operator, clause.left, clause.right
+        if op in RANGE_OPERATORS and self._field_name(column) is None:
+            op, column, other = RANGE_OPERATORS[op], other, column
+        name = self._field_name(column)
+        field = fields.get(name, None)
+        if field is None:
+            return None
+
+        while isinstance(other, elements.Grouping):
+            other = other.element
+        if op in (sqla_operators.is_, IS_NOT) and isinstance(other, elements.Null):
+            return ("null", name) if op is sqla_operators.is_ else ("not", ("null", name))
+
+        if op in (sqla_operators.between_op, NOT_BETWEEN):
+            values = [self._constant(each) for each in other.clauses]
+            if not all(known and self._pushable(field, value) for known, value in values):
+                return None
+            predicate = ("and", ("compare", name, "ge", values[0][1]), ("compare", name, "le", values[1][1]))
+            return predicate if op is sqla_operators.between_op else ("not", predicate)
+
+        if op in (sqla_operators.in_op, NOT_IN):
+            values = [self._constant(other)] if isinstance(other, elements.BindParameter) else None
+            if values is not None and values[0][0] and isinstance(values[0][1], (list, tuple)):
+                candidates = list(values[0][1])
+            elif isinstance(other, elements.ClauseList):
+                constants = [self._constant(each) for each in other.clauses]
+                if not all(known for known, _ in constants):
+                    return None
+                candidates = [value for _, value in constants]
+            else:
+                return None
+            if not all(self._pushable(field, value) for value in candidates):
+                return None
+            predicate = ("in", name, tuple(candidates))
+            return predicate if op is sqla_operators.in_op else ("not", predicate)
+
+        known, value = self._constant(other)
+        if not known:
+            return None
+
+        if op in (sqla_operators.like_op, NOT_LIKE) and not clause.modifiers.get("escape", None):
+            if field.type != pxfile.ALPHA or not isinstance(value, str):
+                return None
+            prefix = value.rstrip("%")
+            if "%" in prefix or "_" in prefix:
+                return None
+            if prefix == value:
+                predicate = ("compare", name, "eq", value) if self._pushable(field, value) else None
+            else:
+                predicate = self._prefix(name, prefix, encoding)
+            if predicate is None:
+                return None
+            return predicate if op is sqla_operators.like_op else ("not", predicate)
+
+        if op in (sqla_operators.startswith_op, sqla_operators.notstartswith_op):
+            if field.type != pxfile.ALPHA or not isinstance(value, str):
+                return None
+            predicate = self._prefix(name, value, encoding)
+            if predicate is None:
+                return None
+            return predicate if op is sqla_operators.startswith_op else ("not", predicate)
+
+        if op in PUSHDOWN_COMPARISONS and self._pushable(field, value):
+            return "compare", name, PUSHDOWN_COMPARISONS[op], value
+        return None
+
+    @staticmethod
+    def _prefix(name: str, prefix: str, encoding: str) -> Optional[Tuple[Any, ...]]:
+        """Plan a test for Alpha values starting with some text, made against the field's raw bytes."""
+        if not prefix:
+            return "not", ("null", name)
+        try:
+            encoded = prefix.encode(encoding)
+        except UnicodeEncodeError:
+            return None
+        return ("prefix", name, encoded) if b"\x00" not in encoded else None
+
+    @staticmethod
+    def _pushable(field: Any, value: Any) -> bool:
+        """Check whether a field's values compare with a constant the same way in NumPy as they do in Python."""
+        if field.type in (pxfile.SHORT, pxfile.LONG, pxfile.AUTOINCREMENT, pxfile.NUMBER, pxfile.MONEY):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return False
+            # Larger integers would be compared with floats as floats, inexactly
+            return isinstance(value, float) or abs(value) <= 1 << 53
+        if field.type == pxfile.ALPHA:
+            return isinstance(value, str) and "\x00" not in value
+        if field.type == pxfile.DATE:
+            return isinstance(value, date) and not isinstance(value, datetime)
+        if field.type == pxfile.TIMESTAMP:
+            return isinstance(value, datetime) and value.tzinfo is None
+        if field.type == pxfile.LOGICAL:
+            return isinstance(value, bool)
+        return False
+
+    @staticmethod
+    def _equal_only(index: Any) -> List[str]:
+        """Get the names of an index's text key fields if it (maybe) ignores case, and so can only find equal text.
+
+        Its keys are then in case-insensitive order, but the WHERE clause
+        compares text case-sensitively, so a range of text could be spread
+        anywhere across the index.
+        """
+        if not (index.fold or index.ambiguous):
+            return list()
+        return [field.name.casefold() for field in index.key_fields if field.type == pxfile.ALPHA]
+
+    def _presorted(self, index: Any, descending: bool = False) -> bool:
+        """Check whether records in an index's order (or its reverse) are already in the order the query asks for.
+
+        They are if the query doesn't group them, and its ORDER BY clause
+        lists (a prefix of) the index's fields, all ascending (or, with
+        `descending`, all descending). Text fields don't count if the index
+        ignores case.
+        """
+        select = self.select
+        order_by = select._order_by_clause.clauses
+        if not order_by or select._group_by_clause.clauses or self._aggregates(select.inner_columns):
+            return False
+        if len(order_by) > len(index.key_fields):
+            return False
+        for clause, field in zip(order_by, index.key_fields):
+            expression, direction = order_direction(clause)
+            if direction != descending or self._field_name(expression) != field.name.casefold():
+                return False
+            if (index.fold or index.ambiguous) and field.type == pxfile.ALPHA:
+                return False
+        return True
+
+    def _scan(
+        self, connection: Any, table: Any, ordered: Optional[bool], fields: Optional[List[int]]
+    ) -> Iterable[Row]:
+        """Scan the whole table, a vectorized scan only yielding (roughly) the records the WHERE clause matches."""
+        vectorized = connection.vectorized if self.vectorized is None else self.vectorized
+        where = self._pushdown(table) if vectorized else None
+        return connection.scan(table, self.scan_workers, ordered, vectorized, where, fields)
+
+    def _records(
+        self, connection: Any, table: Any, ordered: Optional[bool], fields: Optional[List[int]] = None
+    ) -> Tuple[Iterable[Row], bool]:
+        """Read the records the WHERE clause could match, and whether they're already in ORDER BY order.
+
+        The primary index is used if the WHERE clause narrows the primary key,
+        otherwise the first secondary index (that's up to date) whose fields it
+        narrows. Failing that, a query sorted by a secondary index's fields
+        with a LIMIT reads the records in that index's order, and any other
+        query scans the whole table. Queries sorted by the primary key in
+        descending order read its index backwards. Only the fields at the
+        `fields` positions (by default, all of them) are decoded.
+        """
+        primary = table.primary_index
+        if primary is None:
+            return self._scan(connection, table, ordered, fields), False
+
+        presorted = self._presorted(primary)
+        reverse = not presorted and self._presorted(primary, descending=True)
+        key_names = [field.name.casefold() for field in primary.key_fields]
+        key_range = self._key_range(key_names, self._equal_only(primary))
+        if key_range is not None:
+            records = connection.key_range(table, *key_range, fields, reverse)
+            if records is not None:
+                return records, presorted or reverse
+
+        for index in table.secondary_indexes:
+            key_range = self._key_range([name.casefold() for name in index.fields], self._equal_only(index.tree))
+            if key_range is not None:
+                records = connection.secondary_range(table, index, *key_range, fields)
+                if records is not None:
+                    return records, self._presorted(index.tree)
+
+        if presorted:
+            return self._scan(connection, table, True, fields), True
+        if reverse:
+            records = connection.key_range(table, None, None, fields, reverse=True)
+            if records is not None:
+                return records, True
+
+        if getattr(self.select, "_limit_clause", None) is not None:
+            for index in table.secondary_indexes:
+                if self._presorted(index.tree):
+                    records = connection.secondary_range(table, index, None, None, fields)
+                    if records is not None:
+                        return records, True
+
+        return self._scan(connection, table, ordered, fields), False
+
+    def _key_extremes(self, connection: Any, table: Any, fields: Optional[List[int]]) -> Optional[List[Row]]:
+        """Read just the records a query needs if all it wants is the lowest and / or highest primary key.
+
+        That's a query whose only aggregates are MIN() and MAX() of the
+        leading primary key field, with no WHERE or GROUP BY clause, and
+        which refers to no other field. The records with the lowest and
+        highest (non-blank) keys are found at either end of the .PX index,
+        reading only the data blocks they're in. Returns None for any other
+        query, or if the index can't be read.
+        """
+        select = self.select
+        primary = table.primary_index
+        if primary is None or fields != [0] or select._whereclause is not None or select._group_by_clause.clauses:
+            return None
+        order_by = [order_direction(clause)[0] for clause in select._order_by_clause.clauses]
+        aggregates = self._aggregates(
+            [*select.inner_columns, *([select._having] if select._having is not None else []), *order_by]
+        )
+        key = primary.key_fields[0]
+        if not aggregates or ((primary.fold or primary.ambiguous) and key.type == pxfile.ALPHA):
+            return None
+        for aggregate in aggregates:
+            arguments = [self._field_name(argument) for argument in aggregate.clauses.clauses]
+            if aggregate.name.lower() not in ("min", "max") or arguments != [key.name.casefold()]:
+                return None
+
+        found = list()
+        for reverse in sorted({aggregate.name.lower() == "max" for aggregate in aggregates}):
+            records = connection.key_range(table, None, None, fields, reverse)
+            if records is None:
+                return None
+            record = next((record for record in records if record[0] is not None), None)
+            if record is not None:
+                found.append(record)
+        return found
+
+    def _aggregates(self, clauses: Iterable[Any]) -> List[Any]:
+        """Find the aggregate function calls among the supplied clauses (but not nested in other aggregates)."""
+        found: List[Any] = list()
+
+        def visit(element: Any) -> None:
+            if isinstance(element, functions.FunctionElement) and element.name.lower() in AGGREGATE_FUNCTIONS:
+                if not any(element is aggregate for aggregate in found):
+                    found.append(element)
+                return
+            for child in element.get_children():
+                visit(child)
+
+        for clause in clauses:
+            visit(clause)
+        return found
+
+    def _accumulator(self, aggregate: Any, evaluate: Evaluator) -> Tuple[Optional[Evaluate], Callable[[], Aggregate]]:
+        """Plan one aggregate: how to evaluate its argument, and how to start a fresh accumulator for it."""
+        name, arguments = aggregate.name.lower(), list(aggregate.clauses.clauses)
+        if len(arguments) > 1:
+            raise native_dbapi.NotSupportedError(f"{name}() takes a single argument")
+
+        argument = arguments[0] if arguments else None
+        if argument is None or (isinstance(argument, elements.ColumnClause) and argument.is_literal):
+            if name != "count" or (argument is not None and argument.name != "*"):
+                raise native_dbapi.NotSupportedError(f"The native Paradox reader can't evaluate {aggregate}")
+            return None, lambda: Aggregate(name, count_rows=True)
+
+        distinct = False
+        if isinstance(argument, elements.UnaryExpression) and argument.operator is sqla_operators.distinct_op:
+            argument, distinct = argument.element, True
+        return evaluate(argument), lambda: Aggregate(name, distinct=distinct)
+
+    def _grouped(self, rows: Iterable[Row], evaluate: Evaluator) -> Tuple[Iterable[Row], Callable[[Any], Any]]:
+        """Group and aggregate the filtered records, returning the group rows and how to resolve against them.
+
+        Each group row holds the group's key values followed by the results of
+        its aggregates.
+        """
+        select = self.select
+        group_by = list(select._group_by_clause.clauses)
+        order_by = [order_direction(clause)[0] for clause in select._order_by_clause.clauses]
+        aggregates = self._aggregates(
+            [*select.inner_columns, *([select._having] if select._having is not None else []), *order_by]
+        )
+        keys = [evaluate(clause) for clause in group_by]
+        plans = [self._accumulator(aggregate, evaluate) for aggregate in aggregates]
+
+        groups: Dict[Row, List[Aggregate]] = dict()
+        if not group_by and isinstance(rows, Sized) and all(argument is None for argument, _ in plans):
+            # Counting rows doesn't need to look at them, and they're already counted
+            groups[()] = [start() for _, start in plans]
+            for accumulator in groups[()]:
+                accumulator.count = len(rows)
+            rows = ()
+        for row in rows:
+            key = tuple(each(row) for each in keys)
+            accumulators = groups.get(key, None)
+            if accumulators is None:
+                accumulators = groups[key] = [start() for _, start in plans]
+            for (argument, _), accumulator in zip(plans, accumulators):
+                accumulator.step(argument(row) if argument is not None else None)
+
+        if not groups and not group_by:
+            # Aggregating no rows at all still produces a row, e.g. COUNT(*) = 0
+            groups[()] = [start() for _, start in plans]
+
+        group_rows = [
+            key + tuple(accumulator.result() for accumulator in accumulators) for key, accumulators in groups.items()
+        ]
+
+        def same(first: Any, second: Any) -> bool:
+            if isinstance(first, elements.ColumnClause) and isinstance(second, elements.ColumnClause):
+                return first.name.casefold() == second.name.casefold() and not (first.is_literal or second.is_literal)
+            return first is second or first.compare(second)
+
+        def resolve(element: Any) -> Optional[int]:
+            for position, aggregate in enumerate(aggregates):
+                if element is aggregate:
+                    return len(group_by) + position
+            for position, clause in enumerate(group_by):
+                if same(element, clause):
+                    return position
+            if isinstance(element, elements.ColumnClause) and not element.is_literal:
+                raise native_dbapi.ProgrammingError(f"{element} must appear in the GROUP BY clause or an aggregate")
+            return None
+
+        return group_rows, resolve
+
+    def _order_keys(self, evaluate: Evaluator) -> List[Tuple[Callable[[Row, Row], Any], bool]]:
+        """Plan the ORDER BY keys, each a function of a (source or group) row and the output row built from it."""
+        keys = list()
+        for clause in self.select._order_by_clause.clauses:
+            expression, descending = order_direction(clause)
+            if isinstance(expression, elements._textual_label_reference):
+                try:
+                    position = self.names.index(expression.element)
+                except ValueError:
+                    raise native_dbapi.ProgrammingError(f"Can't ORDER BY unknown column {expression.element}")
+                keys.append((lambda row, output, position=position: output[position], descending))
+            else:
+                key = evaluate(expression)
+                keys.append((lambda row, output, key=key: key(row), descending))
+        return keys
+
+    def _bound(self, clause: Any, evaluate: Evaluator) -> Optional[int]:
+        """Get the value of a LIMIT / OFFSET clause."""
+        if clause is None:
+            return None
+        value = evaluate(clause)(())
+        return int(value) if value is not None else None
+
+    def rows(
+        self, records: Iterable[Row], fields: Iterable[Any], presorted: bool = False, lazy_blobs: bool = False
+    ) -> Iterator[Row]:
+        """Evaluate the query against the supplied (decoded) records, which may already be in ORDER BY order.
+
+        With `lazy_blobs`, Memo / BLOB columns are returned as they are in the
+        records, as handles, rather than read.
+        """
+        select = self.select
+        fields = list(fields)
+        resolve = self._field_resolver(fields)
+        blobs = [position for position, field in enumerate(fields) if field.type in pxfile.BLOB_TYPES]
+        evaluate = Evaluator(resolve, self.parameters, blobs)
+
+        if select._whereclause is not None:
+            where = evaluate(select._whereclause)
+            records = (record for record in records if where(record))
+
+        if select._group_by_clause.clauses or self._aggregates(select.inner_columns):
+            records, resolve = self._grouped(records, evaluate)
+            evaluate = Evaluator(resolve, self.parameters)
+            if select._having is not None:
+                having = evaluate(select._having)
+                records = [record for record in records if having(record)]
+
+        outputs = [evaluate(column) for column in select.inner_columns]
+        if lazy_blobs and blobs and not select._distinct and evaluate.resolve is resolve:
+            handles = Evaluator(resolve, self.parameters)
+            outputs = [
+                handles(column) if self._field_name(column) is not None else output
+                for column, output in zip(select.inner_columns, outputs)
+            ]
+        keys = self._order_keys(evaluate) if not presorted else list()
+        limit = self._bound(getattr(select, "_limit_clause", None), evaluate)
+        offset = self._bound(getattr(select, "_offset_clause", None), evaluate) or 0
+
+        rows: Iterable[Row] = (tuple(output(record) for output in outputs) for record in records)
+        if keys or select._distinct:
+            pairs: List[Tuple[Row, Row]] = list()
+            seen = set()
+            for record in records:
+                row = tuple(output(record) for output in outputs)
+                if select._distinct:
+                    if row in seen:
+                        continue
+                    seen.add(row)
+                pairs.append((row, tuple(key(record, row) for key, _ in keys)))
+            directions = [(position, descending) for position, (_, descending) in enumerate(keys)]
+            order = sorted_indexes([sort_key for _, sort_key in pairs], directions)
+            rows = (pairs[index][0] for index in order)
+
+        return islice(rows, offset, offset + limit if limit is not None else None)
+
+    def execute(self, connection: Any) -> Tuple[List[str], Iterable[Row]]:
+        """Run the query against a native DBAPI connection."""
+        if self.source is None:
+            return self.names, self._checked(self.rows([()], ()))
+
+        ordered = self.scan_ordered
+        if ordered is None and (self.select._order_by_clause.clauses or self._aggregates(self.select.inner_columns)):
+            ordered = False
+
+        lazy_blobs = connection.lazy_blobs if self.lazy_blobs is None else self.lazy_blobs
+        table = connection.table(self.table_name)
+        fields = self._projection(table.fields)
+        if fields == [] and self.select._whereclause is None:
+            # Nothing needs to be read from the records but how many there are, which the header keeps count of
+            records, presorted = BlankRecords(table.header.num_records), False
+        else:
+            records, presorted = self._key_extremes(connection, table, fields), False
+            if records is None:
+                records, presorted = self._records(connection, table, ordered, fields)
+        projected = table.fields if fields is None else [table.fields[number] for number in fields]
+        return self.names, self._checked(self.rows(records, projected, presorted, lazy_blobs))
+
+    @staticmethod
+    def _checked(rows: Iterator[Row]) -> Iterator[Row]:
+        """Report values that can't be compared or combined (e.g. text with numbers) as DBAPI errors."""
+        try:
+            yield from rows
+        except TypeError as error:
+            raise native_dbapi.DataError(str(error)) from error
+
+
+class NativeSQLCompiler(ParadoxSQLCompiler):
+    """Compiles statements for the native reader.
+
+    The SQL itself is only used for logging, the reader evaluates the SELECT
+    it was compiled from (recorded as `native_select`) directly.
+    """
+
+    native_select: Any = None
+
+    def visit_select(self, select, asfrom=False, **kwargs) -> str:
+        """Record the top-level SELECT for the execution context to evaluate."""
+        if not any((asfrom, self.stack, kwargs.get("compound_index", 0))):
+            self.native_select = self._omit_blobs(select)
+        return super(NativeSQLCompiler, self).visit_select(select, asfrom=asfrom, **kwargs)
+
+    def _plan_grouped_aggregation(self, select) -> None:
+        """The reader groups by as many columns as it's asked to."""
+        return None
+
+    def _plan_window_emulation(self, select) -> None:
+        """The reader can't evaluate window functions at all."""
+        return None
+
+
+class NativeExecutionContext(ParadoxExecutionContext):
+    """Hands the compiled SELECT's query, rather than its SQL, to the native DBAPI cursor."""
+
+    native_query: Optional[SelectQuery] = None
+
+    def pre_exec(self):
+        """Prepare the SELECT being executed for evaluation by the reader."""
+        select = getattr(self.compiled, "native_select", None)
+        if select is not None:
+            self.native_query = SelectQuery(
+                select,
+                self._native_parameters,
+                self._result_names,
+                scan_workers=self.execution_options.get("paradox_scan_workers", None),
+                scan_ordered=self.execution_options.get("paradox_scan_ordered", None),
+                lazy_blobs=self.execution_options.get("paradox_lazy_blobs", None),
+                vectorized=self.execution_options.get("paradox_vectorized", None),
+            )
+
+    @property
+    def _native_parameters(self) -> Dict[Any, Any]:
+        """The values being executed with, with any expanding IN parameters collected back into lists."""
+        values = self._bind_values
+        # SQLAlchemy 1.3 replaces each expanding parameter with one numbered parameter per value
+        expanded = getattr(self, "_expanded_parameters", None) or dict()
+        for bindparam, name in self.compiled.bind_names.items():
+            if name in expanded:
+                values[bindparam] = [self.compiled_parameters[0][key] for key in expanded[name]]
+        return values
+
+    def post_exec(self):
+        """Nothing to swap in, the reader's cursor already holds the results."""
+
+
+class NativeLongVarBinary(LongVarBinary):
+    """LongVarBinary, leaving the reader's Blob handles (see `lazy_blobs`) for the caller to read."""
+
+    def result_processor(self, dialect, coltype):
+        process = super(NativeLongVarBinary, self).result_processor(dialect, coltype)
+        if process is None:
+            return None
+
+        def result(value: Any) -> Any:
+            return value if isinstance(value, pxfile.Blob) else process(value)
+
+        return result
+
+
+# noinspection PyArgumentList
+class ParadoxDialect_native(ParadoxDialect):
+    """A read-only ParadoxDialect reading tables straight from their (memory-mapped) files.
+
+    Connect with `paradox+native:///path/to/tables`. It runs anywhere Python
+    does, with neither the Intersolv driver nor pyodbc, but only evaluates
+    SELECTs against a single table (see SelectQuery).
+    """
+
+    driver = "native"
+    default_paramstyle = "qmark"
+    statement_compiler = NativeSQLCompiler
+    execution_ctx_cls = NativeExecutionContext
+
+    # BCD fields are read as Decimals, not floats
+    supports_native_decimal = True
+
+    semijoin_strategy: Any = False
+    bind_blobs = False
+
+    colspecs = {LongVarBinary: NativeLongVarBinary}
+
+    @classmethod
+    def dbapi(cls):
+        """The native DBAPI module (SQLAlchemy < 2.0)."""
+        return native_dbapi
+
+    @classmethod
+    def import_dbapi(cls):
+        """The native DBAPI module (SQLAlchemy 2.0+)."""
+        return native_dbapi
+
+    def create_connect_args(self, url: URL) -> Tuple[List[Any], Dict[str, Any]]:
+        """Connect to the directory named by the URL's database (or its `database` query argument).
+
+        The `scan_workers` and `scan_ordered` query arguments configure parallel
+        scans, e.g. `paradox+native:///C:/Data?scan_workers=8&scan_ordered=false`,
+        `lazy_blobs=true` has Memo / BLOB values returned as `pxfile.Blob` handles,
+        and `vectorized=true` has scans decode records with NumPy.
+        """
+        directory = url.database or url.query.get("database", None)
+        if not directory:
+            raise native_dbapi.InterfaceError("paradox+native URLs need a directory, e.g. paradox+native:///C:/Data")
+        connect_args: Dict[str, Any] = {"database": directory}
+        if "scan_workers" in url.query:
+            connect_args["scan_workers"] = int(url.query["scan_workers"])
+        if "scan_ordered" in url.query:
+            connect_args["scan_ordered"] = strtobool(url.query["scan_ordered"])
+        if "lazy_blobs" in url.query:
+            connect_args["lazy_blobs"] = strtobool(url.query["lazy_blobs"])
+        if "vectorized" in url.query:
+            connect_args["vectorized"] = strtobool(url.query["vectorized"])
+        return [], connect_args
+
+    def on_connect(self) -> None:
+        """The native DBAPI needs no setting up."""
+        return None
+
+    def get(self, bind: Any, table: Any, key: Any) -> Any:
+        """Look up the row of a table with the supplied primary key (a value, or a tuple of one per key column).
+
+        The lookup goes through the table's .PX index, just like any other
+        SELECT whose WHERE clause pins down its primary key.
+        """
+        key = key if isinstance(key, tuple) else (key,)
+        columns = list(table.primary_key.columns)
+        if not 0 < len(key) <= len(columns):
+            raise native_dbapi.ProgrammingError(f"{table.name}'s primary key has {len(columns)} column(s)")
+        criteria = [column == value for column, value in zip(columns, key)]
+        return bind.execute(select([table]).where(and_(*criteria))).first()
+
+    def do_execute(self, cursor, statement, parameters, context=None):
+        """Execute the prepared query, if there is one, otherwise the statement's SQL."""
+        if any(getattr(context, flag, False) for flag in ("isinsert", "isupdate", "isdelete", "isddl")):
+            raise native_dbapi.NotSupportedError("The native Paradox reader is read-only")
+        cursor.execute(getattr(context, "native_query", None) or statement, parameters)
+
+    def do_executemany(self, cursor, statement, parameters, context=None):
+        """Nothing the reader can execute is worth executing many times."""
+        raise native_dbapi.NotSupportedError("The native Paradox reader is read-only")
@@ -0,0 +1,33 @@
+"""ORM helpers for Paradox tables."""
+# coding=utf-8
+
+from sqlalchemy import event
+from sqlalchemy.orm import deferred
+from sqlalchemy.ext.automap import automap_base as sqla_automap_base
+from typing import Any
+
+from .base import is_blob
+
+
+def defer_blob_columns(base: Any) -> Any:
+    """Defer the Memo / BLOB columns of every class mapped from the supplied base.
+
+    Their values are stored in each table's `.MB` file, so loading them costs an
+    extra read per row. Deferred, they're only loaded when first accessed (or
+    when a query asks for them with `undefer`).
+    """
+
+    @event.listens_for(base, "mapper_configured", propagate=True)
+    def defer_blobs(mapper, class_):
+        """Swap each of a mapper's blob column properties for a deferred one."""
+        for prop in list(mapper.column_attrs):
+            if not prop.deferred and len(prop.columns) == 1 and is_blob(prop.columns[0]):
+                mapper.add_property(prop.key, deferred(prop.columns[0]))
+
+    return base
+
+
+def automap_base(*args: Any, defer_blobs: bool = True, **kwargs: Any) -> Any:
+    """Create an automap base whose classes defer their Memo / BLOB columns (unless `defer_blobs` is False)."""
+    base = sqla_automap_base(*args, **kwargs)
+    return defer_blob_columns(base) if defer_blobs else base
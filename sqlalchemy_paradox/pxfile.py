@@ -0,0 +1,1138 @@
+"""Read Paradox table (.DB) and blob (.MB) files directly, without the Intersolv driver."""
+# coding=utf-8
+
+from concurrent.futures import Executor, Future, wait, FIRST_COMPLETED
+from collections import deque
+from itertools import accumulate
+from bisect import bisect_left, bisect_right
+from datetime import date, time, datetime, timedelta
+from decimal import Decimal as PyDecimal
+from struct import Struct, unpack_from
+from typing import Any, Set, Dict, List, Tuple, Callable, Iterable, Iterator, NamedTuple, Optional, Sequence
+import io
+import os
+import mmap
+import codecs
+
+from .blobs import BlobReader
+
+# Field type codes, as stored in a table header's field descriptors
+ALPHA = 0x01
+DATE = 0x02
+SHORT = 0x03
+LONG = 0x04
+MONEY = 0x05
+NUMBER = 0x06
+LOGICAL = 0x09
+MEMO = 0x0C
+BLOB = 0x0D
+FORMATTED_MEMO = 0x0E
+OLE = 0x0F
+GRAPHIC = 0x10
+TIME = 0x14
+TIMESTAMP = 0x15
+AUTOINCREMENT = 0x16
+BCD = 0x17
+BYTES = 0x18
+
+# The fields whose values are stored in the table's .MB file, behind a 10-byte pointer
+BLOB_TYPES = (MEMO, BLOB, FORMATTED_MEMO, OLE, GRAPHIC)
+
+# The names the Intersolv driver reports each field type by (see `ischema_names`)
+TYPE_NAMES = {
+    ALPHA: "ALPHA",
+    DATE: "DATE",
+    SHORT: "SHORT",
+    LONG: "LONG INTEGER",
+    MONEY: "MONEY",
+    NUMBER: "NUMBER",
+    LOGICAL: "LOGICAL",
+    MEMO: "MEMO",
+    BLOB: "BINARY",
+    FORMATTED_MEMO: "FORMATTEDMEMO",
+    OLE: "OLE",
+    GRAPHIC: "GRAPHIC",
+    TIME: "TIME",
+    TIMESTAMP: "TIMESTAMP",
+    AUTOINCREMENT: "AUTOINCREMENT",
+    BCD: "BCD",
+    BYTES: "BYTES",
+}
+
+# The file types a .DB file's header can declare: with and without a primary index
+INDEXED_DB = 0
+NON_INDEXED_DB = 2
+
+# The file type of a .PX file, and the three SHORTs (the block pointed to, the
+# number of records under it, and one that's unused) ending each of its entries
+PRIMARY_INDEX = 1
+INDEX_ENTRY_TAIL = 6
+
+# The file types of a secondary index's .Xnn file (whose records are only kept
+# up to date by Paradox if it's "incremental", i.e. maintained) and .Ynn file
+NON_INCREMENTAL_SECONDARY = (3, 6)
+INCREMENTAL_SECONDARY = (5, 8)
+SECONDARY_TREE = (4, 7)
+
+# The name of the field a secondary index's records end with, holding the
+# number of the data block the indexed record was in when it was indexed
+HINT_FIELD = "hint"
+
+# How many decoded index blocks an IndexTree keeps around between lookups
+INDEX_CACHE_BLOCKS = 4096
+
+# The offset of the field descriptors when a header has no "data header"
+FIELD_INFO = 0x58
+
+# The version-4+ "data header", and the DOS code page recorded in it
+DATA_HEADER_SIZE = 0x20
+CODE_PAGE = 0x6A
+
+# Each data block starts with its next / previous block numbers and its "add data size"
+BLOCK_HEADER = Struct("<HHh")
+
+# Paradox dates and timestamps count from 1/1/0001, which is day 1
+EPOCH = datetime(1, 1, 1)
+MILLISECONDS_PER_DAY = 86400000
+
+# Record size, header size, file type, maximum table size (in KiB blocks),
+# record count, next free block, block count, first and last data block
+HEADER = Struct("<HHBBIHHHH")
+
+
+class Field(NamedTuple):
+    """One of a table's fields, as described by its header."""
+
+    name: str
+    type: int
+    size: int
+    offset: int
+    width: int
+
+    @property
+    def type_name(self) -> str:
+        """The name the Intersolv driver reports the field's type by."""
+        return TYPE_NAMES.get(self.type, "BYTES")
+
+
+class Header(NamedTuple):
+    """The parts of a .DB file's header needed to read its records."""
+
+    record_size: int
+    header_size: int
+    file_type: int
+    block_size: int
+    num_records: int
+    next_block: int
+    file_blocks: int
+    first_block: int
+    last_block: int
+    index_root: int
+    index_levels: int
+    num_fields: int
+    pk_fields: int
+    encryption: int
+    version: int
+    auto_increment: int
+    encoding: str
+    table_name: str
+    fields: Tuple[Field, ...]
+
+
+def field_width(field_type: int, size: int) -> int:
+    """Get the number of bytes a field takes up in each record."""
+    # A BCD field's descriptor holds its number of decimal places, not its width
+    return 17 if field_type == BCD else size
+
+
+def parse_header(data: Any) -> Header:
+    """Parse the header at the start of a .DB file (or of a buffer holding one)."""
+    if len(data) < FIELD_INFO:
+        raise ValueError("Truncated Paradox header")
+
+    (
+        record_size,
+        header_size,
+        file_type,
+        max_table_size,
+        num_records,
+        next_block,
+        file_blocks,
+        first_block,
+        last_block,
+    ) = HEADER.unpack_from(data, 0)
+    index_root, index_levels = unpack_from("<HB", data, 0x1E)
+    num_fields, pk_fields = unpack_from("<HH", data, 0x21)
+    encryption = unpack_from("<I", data, 0x25)[0]
+    version = data[0x39]
+    auto_increment = unpack_from("<I", data, 0x49)[0]
+
+    field_info, encoding = FIELD_INFO, "cp437"
+    if file_type in (0, 2, 3, 5) and version >= 5:
+        field_info += DATA_HEADER_SIZE
+        code_page = unpack_from("<H", data, CODE_PAGE)[0]
+        try:
+            encoding = codecs.lookup(f"cp{code_page}").name
+        except LookupError:
+            pass
+
+    descriptors = unpack_from(f"<{2 * num_fields}B", data, field_info)
+    # Past the descriptors are a pointer to the table name and one per field name
+    # (neither of which mean anything on disk), then the names themselves
+    names_at = field_info + 2 * num_fields + 4 + 4 * num_fields
+    table_name_size = 261 if version >= 0x0C else 79
+    table_name = bytes(data[names_at : names_at + table_name_size]).split(b"\x00", 1)[0].decode(encoding)
+
+    fields, position, offset = list(), names_at + table_name_size, 0
+    for number in range(num_fields):
+        end = bytes(data[position : position + 512]).index(b"\x00")
+        field_type, size = descriptors[2 * number], descriptors[2 * number + 1]
+        width = field_width(field_type, size)
+        name = bytes(data[position : position + end]).decode(encoding)
+        fields.append(Field(name, field_type, size, offset, width))
+        position += end + 1
+        offset += width
+
+    return Header(
+        record_size,
+        header_size,
+        file_type,
+        max_table_size * 0x400,
+        num_records,
+        next_block,
+        file_blocks,
+        first_block,
+        last_block,
+        index_root,
+        index_levels,
+        num_fields,
+        pk_fields,
+        encryption,
+        version,
+        auto_increment,
+        encoding,
+        table_name,
+        tuple(fields),
+    )
+
+
+class TableStats(NamedTuple):
+    """What a table's header (and its file's metadata) say about it, without reading any of its records."""
+
+    rows: int
+    blocks: int
+    block_size: int
+    record_size: int
+    utilization: float
+    size: int
+    modified: datetime
+
+
+def header_stats(header: Header, stat: os.stat_result) -> TableStats:
+    """Summarize a table from its header, `utilization` being the share of its data blocks' record slots in use."""
+    per_block = (header.block_size - BLOCK_HEADER.size) // header.record_size if header.record_size else 0
+    capacity = header.file_blocks * per_block
+    return TableStats(
+        header.num_records,
+        header.file_blocks,
+        header.block_size,
+        header.record_size,
+        header.num_records / capacity if capacity else 0.0,
+        stat.st_size,
+        datetime.fromtimestamp(stat.st_mtime),
+    )
+
+
+def table_stats(path: str) -> TableStats:
+    """Summarize a table from its .DB file's header, reading (rather than mapping) just the header."""
+    with open(path, "rb") as reader:
+        stat = os.fstat(reader.fileno())
+        data = reader.read(FIELD_INFO)
+        if len(data) < FIELD_INFO:
+            raise ValueError("Truncated Paradox header")
+        data += reader.read(max(0, unpack_from("<H", data, 2)[0] - len(data)))
+    header = parse_header(data)
+    if header.file_type not in (INDEXED_DB, NON_INDEXED_DB):
+        raise ValueError(f"{path} isn't a Paradox table")
+    return header_stats(header, stat)
+
+
+def flipped_int(raw: bytes) -> Optional[int]:
+    """Decode a big-endian integer stored with its sign bit flipped (so that it sorts bytewise)."""
+    value = int.from_bytes(raw, "big")
+    if not value:
+        return None
+    sign = 1 << (8 * len(raw) - 1)
+    # Positive values have their sign bit set, negative ones (in two's complement) have it cleared
+    return value ^ sign if value >= sign else (value | sign) - (sign << 1)
+
+
+def flipped_double(raw: bytes) -> Optional[float]:
+    """Decode a big-endian double stored so that it sorts bytewise: positives flipped, negatives inverted."""
+    value = int.from_bytes(raw, "big")
+    if not value:
+        return None
+    value = value ^ (1 << 63) if value >> 63 else ~value & 0xFFFFFFFFFFFFFFFF
+    return unpack_from(">d", value.to_bytes(8, "big"))[0]
+
+
+def decode_bcd(raw: bytes, scale: int) -> Optional[PyDecimal]:
+    """Decode a 17-byte BCD value: a sign / scale byte, then 32 digits (inverted if negative)."""
+    if not any(raw):
+        return None
+    negative = not raw[0] & 0x80
+    digits = "".join(f"{byte:02x}" for byte in raw[1:])
+    if negative:
+        digits = "".join(f"{0xF - int(digit, 16):x}" for digit in digits)
+    digits = f"{digits[: 32 - scale]}.{digits[32 - scale :]}" if scale else digits
+    return PyDecimal(f"{'-' if negative else ''}{digits}")
+
+
+def companion(path: str, suffix: str) -> Optional[str]:
+    """Find one of a table's other files (e.g. its `.MB` or `.PX`) next to its `.DB` file, ignoring case."""
+    directory, name = os.path.split(os.path.splitext(path)[0])
+    target = f"{name}{suffix}".casefold()
+    try:
+        with os.scandir(directory or ".") as entries:
+            for entry in entries:
+                if entry.name.casefold() == target and entry.is_file():
+                    return entry.path
+    except OSError:
+        pass
+    return None
+
+
+def sort_key(values: Iterable[Any], fold: bool = False) -> Tuple[Tuple[bool, Any], ...]:
+    """Make a key's values comparable the way Paradox orders them: blanks (None) first.
+
+    With `fold`, text is compared case-insensitively, as in the indexes built
+    with /CASE_INSENSITIVE.
+    """
+    if fold:
+        return tuple((value is not None, value.casefold() if isinstance(value, str) else value) for value in values)
+    return tuple((value is not None, value) for value in values)
+
+
+class IndexOrderError(ValueError):
+    """An index's keys aren't in the order Python compares them in, e.g. because of a non-ASCII sort order."""
+
+
+class BlobFile:
+    """A table's memory-mapped .MB file, holding the values of its Memo / BLOB fields.
+
+    Blobs are stored either in a block of their own (type 2 blocks, with a
+    9-byte header) or packed alongside others in a suballocated block (type 3
+    blocks, with a 12-byte header and a table of 5-byte entries, one per blob).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        stat = os.stat(path)
+        self.stamp = stat.st_size, stat.st_mtime_ns
+        with open(path, "rb") as reader:
+            self.data = mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def locate(self, pointer: int, size: int) -> Tuple[int, int]:
+        """Get the position and length of a blob's data from the pointer in its record."""
+        block, index = pointer & 0xFFFFFF00, pointer & 0xFF
+        block_type = self.data[block]
+        if index == 0xFF or block_type == 2:
+            return block + 9, size
+        if block_type != 3:
+            raise ValueError(f"Unexpected .MB block type {block_type} at {block}")
+        entry = block + 12 + 5 * index
+        return block + 16 * self.data[entry], size
+
+    def read(self, pointer: int, size: int) -> bytes:
+        """Read a blob's data, given the pointer and size recorded for it."""
+        position, length = self.locate(pointer, size)
+        return self.data[position : position + length]
+
+    def view(self, pointer: int, size: int) -> memoryview:
+        """Get a blob's data as a view of the mapped file, without copying it."""
+        position, length = self.locate(pointer, size)
+        return memoryview(self.data)[position : position + length]
+
+    def close(self) -> None:
+        """Unmap the file (once any views of it have been released)."""
+        try:
+            self.data.close()
+        except BufferError:
+            # Blobs are still being viewed; the mapping goes when they do
+            pass
+
+
+# The .MB files mapped for Blobs that have been passed between processes, by path and stamp
+_blob_files: Dict[Tuple[str, Tuple[int, int]], BlobFile] = dict()
+
+
+class Blob:
+    """A handle on a single Memo / BLOB value, which isn't read until it's used.
+
+    Decoding a record only reads the value's pointer into the .MB file (or,
+    for values short enough to be kept in the record itself, copies them).
+    `view` then gets the value as a memoryview of the mapped .MB file, without
+    copying it, `bytes()` / `str()` copy or decode it, and `open` reads it as
+    a file-like object.
+
+    Blobs can be pickled (e.g. by a parallel scan's worker processes): the
+    unpickled handle maps the .MB file itself when it's used, as long as the
+    file hasn't changed since the handle was made.
+    """
+
+    __slots__ = ("file", "path", "stamp", "pointer", "size", "inline", "text", "encoding")
+
+    def __init__(
+        self,
+        file: Optional[BlobFile],
+        pointer: int,
+        size: int,
+        inline: Optional[bytes] = None,
+        text: bool = False,
+        encoding: str = "cp1252",
+    ):
+        self.file = file
+        self.path = file.path if file is not None else None
+        self.stamp = file.stamp if file is not None else None
+        self.pointer = pointer
+        self.size = size
+        self.inline = inline
+        self.text = text
+        self.encoding = encoding
+
+    def __getstate__(self) -> Tuple[Any, ...]:
+        return self.path, self.stamp, self.pointer, self.size, self.inline, self.text, self.encoding
+
+    def __setstate__(self, state: Tuple[Any, ...]) -> None:
+        self.file = None
+        self.path, self.stamp, self.pointer, self.size, self.inline, self.text, self.encoding = state
+
+    def _file(self) -> BlobFile:
+        """Get the .MB file the value is in, mapping it if the handle was unpickled."""
+        if self.file is None:
+            key = (self.path, self.stamp)
+            file = _blob_files.get(key, None)
+            if file is None:
+                file = BlobFile(self.path)
+                if file.stamp != self.stamp:
+                    file.close()
+                    raise ValueError(f"{self.path} has changed since its blob was read")
+                _blob_files[key] = file
+            self.file = file
+        return self.file
+
+    def view(self) -> memoryview:
+        """Get the value's bytes, as a view of the mapped file where possible."""
+        if self.inline is not None:
+            return memoryview(self.inline)
+        return self._file().view(self.pointer, self.size)
+
+    def load(self) -> Any:
+        """Read the value in full: as text for a Memo, else as bytes."""
+        return str(self) if self.text else bytes(self)
+
+    def open(self) -> Any:
+        """Read the value as a (binary) file-like object."""
+        return io.BufferedReader(BlobReader(self.view))
+
+    def __bytes__(self) -> bytes:
+        return bytes(self.view())
+
+    def __str__(self) -> str:
+        return codecs.decode(self.view(), self.encoding)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} of {self.size} bytes>"
+
+
+def load(value: Any) -> Any:
+    """Read a value in full if it's a Blob handle, else leave it as it is."""
+    return value.load() if isinstance(value, Blob) else value
+
+
+class TableFile:
+    """A memory-mapped Paradox .DB file.
+
+    The records are stored in a linked list of fixed-size data blocks, each of
+    which starts with a 6-byte header and holds as many whole, fixed-width
+    records as fit. Each field is decoded according to its type, with values
+    that are all zero bytes (Paradox's "blank") decoded as None.
+    """
+
+    def __init__(self, path: str, file_types: Tuple[int, ...] = (INDEXED_DB, NON_INDEXED_DB)):
+        self.path = path
+        self.stat = os.stat(path)
+        with open(path, "rb") as reader:
+            self.data = mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ)
+        self.header = parse_header(self.data)
+        if self.header.file_type not in file_types:
+            raise ValueError(f"{path} isn't a Paradox table")
+        self.encoding = self.header.encoding
+        self._blobs: Optional[BlobFile] = None
+        self._primary_index: Any = None
+        self._secondary_indexes: Optional[List[SecondaryIndex]] = None
+        self._decoders: Optional[List[Callable[[Any, int], Any]]] = None
+
+    @property
+    def fields(self) -> Tuple[Field, ...]:
+        """The table's fields."""
+        return self.header.fields
+
+    @property
+    def blobs(self) -> BlobFile:
+        """The table's .MB file, opened the first time it's needed."""
+        if self._blobs is None:
+            path = companion(self.path, ".mb")
+            if path is None:
+                raise FileNotFoundError(f"{os.path.splitext(self.path)[0]}.MB")
+            self._blobs = BlobFile(path)
+        return self._blobs
+
+    @property
+    def primary_index(self) -> Optional["IndexTree"]:
+        """The table's .PX file, opened the first time it's needed, or None if it has no (readable) one."""
+        if self._primary_index is None:
+            path = companion(self.path, ".px")
+            if self.header.file_type != INDEXED_DB or not self.header.pk_fields or path is None:
+                self._primary_index = False
+            else:
+                try:
+                    self._primary_index = IndexTree(path, self, self.header.pk_fields)
+                except (OSError, ValueError):
+                    self._primary_index = False
+        return self._primary_index or None
+
+    @property
+    def secondary_indexes(self) -> List["SecondaryIndex"]:
+        """The table's (readable) secondary indexes, opened the first time they're needed."""
+        if self._secondary_indexes is None:
+            self._secondary_indexes = list()
+            if self.primary_index is not None:
+                for suffix in secondary_suffixes(self.path):
+                    ypath = companion(self.path, f".y{suffix}")
+                    try:
+                        index = SecondaryIndex(companion(self.path, f".x{suffix}"), ypath, self)
+                    except (OSError, ValueError):
+                        continue
+                    self._secondary_indexes.append(index)
+        return self._secondary_indexes
+
+    def changed(self) -> bool:
+        """Check whether the file has been written to since it was mapped."""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return True
+        return (stat.st_size, stat.st_mtime_ns) != self.stamp
+
+    def block_offset(self, block: int) -> int:
+        """Get the position of a (1-based) data block in the file."""
+        return self.header.header_size + (block - 1) * self.header.block_size
+
+    def blocks(self) -> Iterator[int]:
+        """Yield the numbers of the table's data blocks, in record order."""
+        block, seen = self.header.first_block, 0
+        while block and seen < self.header.file_blocks:
+            yield block
+            block = BLOCK_HEADER.unpack_from(self.data, self.block_offset(block))[0]
+            seen += 1
+
+    def block_records(self, block: int) -> Tuple[int, int]:
+        """Get the position of a block's first record, and how many records it holds."""
+        offset = self.block_offset(block)
+        add_data_size = BLOCK_HEADER.unpack_from(self.data, offset)[2]
+        count = add_data_size // self.header.record_size + 1 if add_data_size >= 0 else 0
+        return offset + BLOCK_HEADER.size, count
+
+    def decoder(self, field: Field) -> Callable[[Any, int], Any]:
+        """Get a function decoding the supplied field's value from the record at a given position."""
+        start, width, encoding = field.offset, field.width, self.encoding
+
+        if field.type == ALPHA:
+
+            def decode(data: Any, position: int) -> Optional[str]:
+                raw = data[position + start : position + start + width].split(b"\x00", 1)[0]
+                return raw.decode(encoding) if raw else None
+
+        elif field.type in (SHORT, LONG, AUTOINCREMENT):
+
+            def decode(data: Any, position: int) -> Optional[int]:
+                return flipped_int(data[position + start : position + start + width])
+
+        elif field.type in (NUMBER, MONEY):
+
+            def decode(data: Any, position: int) -> Optional[float]:
+                return flipped_double(data[position + start : position + start + width])
+
+        elif field.type == LOGICAL:
+
+            def decode(data: Any, position: int) -> Optional[bool]:
+                raw = data[position + start]
+                return bool(raw & 0x7F) if raw else None
+
+        elif field.type == DATE:
+
+            def decode(data: Any, position: int) -> Optional[date]:
+                days = flipped_int(data[position + start : position + start + width])
+                return date.fromordinal(days) if days else None
+
+        elif field.type == TIME:
+
+            def decode(data: Any, position: int) -> Optional[time]:
+                milliseconds = flipped_int(data[position + start : position + start + width])
+                if milliseconds is None:
+                    return None
+                return (datetime.min + timedelta(milliseconds=milliseconds)).time()
+
+        elif field.type == TIMESTAMP:
+
+            def decode(data: Any, position: int) -> Optional[datetime]:
+                milliseconds = flipped_double(data[position + start : position + start + width])
+                return EPOCH + timedelta(milliseconds=milliseconds - MILLISECONDS_PER_DAY) if milliseconds else None
+
+        elif field.type == BCD:
+            scale = field.size
+
+            def decode(data: Any, position: int) -> Optional[PyDecimal]:
+                return decode_bcd(data[position + start : position + start + width], scale)
+
+        elif field.type in BLOB_TYPES:
+            leader = width - 10
+            text = field.type == MEMO
+
+            def decode(data: Any, position: int) -> Optional[Blob]:
+                pointer, size = unpack_from("<II", data, position + start + leader)
+                if not size:
+                    return None
+                if size <= leader and not pointer:
+                    return Blob(None, 0, size, data[position + start : position + start + size], text, encoding)
+                return Blob(self.blobs, pointer, size, None, text, encoding)
+
+        else:
+
+            def decode(data: Any, position: int) -> Optional[bytes]:
+                return data[position + start : position + start + width]
+
+        return decode
+
+    @property
+    def stamp(self) -> Tuple[int, int]:
+        """The size and mtime of the file when it was mapped."""
+        return self.stat.st_size, self.stat.st_mtime_ns
+
+    @property
+    def stats(self) -> TableStats:
+        """A summary of the table as it was when it was mapped (see `header_stats`)."""
+        return header_stats(self.header, self.stat)
+
+    @property
+    def decoders(self) -> List[Callable[[Any, int], Any]]:
+        """The decoders of each of the table's fields, in order."""
+        if self._decoders is None:
+            self._decoders = [self.decoder(field) for field in self.fields]
+        return self._decoders
+
+    def projected(self, fields: Optional[Sequence[int]] = None) -> List[Callable[[Any, int], Any]]:
+        """The decoders of the fields at the supplied positions (by default, of all of them), in that order."""
+        decoders = self.decoders
+        return decoders if fields is None else [decoders[number] for number in fields]
+
+    def find(
+        self, blocks: Iterable[int], key: Tuple[Any, ...], fields: Optional[Sequence[int]] = None
+    ) -> Optional[Tuple[Any, ...]]:
+        """Find the first record in the supplied blocks whose leading fields hold `key`, decoding only those.
+
+        Only the fields at the `fields` positions of the record found are
+        decoded, if they're supplied.
+        """
+        data, record_size = self.data, self.header.record_size
+        key_decoders, decoders = self.decoders[: len(key)], self.projected(fields)
+        for block in blocks:
+            position, count = self.block_records(block)
+            for _ in range(count):
+                if tuple(decode(data, position) for decode in key_decoders) == key:
+                    return tuple(decode(data, position) for decode in decoders)
+                position += record_size
+        return None
+
+    def records(
+        self, blocks: Optional[Iterable[int]] = None, fields: Optional[Sequence[int]] = None, reverse: bool = False
+    ) -> Iterator[Tuple[Any, ...]]:
+        """Yield every record in the table (or in the supplied blocks of it), decoded.
+
+        With `fields`, only the values of the fields at those positions are
+        decoded, and each record only holds those, in that order; the bytes of
+        any other field aren't even looked at. With `reverse`, each block's
+        records are yielded last first (the blocks are still read in the order
+        they're supplied).
+        """
+        decoders = self.projected(fields)
+        data, record_size = self.data, self.header.record_size
+        step = -record_size if reverse else record_size
+        for block in self.blocks() if blocks is None else blocks:
+            position, count = self.block_records(block)
+            if reverse:
+                position += (count - 1) * record_size
+            for _ in range(count):
+                yield tuple(decode(data, position) for decode in decoders)
+                position += step
+
+    def close(self) -> None:
+        """Unmap the file (and its .MB and .PX files, if they were opened)."""
+        if self._blobs is not None:
+            self._blobs.close()
+        if self._primary_index:
+            self._primary_index.close()
+        for index in self._secondary_indexes or ():
+            index.close()
+        self.data.close()
+
+
+class IndexTree:
+    """A memory-mapped B-tree over a table's records: a .PX file, or a secondary index's .Ynn file.
+
+    The tree is made of blocks laid out like a table's data blocks, whose
+    entries are a key (encoded like the table's leading `key_length` fields, by
+    default as many as fit)
+    followed by the number of the block it leads to and how many records are
+    under that block. Entries at the lowest level lead to the table's data
+    blocks, those of any higher levels to index blocks one level down. Each
+    entry's key is that of the first record under it.
+
+    If the keys are only in order when text is compared case-insensitively,
+    the tree is taken to be a /CASE_INSENSITIVE one and `fold` is set. That's
+    decided from the index blocks along the tree's first and last paths when
+    it's opened, and checked again for each of the others as lookups first
+    visit them. A tree whose keys turn out not to be in either order is marked
+    `disordered`, and no longer searched.
+
+    Text keys can also be in both orders, e.g. if they all start with a capital
+    letter. Until some show which order the tree is in (setting `fold`, or
+    `cased` for a case-sensitive tree), it's `ambiguous`, and lookups are made
+    in both.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        table: TableFile,
+        key_length: Optional[int] = None,
+        file_types: Tuple[int, ...] = (PRIMARY_INDEX,),
+    ):
+        self.path = path
+        self.stat = os.stat(path)
+        with open(path, "rb") as reader:
+            self.data = mmap.mmap(reader.fileno(), 0, access=mmap.ACCESS_READ)
+
+        record_size, header_size, file_type, max_table_size, num_records, *_ = HEADER.unpack_from(self.data, 0)
+        if file_type not in file_types:
+            raise ValueError(f"{path} isn't a Paradox index")
+
+        if key_length is None:
+            # Take as many leading fields as fit in an entry
+            widths = list(accumulate(field.width for field in table.fields))
+            key_width = record_size - INDEX_ENTRY_TAIL
+            key_length = widths.index(key_width) + 1 if key_width in widths else 0
+        self.key_fields = table.fields[:key_length]
+        if not key_length or sum(field.width for field in self.key_fields) + INDEX_ENTRY_TAIL != record_size:
+            raise ValueError(f"{path} doesn't index {table.path}'s leading field(s)")
+
+        self.record_size = record_size
+        self.header_size = header_size
+        self.block_size = max_table_size * 0x400
+        self.num_entries = num_records
+        self.root, self.levels = unpack_from("<HB", self.data, 0x1E)
+        # A .PX file's keys are whole primary keys, so no two of its entries start with the same one
+        self.unique = file_type == PRIMARY_INDEX
+        self.decoders = [table.decoder(field) for field in self.key_fields]
+        self._blocks: Dict[int, Tuple[List[Tuple[Tuple[Any, ...], int, int]], List[Tuple[Any, ...]]]] = dict()
+
+        self.fold = False
+        self.cased = not any(field.type == ALPHA for field in self.key_fields)
+        self.disordered = False
+        if self.root and self.levels and not self.cased:
+            try:
+                self._check()
+            except IndexOrderError:
+                # Now folded, and if they aren't in that order either, the tree can't be searched at all
+                self._check()
+
+    def _check(self) -> None:
+        """Check that the keys along the tree's first and last paths are in order, raising IndexOrderError if not."""
+        for end in (0, -1):
+            block = self.root
+            for _ in range(self.levels - 1):
+                entries, keys = self._block(block)
+                if not entries:
+                    break
+                block = self._child(keys, len(keys) - 1 if end else 0, entries[end][1])
+
+    @property
+    def ambiguous(self) -> bool:
+        """Whether the keys read so far are in order both with and without text compared case-insensitively."""
+        return not (self.fold or self.cased)
+
+    def _disorder(self) -> IndexOrderError:
+        """Record that the tree's keys are out of order, and get the error to raise for it.
+
+        The first time, the tree is taken to be in case-insensitive order from
+        then on: the lookup that found the keys out of order fails, but later
+        ones search the tree folded. Keys out of order even then, or in a tree
+        already known to be `cased`, mark the tree as `disordered`.
+        """
+        if self.fold or self.cased:
+            self.disordered = True
+        else:
+            self.fold = True
+            self._blocks.clear()
+        return IndexOrderError(f"{self.path}'s keys aren't in Python's order")
+
+    def _child(self, keys: List[Tuple[Any, ...]], index: int, child: int) -> int:
+        """Check that the keys of an index block's child block lie between its entry's key and the next one's."""
+        child_keys = self._block(child)[1]
+        if child_keys and (
+            child_keys[0] < keys[index] or (index + 1 < len(keys) and child_keys[-1] > keys[index + 1])
+        ):
+            raise self._disorder()
+        return child
+
+    def check_order(self, keys: Sequence[Tuple[Any, ...]]) -> List[Tuple[Any, ...]]:
+        """Check that a run of the tree's keys (or of the records under it) is in its order, getting their sort keys.
+
+        Raises IndexOrderError if they aren't (see `_disorder`). Keys only in
+        order case-sensitively settle an `ambiguous` tree's order.
+        """
+        ordered = [sort_key(key, self.fold) for key in keys]
+        if any(first > second for first, second in zip(ordered, ordered[1:])):
+            raise self._disorder()
+        if self.ambiguous:
+            folded = [sort_key(key, True) for key in keys]
+            if any(first > second for first, second in zip(folded, folded[1:])):
+                self.cased = True
+        return ordered
+
+    def entries(self, block: int) -> List[Tuple[Tuple[Any, ...], int, int]]:
+        """Decode an index block's entries: (key, block number, record count)."""
+        return self._block(block)[0]
+
+    def _block(self, block: int) -> Tuple[List[Tuple[Tuple[Any, ...], int, int]], List[Tuple[Any, ...]]]:
+        """Decode an index block's entries, and their sort keys, caching them for the next lookup."""
+        cached = self._blocks.get(block, None)
+        if cached is not None:
+            return cached
+        if len(self._blocks) >= INDEX_CACHE_BLOCKS:
+            self._blocks.clear()
+
+        offset = self.header_size + (block - 1) * self.block_size
+        add_data_size = BLOCK_HEADER.unpack_from(self.data, offset)[2]
+        count = add_data_size // self.record_size + 1 if add_data_size >= 0 else 0
+        data, tail = self.data, self.record_size - INDEX_ENTRY_TAIL
+
+        entries, position = list(), offset + BLOCK_HEADER.size
+        for _ in range(count):
+            key = tuple(decode(data, position) for decode in self.decoders)
+            child = flipped_int(data[position + tail : position + tail + 2])
+            records = flipped_int(data[position + tail + 2 : position + tail + 4])
+            entries.append((key, child or 0, records or 0))
+            position += self.record_size
+
+        keys = self.check_order([key for key, _, _ in entries])
+        self._blocks[block] = entries, keys
+        return entries, keys
+
+    def data_blocks(
+        self, low: Optional[Tuple[Any, ...]] = None, high: Optional[Tuple[Any, ...]] = None, reverse: bool = False
+    ) -> Iterator[int]:
+        """Yield (in key order) the numbers of the data blocks that can hold keys from `low` to `high`.
+
+        Each bound is compared against as many of the key's leading fields as it
+        has values, inclusively. Blocks can also hold keys outside the bounds, so
+        their records still need to be checked against them. With `reverse`,
+        they're yielded in reverse key order, so the blocks with the highest
+        keys are found without descending into any of the others.
+        """
+        if self.disordered:
+            raise IndexOrderError(f"{self.path}'s keys aren't in Python's order")
+        if self.root and self.levels:
+            yield from self._descend(self.root, self.levels, low, high, reverse)
+
+    def _descend(
+        self,
+        block: int,
+        level: int,
+        low: Optional[Tuple[Any, ...]],
+        high: Optional[Tuple[Any, ...]],
+        reverse: bool = False,
+    ) -> Iterator[int]:
+        """Find the blocks under one index block that can hold keys from `low` to `high`."""
+        entries, keys = self._block(block)
+
+        start, end = self._span(keys, low, high, self.fold)
+        if self.ambiguous:
+            # Any of the entries that could hold the keys in either order
+            folded = [sort_key(key, True) for key, _, _ in entries]
+            folded_start, folded_end = self._span(folded, low, high, True)
+            start, end = min(start, folded_start), max(end, folded_end)
+
+        for index in reversed(range(start, end)) if reverse else range(start, end):
+            child = entries[index][1]
+            if level > 1:
+                yield from self._descend(self._child(keys, index, child), level - 1, low, high, reverse)
+            else:
+                yield child
+
+    def _span(
+        self, keys: List[Tuple[Any, ...]], low: Optional[Tuple[Any, ...]], high: Optional[Tuple[Any, ...]], fold: bool
+    ) -> Tuple[int, int]:
+        """Find the range of an index block's entries (by their sort keys) that can hold keys from `low` to `high`."""
+        start = 0
+        if low is not None:
+            # The entry starting at (or last before) the lower bound is the first that can hold it, but
+            # a bound on only the key's leading fields (or on a key that isn't unique, as in a secondary
+            # index or a folded one) can match records right up to the end of the entry before the first
+            # one starting with it
+            whole = self.unique and not fold and len(low) == len(self.key_fields)
+            bisect = bisect_right if whole else bisect_left
+            start = max(0, bisect([key[: len(low)] for key in keys], sort_key(low, fold)) - 1)
+
+        end = len(keys)
+        if high is not None:
+            # The last entry that can hold the upper bound is the last one starting at or before it
+            end = bisect_right([key[: len(high)] for key in keys], sort_key(high, fold))
+
+        return start, end
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self.data.close()
+
+
+def secondary_suffixes(path: str) -> List[str]:
+    """List the suffixes (after the X / Y) of a table's secondary index files that come in .Xnn / .Ynn pairs."""
+    directory, name = os.path.split(os.path.splitext(path)[0])
+    found: Dict[str, Set[str]] = dict()
+    try:
+        with os.scandir(directory or ".") as entries:
+            for entry in entries:
+                stem, ext = os.path.splitext(entry.name.casefold())
+                if stem == name.casefold() and len(ext) == 4 and ext[1] in "xy":
+                    found.setdefault(ext[2:], set()).add(ext[1])
+    except OSError:
+        pass
+    return sorted(suffix for suffix, kinds in found.items() if kinds == {"x", "y"})
+
+
+class SecondaryIndex:
+    """One of a table's secondary indexes.
+
+    Its .Xnn file is laid out like a table, whose records hold the values of
+    the indexed fields, then the indexed record's primary key and (usually) a
+    "hint": the data block the record was in. The records are kept in order
+    of the indexed fields, and its .Ynn file is an IndexTree over them.
+    """
+
+    def __init__(self, xpath: str, ypath: str, table: TableFile):
+        self.table = table
+        self.entries = TableFile(xpath, NON_INCREMENTAL_SECONDARY + INCREMENTAL_SECONDARY)
+        try:
+            fields = self.entries.fields
+            pk_fields = table.header.pk_fields
+            hint = fields[-1].name.casefold() == HINT_FIELD and len(fields) > pk_fields + 1
+            self.key_length = len(fields) - pk_fields - hint
+            if self.key_length < 1:
+                raise ValueError(f"{xpath} doesn't index any fields")
+
+            names = {field.name.casefold(): field.name for field in table.fields}
+            self.fields = [names[field.name.casefold()] for field in fields[: self.key_length]]
+            header = self.entries.header
+            # A composite index is named in its header, a single-field one after its field
+            self.name = header.table_name if header.file_type in (6, 8) and header.table_name else self.fields[0]
+            self.hint = len(fields) - 1 if hint else None
+            self.tree = IndexTree(ypath, self.entries, file_types=SECONDARY_TREE)
+        except (KeyError, ValueError):
+            self.entries.close()
+            raise ValueError(f"{xpath} isn't a secondary index of {table.path}")
+
+    @property
+    def stale(self) -> bool:
+        """Check whether the index no longer describes its table's records, e.g. because it isn't maintained."""
+        if self.tree.disordered or self.entries.changed():
+            return True
+        if self.entries.header.num_records != self.table.header.num_records:
+            return True
+        if self.entries.header.file_type in NON_INCREMENTAL_SECONDARY:
+            return self.entries.stat.st_mtime_ns < self.table.stat.st_mtime_ns
+        return False
+
+    def locate(
+        self, low: Optional[Tuple[Any, ...]] = None, high: Optional[Tuple[Any, ...]] = None
+    ) -> Iterator[Tuple[Tuple[Any, ...], Optional[int]]]:
+        """Yield the primary key (and hint) of every record with indexed values from `low` to `high`, in order.
+
+        While the tree's order is `ambiguous`, that's every record that could
+        be in range in either order, so some may not be.
+        """
+        tree, pk_fields = self.tree, self.table.header.pk_fields
+        start, end = self.key_length, self.key_length + pk_fields
+
+        blocks = tree.data_blocks(low, high) if low is not None or high is not None else None
+        previous = None
+        for entry in self.entries.records(blocks):
+            values = entry[: self.key_length]
+            if previous is not None:
+                # The records are in the tree's order too, so they can show which order that is
+                tree.check_order((previous, values))
+            previous = values
+            orders = (False, True) if tree.ambiguous else (tree.fold,)
+            if low is not None and all(sort_key(values[: len(low)], fold) < sort_key(low, fold) for fold in orders):
+                continue
+            if high is not None and all(
+                sort_key(values[: len(high)], fold) > sort_key(high, fold) for fold in orders
+            ):
+                return
+            yield entry[start:end], entry[self.hint] if self.hint is not None else None
+
+    def records(
+        self,
+        low: Optional[Tuple[Any, ...]] = None,
+        high: Optional[Tuple[Any, ...]] = None,
+        fields: Optional[Sequence[int]] = None,
+    ) -> Iterator[Tuple[Any, ...]]:
+        """Yield the table's records with indexed values from `low` to `high`, in the index's order."""
+        return self.fetch(self.locate(low, high), fields)
+
+    def fetch(
+        self, locations: Iterable[Tuple[Tuple[Any, ...], Optional[int]]], fields: Optional[Sequence[int]] = None
+    ) -> Iterator[Tuple[Any, ...]]:
+        """Yield the table's records at the supplied locations (see `locate`), skipping any that are gone.
+
+        With `fields`, the records only hold the values of the fields at
+        those positions (see `TableFile.records`).
+        """
+        table = self.table
+        for key, hint in locations:
+            record = table.find((hint,), key, fields) if hint and hint <= table.header.file_blocks else None
+            if record is None:
+                # The record has moved since it was indexed
+                try:
+                    record = table.find(table.primary_index.data_blocks(key, key), key, fields)
+                except IndexOrderError:
+                    # ...and the primary index can't be searched for it either
+                    record = table.find(table.blocks(), key, fields)
+            if record is not None:
+                yield record
+
+    def close(self) -> None:
+        """Unmap the index's files."""
+        self.tree.close()
+        self.entries.close()
+
+
+# The tables mapped by a parallel scan's worker process, kept mapped between the chunks it's handed
+_worker_tables: Dict[str, TableFile] = dict()
+
+
+def scan_blocks(
+    path: str,
+    stamp: Tuple[int, int],
+    blocks: List[int],
+    vectorized: bool = False,
+    where: Optional[Tuple[Any, ...]] = None,
+    fields: Optional[Sequence[int]] = None,
+) -> List[Tuple[Any, ...]]:
+    """Decode the records in some of a table's blocks, in a worker process of a `parallel_records` scan.
+
+    The worker maps the table itself, and maps it again whenever the scanning
+    process has a different version of the file (by size and mtime) mapped.
+    With `vectorized`, the blocks are decoded a column at a time (see the
+    `vectorized` module), skipping records that don't match `where`. With
+    `fields`, only the fields at those positions are decoded.
+    """
+    table = _worker_tables.get(path, None)
+    if table is None or table.stamp != stamp:
+        if table is not None:
+            table.close()
+        table = _worker_tables[path] = TableFile(path)
+    if vectorized:
+        from . import vectorized as columns
+
+        return list(columns.records(table, blocks, where=where, fields=fields))
+    return list(table.records(blocks, fields))
+
+
+def parallel_records(
+    table: TableFile,
+    executor: Executor,
+    workers: int,
+    ordered: bool = True,
+    vectorized: bool = False,
+    where: Optional[Tuple[Any, ...]] = None,
+    fields: Optional[Sequence[int]] = None,
+) -> Iterator[Tuple[Any, ...]]:
+    """Yield every record in a table, decoding disjoint runs of its blocks in an executor's worker processes.
+
+    The blocks are split into about four chunks per worker, and no more than
+    two chunks per worker are in flight at a time, so a scan that's abandoned
+    (or consumed slowly) doesn't decode the whole table ahead of its consumer.
+    With `ordered`, records are yielded in the same order `TableFile.records`
+    yields them; otherwise each chunk's records are yielded as soon as it's
+    decoded. `vectorized`, `where` and `fields` are passed on to `scan_blocks`.
+    """
+    blocks = list(table.blocks())
+    size = max(1, -(-len(blocks) // (workers * 4)))
+    chunks = iter([blocks[start : start + size] for start in range(0, len(blocks), size)])
+    pending: deque = deque()
+
+    def submit() -> None:
+        chunk = next(chunks, None)
+        if chunk is not None:
+            pending.append(executor.submit(scan_blocks, table.path, table.stamp, chunk, vectorized, where, fields))
+
+    try:
+        for _ in range(workers * 2):
+            submit()
+
+        while pending:
+            if ordered:
+                ready: List[Future] = [pending.popleft()]
+            else:
+                done: Set[Future] = wait(pending, return_when=FIRST_COMPLETED)[0]
+                ready = [future for future in pending if future in done]
+                for future in ready:
+                    pending.remove(future)
+
+            for future in ready:
+                submit()
+                yield from future.result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+def find_table(directory: str, name: str) -> Optional[str]:
+    """Find the path of a table's .DB file in a directory, ignoring case."""
+    target = f"{name}.db".casefold()
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.casefold() == target and entry.is_file():
+                    return entry.path
+    except OSError:
+        pass
+    return None
+
+
+def list_tables(directory: str) -> List[str]:
+    """List the names of the tables in a directory."""
+    try:
+        with os.scandir(directory) as entries:
+            return sorted(
+                os.path.splitext(entry.name)[0]
+                for entry in entries
+                if entry.name.casefold().endswith(".db") and entry.is_file()
+            )
+    except OSError:
+        return list()
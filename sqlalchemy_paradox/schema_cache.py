@@ -0,0 +1,208 @@
+"""Persistent reflection cache for Paradox table directories."""
+# coding=utf-8
+
+from pathlib import Path
+from hashlib import sha1
+from threading import RLock
+from tempfile import NamedTemporaryFile
+import os
+import atexit
+import pickle
+from typing import Any, Set, Dict, List, Tuple, Optional
+
+from sqlalchemy import util
+
+# Bumped whenever the layout of the cache file (or of what gets reflected) changes
+CACHE_FORMAT = 3
+
+# The files whose size and modification time decide whether a table's
+# reflected schema is still current: the table itself and its primary index,
+# along with any of its secondary indexes (.Xnn / .Ynn)
+STAMPED_SUFFIXES = (".db", ".px")
+
+
+@util.decorator
+def cache(fn, self, con, *args, **kw):
+    """Cache a dialect's reflection results in an Inspector's `info_cache`, like `reflection.cache`.
+
+    Unlike `reflection.cache`, each result is stored along with the dialect's
+    `schema_generation` for the table it describes (the first positional string
+    argument, if there is one), so a result stops being served from the cache
+    as soon as a SchemaWatcher has reported a change to the table's structure.
+    """
+    info_cache = kw.get("info_cache", None)
+    if info_cache is None:
+        return fn(self, con, *args, **kw)
+
+    table_name = args[0] if args and isinstance(args[0], str) else None
+    generation = self.schema_generation(table_name)
+    key = (
+        fn.__name__,
+        tuple(arg for arg in args if isinstance(arg, str)),
+        tuple((name, value) for name, value in kw.items() if name != "info_cache"),
+    )
+
+    cached = info_cache.get(key, None)
+    if cached is not None and cached[0] == generation:
+        return cached[1]
+
+    ret_val = fn(self, con, *args, **kw)
+    info_cache[key] = (generation, ret_val)
+    return ret_val
+
+
+class ReflectionCache:
+    """The reflected schema of the tables in one Paradox directory, persisted between processes.
+
+    Each table's reflection results are stored alongside the size and mtime of
+    its `.DB`, `.PX` and `.Xnn` / `.Ynn` files. A cached result is only served
+    while a (cheap) `os.stat` of those files still matches, so a restructured
+    (or re-indexed) table is simply reflected again. The cache is loaded on
+    first use and written back, as a whole, by `flush` (which also runs at
+    interpreter exit).
+
+    While the directory is `watched` by a SchemaWatcher (which `invalidate`s
+    tables as their structure changes), each table's files are only stat'ed the
+    first time it's looked up.
+    """
+
+    def __init__(self, directory: str, cache_dir: Optional[str] = None):
+        self.directory = os.path.abspath(directory)
+        cache_dir = Path(cache_dir) if cache_dir else Path.home() / ".cache" / "sqlalchemy-paradox"
+        digest = sha1(os.path.normcase(self.directory).encode("utf8")).hexdigest()[:16]
+        self.path = cache_dir / f"reflection-{digest}.pickle"
+        self.tables: Optional[Dict[str, Dict[str, Any]]] = None
+        self.files: Dict[str, List[str]] = dict()
+        self.scanned: Optional[int] = None
+        self.dirty = False
+        self.watched = False
+        self.validated: Set[str] = set()
+        self.lock = RLock()
+        atexit.register(self.flush)
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Read the cache file, discarding it if it's unreadable or for another directory / format."""
+        if self.tables is None:
+            try:
+                with self.path.open("rb") as reader:
+                    stored = pickle.load(reader)
+                if stored.get("format") != CACHE_FORMAT or stored.get("directory") != self.directory:
+                    raise ValueError(self.path)
+                self.tables = stored["tables"]
+            except (OSError, ValueError, KeyError, AttributeError, EOFError, pickle.UnpicklingError):
+                self.tables = dict()
+        return self.tables
+
+    def _scan(self) -> None:
+        """Map the (case-folded) names of the directory's tables to the paths of their stamped files.
+
+        The listing is kept until the directory's own mtime changes, which it
+        does whenever a file is created, renamed or deleted in it.
+        """
+        files: Dict[str, List[str]] = dict()
+        try:
+            scanned = os.stat(self.directory).st_mtime_ns
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    table_name, suffix = os.path.splitext(entry.name.casefold())
+                    if (suffix in STAMPED_SUFFIXES or (len(suffix) == 4 and suffix[1] in "xy")) and entry.is_file():
+                        files.setdefault(table_name, list()).append(entry.path)
+        except OSError:
+            scanned = None
+
+        # The table's own .DB file first, then its indexes in a stable order
+        self.files = {
+            table_name: sorted(paths, key=lambda path: (not path.casefold().endswith(".db"), path.casefold()))
+            for table_name, paths in files.items()
+        }
+        self.scanned = scanned
+
+    def stamp(self, table_name: str) -> Optional[Tuple[Tuple[str, int, int], ...]]:
+        """Get the size and mtime of a table's files, or None if the table has no `.DB` file."""
+        try:
+            current = os.stat(self.directory).st_mtime_ns
+        except OSError:
+            current = None
+        if current is None or current != self.scanned:
+            self._scan()
+
+        stamp = list()
+        for path in self.files.get(table_name.casefold(), ()):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # Renamed or deleted since the directory was last scanned
+                self.scanned = None
+                return None
+            stamp.append((os.path.basename(path).casefold(), stat.st_size, stat.st_mtime_ns))
+
+        if not stamp or stamp[0][0] != f"{table_name}.db".casefold():
+            return None
+        return tuple(stamp)
+
+    def get(self, table_name: str, method: str) -> Optional[Any]:
+        """Get a cached reflection result, if the table's files haven't changed since it was stored."""
+        with self.lock:
+            key = table_name.casefold()
+            entry = self._load().get(key, None)
+            if entry is None or method not in entry:
+                return None
+            if not (self.watched and key in self.validated):
+                if entry["stamp"] != self.stamp(table_name):
+                    return None
+                self.validated.add(key)
+            return entry[method]
+
+    def put(self, table_name: str, method: str, value: Any) -> None:
+        """Store a reflection result, stamped with the current state of the table's files."""
+        with self.lock:
+            stamp = self.stamp(table_name)
+            if stamp is None:
+                return
+
+            tables = self._load()
+            entry = tables.get(table_name.casefold(), None)
+            if entry is None or entry["stamp"] != stamp:
+                entry = tables[table_name.casefold()] = {"stamp": stamp}
+
+            entry[method] = value
+            self.validated.add(table_name.casefold())
+            self.dirty = True
+
+    def invalidate(self, table_name: str) -> None:
+        """Forget everything cached for a table, e.g. because its structure has changed."""
+        with self.lock:
+            key = table_name.casefold()
+            self.validated.discard(key)
+            if self._load().pop(key, None) is not None:
+                self.dirty = True
+
+    def flush(self) -> None:
+        """Write the cache back to disk, if anything has been added to it."""
+        with self.lock:
+            if not self.dirty or self.tables is None:
+                return
+
+            temporary = None
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with NamedTemporaryFile("wb", dir=str(self.path.parent), delete=False) as writer:
+                    temporary = writer.name
+                    pickle.dump(
+                        {"format": CACHE_FORMAT, "directory": self.directory, "tables": self.tables},
+                        writer,
+                        protocol=pickle.HIGHEST_PROTOCOL,
+                    )
+                os.replace(temporary, str(self.path))
+                temporary = None
+                self.dirty = False
+            except (OSError, TypeError, AttributeError, pickle.PicklingError):
+                # The cache is purely an optimization, failing to persist it (or
+                # to pickle whatever's been stored in it) shouldn't fail anything else
+                pass
+            finally:
+                if temporary is not None:
+                    try:
+                        os.remove(temporary)
+                    except OSError:
+                        pass
@@ -0,0 +1,322 @@
+"""Decode Paradox data blocks a column at a time with NumPy, rather than a field at a time in Python.
+
+A table's records are fixed-width, so a run of its data blocks can be viewed
+as a NumPy structured array with one (raw, big-endian) member per field.
+Each column is then decoded in bulk: the sign bit Paradox flips to make its
+numbers sort as bytes is flipped back, dates and timestamps are converted to
+`datetime64`, and blank values are masked. Fields NumPy has no use for
+(BCD numbers, raw bytes and Memo / BLOB pointers) are decoded the usual way,
+into object arrays.
+
+NumPy is optional: `numpy` is None if it isn't installed.
+"""
+# coding=utf-8
+
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import repeat
+from typing import Any, Dict, List, Tuple, Callable, Iterable, Iterator, Optional, Sequence
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+from . import pxfile
+
+# How many data blocks are decoded together, bounding the memory a scan takes
+BATCH_BLOCKS = 256
+
+# The days from 1/1/0001 (day 1 for Paradox) to NumPy's epoch, 1/1/1970
+EPOCH_DAYS = date(1970, 1, 1).toordinal()
+
+# The value (in milliseconds) of a Paradox timestamp at NumPy's epoch
+EPOCH_MILLISECONDS = ((datetime(1970, 1, 1) - pxfile.EPOCH).days + 1) * pxfile.MILLISECONDS_PER_DAY
+
+# The raw (big-endian, unsigned) NumPy type each kind of numeric field is read as
+RAW_TYPES = {
+    pxfile.SHORT: ">u2",
+    pxfile.LONG: ">u4",
+    pxfile.AUTOINCREMENT: ">u4",
+    pxfile.DATE: ">u4",
+    pxfile.TIME: ">u4",
+    pxfile.NUMBER: ">u8",
+    pxfile.MONEY: ">u8",
+    pxfile.TIMESTAMP: ">u8",
+    pxfile.LOGICAL: "u1",
+}
+
+# The signed type an integer field's value is, once its sign bit is flipped back
+SIGNED_TYPES = {2: "int16", 4: "int32"}
+
+# The (masked array) comparison each of a predicate's comparison operators is
+COMPARISONS = {
+    "eq": "equal",
+    "ne": "not_equal",
+    "lt": "less",
+    "le": "less_equal",
+    "gt": "greater",
+    "ge": "greater_equal",
+}
+
+# What `code_points` maps bytes that aren't characters in an encoding to
+UNDEFINED = 0xFFFFFFFF
+
+
+@lru_cache(maxsize=None)
+def code_points(encoding: str) -> Optional[Any]:
+    """Map each byte to the (Unicode) character it encodes, for single-byte encodings (else None)."""
+    points = numpy.full(256, UNDEFINED, dtype=numpy.uint32)
+    for byte in range(256):
+        try:
+            character = bytes([byte]).decode(encoding)
+        except UnicodeDecodeError:
+            continue
+        if len(character) != 1:
+            return None
+        points[byte] = ord(character)
+    return points
+
+
+def record_dtype(fields: Iterable[pxfile.Field], record_size: int) -> Any:
+    """Build the structured dtype of a table's records, with one raw member per field (named f0, f1...)."""
+    names, formats, offsets = list(), list(), list()
+    for number, field in enumerate(fields):
+        names.append(f"f{number}")
+        if field.type in RAW_TYPES and numpy.dtype(RAW_TYPES[field.type]).itemsize == field.width:
+            formats.append(RAW_TYPES[field.type])
+        elif field.type == pxfile.ALPHA:
+            formats.append(f"S{field.width}")
+        else:
+            formats.append(f"V{field.width}")
+        offsets.append(field.offset)
+    return numpy.dtype({"names": names, "formats": formats, "offsets": offsets, "itemsize": record_size})
+
+
+def block_rows(table: pxfile.TableFile, blocks: List[int]) -> Any:
+    """Copy the records in the supplied data blocks out of the table's file, as an (n, record_size) byte array."""
+    header = table.header
+    record_size, block_size = header.record_size, header.block_size
+    capacity = (block_size - pxfile.BLOCK_HEADER.size) // record_size
+    available = max(0, (len(table.data) - header.header_size) // block_size)
+    numbers = numpy.asarray(blocks, dtype=numpy.int64) - 1
+    if numbers.size and (numbers.min() < 0 or numbers.max() >= available):
+        raise ValueError(f"{table.path} doesn't have all of blocks {blocks[0]}...{blocks[-1]}")
+
+    # Only the copies are kept, so the file can still be unmapped while a scan is suspended
+    data = numpy.frombuffer(table.data, dtype=numpy.uint8, count=available * block_size, offset=header.header_size)
+    data = data.reshape(available, block_size)[numbers]
+
+    added = data[:, 4:6].copy().view("<i2").reshape(-1).astype(numpy.int64)
+    counts = numpy.where(added >= 0, added // record_size + 1, 0)
+    records = data[:, pxfile.BLOCK_HEADER.size : pxfile.BLOCK_HEADER.size + capacity * record_size]
+    records = records.reshape(len(blocks), capacity, record_size)
+    return records[numpy.arange(capacity) < numpy.minimum(counts, capacity)[:, None]]
+
+
+def decode_column(table: pxfile.TableFile, field: pxfile.Field, raw: Any, rows: Any) -> Any:
+    """Decode one field's values from its raw member of the records' structured array, as a masked array.
+
+    Blank values are masked. `rows` is the records' bytes, for the fields
+    decoded the usual way.
+    """
+    kind = field.type
+    if kind in RAW_TYPES and raw.dtype.kind == "u":
+        values = raw.astype(raw.dtype.newbyteorder("="))
+        blank = values == 0
+        if kind in (pxfile.NUMBER, pxfile.MONEY, pxfile.TIMESTAMP):
+            sign = numpy.uint64(1 << 63)
+            values = numpy.where(values & sign, values ^ sign, ~values).view(numpy.float64)
+            if kind == pxfile.TIMESTAMP:
+                blank |= values == 0
+                microseconds = numpy.rint((values - EPOCH_MILLISECONDS) * 1000)
+                values = numpy.where(blank, 0, microseconds).astype(numpy.int64).astype("datetime64[us]")
+        elif kind == pxfile.LOGICAL:
+            values = (values & 0x7F) != 0
+        else:
+            values = (values ^ values.dtype.type(1 << (8 * field.width - 1))).view(SIGNED_TYPES[field.width])
+            if kind == pxfile.DATE:
+                blank |= values == 0
+                values = (values.astype(numpy.int64) - EPOCH_DAYS).astype("datetime64[D]")
+            elif kind == pxfile.TIME:
+                values = values.astype(numpy.int64).astype("timedelta64[ms]")
+        return numpy.ma.MaskedArray(values, mask=blank)
+
+    if kind == pxfile.ALPHA:
+        blank = raw == b""
+        points = code_points(table.encoding)
+        if points is not None:
+            # Look each byte's character up, giving the UCS-4 NumPy keeps strings in
+            characters = points[rows[:, field.offset : field.offset + field.width]]
+            if not (characters == UNDEFINED).any():
+                return numpy.ma.MaskedArray(characters.view(f"U{field.width}").reshape(-1), mask=blank)
+        return numpy.ma.MaskedArray(numpy.char.decode(raw, table.encoding), mask=blank)
+
+    decode, size = table.decoder(field), table.header.record_size
+    data = rows.tobytes()
+    values = numpy.empty(len(rows), dtype=object)
+    values[:] = [decode(data, position) for position in range(0, len(data), size)]
+    return numpy.ma.MaskedArray(values, mask=numpy.equal(values, None))
+
+
+def block_mask(predicate: Tuple[Any, ...], table: pxfile.TableFile, rows: Any, column: Callable[[str], Any]) -> Any:
+    """Work out which of a batch of records (`rows`, with `column` decoding a field's values) match a predicate.
+
+    Predicates are (picklable) tuples, naming fields by their (case-folded)
+    names:
+
+        ("and", predicate, ...) / ("or", predicate, ...) / ("not", predicate)
+        ("compare", name, "eq" | "ne" | "lt" | "le" | "gt" | "ge", value)
+        ("in", name, (value, ...))
+        ("prefix", name, encoded_prefix)  # compared with the field's raw bytes
+        ("null", name)
+
+    Comparisons with blank values don't match, so a predicate only matches
+    records SQL's three-valued logic would find true (and, under a NOT, only
+    those it would find false don't).
+    """
+    kind = predicate[0]
+    if kind in ("and", "or"):
+        masks = [block_mask(each, table, rows, column) for each in predicate[1:]]
+        combine = numpy.logical_and if kind == "and" else numpy.logical_or
+        return combine.reduce(masks) if masks else numpy.full(len(rows), kind == "and")
+    if kind == "not":
+        return ~block_mask(predicate[1], table, rows, column)
+
+    name = predicate[1]
+    if kind == "prefix":
+        field, prefix = table_field(table, name), numpy.frombuffer(predicate[2], dtype=numpy.uint8)
+        if len(prefix) > field.width:
+            return numpy.zeros(len(rows), dtype=bool)
+        return (rows[:, field.offset : field.offset + len(prefix)] == prefix).all(axis=1)
+
+    values = column(name)
+    if kind == "null":
+        return numpy.ma.getmaskarray(values)
+    if kind == "in":
+        candidates = [numpy_value(values, candidate) for candidate in predicate[2]]
+        return numpy.isin(values.data, candidates) & ~numpy.ma.getmaskarray(values)
+    if kind == "compare":
+        compare = getattr(numpy.ma, COMPARISONS[predicate[2]])
+        return numpy.ma.filled(compare(values, numpy_value(values, predicate[3])), False)
+    raise ValueError(f"Unknown predicate {kind!r}")
+
+
+def numpy_value(column: Any, value: Any) -> Any:
+    """Convert a value to compare with a decoded column to the column's kind of value."""
+    if column.dtype.kind == "M":
+        return numpy.datetime64(value, numpy.datetime_data(column.dtype)[0])
+    if column.dtype.kind == "i" and isinstance(value, int):
+        # A value the column's type can't hold is compared as the 64-bit integer it is
+        info = numpy.iinfo(column.dtype)
+        return value if info.min <= value <= info.max else numpy.int64(value)
+    return value
+
+
+def table_field(table: pxfile.TableFile, name: str) -> pxfile.Field:
+    """Find one of a table's fields by its (case-folded) name."""
+    for field in table.fields:
+        if field.name.casefold() == name:
+            return field
+    raise KeyError(name)
+
+
+class Columns:
+    """Decodes the columns of a batch of records as they're asked for, decoding each at most once."""
+
+    def __init__(self, table: pxfile.TableFile, dtype: Any, rows: Any, decoded: Optional[Dict[int, Any]] = None):
+        self.table = table
+        self.rows = rows
+        self.records = rows.reshape(-1).view(dtype)
+        self.positions = {field.name.casefold(): number for number, field in enumerate(table.fields)}
+        self.decoded = decoded or dict()
+
+    def __call__(self, name: str) -> Any:
+        number = self.positions[name.casefold()]
+        column = self.decoded.get(number, None)
+        if column is None:
+            field = self.table.fields[number]
+            column = self.decoded[number] = decode_column(self.table, field, self.records[f"f{number}"], self.rows)
+        return column
+
+    def where(self, mask: Any) -> "Columns":
+        """Narrow the batch down to the records a mask selects (keeping the columns decoded so far)."""
+        decoded = {number: column[mask] for number, column in self.decoded.items()}
+        return Columns(self.table, self.records.dtype, self.rows[mask], decoded)
+
+
+def column_batches(
+    table: pxfile.TableFile,
+    blocks: Optional[Iterable[int]] = None,
+    fields: Optional[Iterable[pxfile.Field]] = None,
+    batch_blocks: int = BATCH_BLOCKS,
+    where: Optional[Tuple[Any, ...]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Yield the table's records (or those in the supplied blocks), a batch of blocks at a time, as columns.
+
+    Each batch maps the name of each of the supplied fields (by default, all
+    of them) to a masked array of its values, with blank values masked:
+    integers and floats as such, Logicals as bools, Alphas as strings, Dates
+    as `datetime64[D]`, Times as `timedelta64[ms]`, Timestamps as
+    `datetime64[us]` and anything else as objects (as `TableFile.records`
+    decodes them).
+
+    With a `where` predicate (see `block_mask`), only the fields it tests are
+    decoded for every record; the rest are only decoded for the records that
+    match it, and only those are yielded.
+    """
+    fields = list(table.fields if fields is None else fields)
+    for columns in batches(table, blocks, batch_blocks, where):
+        yield {field.name: columns(field.name) for field in fields}
+
+
+def batches(
+    table: pxfile.TableFile,
+    blocks: Optional[Iterable[int]] = None,
+    batch_blocks: int = BATCH_BLOCKS,
+    where: Optional[Tuple[Any, ...]] = None,
+) -> Iterator[Columns]:
+    """Yield the (non-empty) batches of records `column_batches` decodes its columns from, before decoding any."""
+    dtype = record_dtype(table.fields, table.header.record_size)
+    pending = list(table.blocks() if blocks is None else blocks)
+    for start in range(0, len(pending), batch_blocks):
+        rows = block_rows(table, pending[start : start + batch_blocks])
+        if not len(rows):
+            continue
+        columns = Columns(table, dtype, rows)
+        if where is not None:
+            mask = block_mask(where, table, rows, columns)
+            if not mask.any():
+                continue
+            if not mask.all():
+                columns = columns.where(mask)
+        yield columns
+
+
+def column_values(field: pxfile.Field, column: Any) -> List[Any]:
+    """Convert a decoded column to the Python values `TableFile.records` would've decoded (None for blanks)."""
+    values = column.tolist()
+    if field.type == pxfile.TIME:
+        return [(datetime.min + value).time() if value is not None else None for value in values]
+    return values
+
+
+def records(
+    table: pxfile.TableFile,
+    blocks: Optional[Iterable[int]] = None,
+    batch_blocks: int = BATCH_BLOCKS,
+    where: Optional[Tuple[Any, ...]] = None,
+    fields: Optional[Sequence[int]] = None,
+) -> Iterator[Tuple[Any, ...]]:
+    """Yield the same records `TableFile.records` does, decoded a column at a time.
+
+    With a `where` predicate, only the records that match it (see `block_mask`)
+    are. With `fields`, only the columns of the fields at those positions are
+    decoded, and each record only holds their values.
+    """
+    projected = [table.fields[number] for number in fields] if fields is not None else table.fields
+    for columns in batches(table, blocks, batch_blocks, where):
+        if not projected:
+            yield from repeat((), len(columns.rows))
+            continue
+        yield from zip(*(column_values(field, columns(field.name)) for field in projected))
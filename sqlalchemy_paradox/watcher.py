@@ -0,0 +1,265 @@
+"""Detect changes other applications make to the tables in a Paradox directory."""
+# coding=utf-8
+
+from threading import Thread, Event, RLock
+from struct import unpack_from
+from select import select
+import os
+import sys
+import ctypes
+import ctypes.util
+import logging
+from typing import Any, Set, List, Dict, Tuple, Callable, NamedTuple, Optional
+
+log = logging.getLogger(__name__)
+
+# The kinds of change a TableChange can describe
+DATA = "data"
+STRUCTURE = "structure"
+CREATED = "created"
+DROPPED = "dropped"
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+
+class TableChange(NamedTuple):
+    """A change to one of a directory's tables, as seen by a SchemaWatcher."""
+
+    table: str
+    kind: str
+
+
+def table_file(name: str) -> Optional[Tuple[str, str]]:
+    """Split a file name into its table name and (case-folded) extension, if it's one of a table's files.
+
+    Besides the table itself (.DB) that's its blobs (.MB), its primary index
+    (.PX) and its secondary indexes (.Xnn / .Ynn).
+    """
+    stem, ext = os.path.splitext(name)
+    ext = ext.casefold()
+    if ext in (".db", ".mb", ".px") or (len(ext) == 4 and ext[1] in "xy"):
+        return stem, ext
+    return None
+
+
+def structure_signature(path: str) -> Optional[bytes]:
+    """Get the parts of a `.DB` file's header that describe its structure rather than its contents.
+
+    That's the record and header sizes, the file type, the number of fields and
+    of key fields, the field types and sizes, and the field names. Returns None
+    if the header can't be read (e.g. the file is locked or mid-write).
+    """
+    try:
+        with open(path, "rb") as reader:
+            header = reader.read(0x78)
+            if len(header) < 0x58:
+                return None
+            header_size = unpack_from("<H", header, 2)[0]
+            header += reader.read(max(0, header_size - len(header)))
+    except OSError:
+        return None
+
+    file_type, num_fields, pk_fields, version = header[4], *unpack_from("<HH", header, 0x21), header[0x39]
+
+    # Version 4+ tables (and secondary indexes) carry an extra "data header"
+    field_info = 0x78 if file_type in (0, 2, 3, 5) and version >= 5 else 0x58
+    table_name = 261 if version >= 0x0C else 79
+    names = field_info + 2 * num_fields + 4 + 4 * num_fields + table_name
+
+    end = names
+    for _ in range(num_fields):
+        end = header.find(b"\x00", end) + 1
+        if end == 0:
+            return None
+
+    return b"".join(
+        (header[:6], header[0x21:0x25], header[field_info : field_info + 2 * num_fields], header[names:end])
+    )
+
+
+class SchemaWatcher:
+    """Watches a directory of Paradox tables, reporting changes to its subscribers.
+
+    By default the directory is polled every `interval` seconds with a single
+    `os.scandir` pass, and any table whose files have changed size or mtime is
+    reported as a TableChange. A change is reported as STRUCTURE if the table's
+    `.DB` header now describes different fields, or if its primary or secondary
+    index files have appeared or disappeared; as CREATED / DROPPED if its `.DB`
+    file has appeared / disappeared; and as DATA otherwise.
+
+    With `backend="inotify"` (or "auto", on Linux) the directory is instead
+    rescanned as soon as inotify reports activity in it. Network shares don't
+    deliver inotify events, which is why polling is the default.
+    """
+
+    def __init__(self, directory: str, interval: float = 0.5, backend: str = "poll"):
+        self.directory = directory
+        self.interval = interval
+        self.backend = backend
+        if backend == "auto":
+            self.backend = "inotify" if sys.platform.startswith("linux") else "poll"
+
+        self.subscribers: List[Callable[[TableChange], Any]] = list()
+        self.files: Dict[str, Tuple[int, int, str]] = dict()
+        self.signatures: Dict[str, Optional[bytes]] = dict()
+        self.lock = RLock()
+        self.stopped = Event()
+        self.thread: Optional[Thread] = None
+
+    def subscribe(self, callback: Callable[[TableChange], Any]) -> None:
+        """Have the supplied callable called with each TableChange."""
+        with self.lock:
+            self.subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[TableChange], Any]) -> None:
+        """Stop calling the supplied callable with changes."""
+        with self.lock:
+            self.subscribers.remove(callback)
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int, str]]:
+        """Stat every table file in the directory, in one pass.
+
+        The stats are keyed by case-folded file name, as Paradox (like Windows)
+        treats table names case-insensitively.
+        """
+        files = dict()
+        try:
+            with os.scandir(self.directory) as entries:
+                for entry in entries:
+                    if table_file(entry.name) is None:
+                        continue
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    files[entry.name.casefold()] = (stat.st_size, stat.st_mtime_ns, entry.path)
+        except OSError:
+            pass
+        return files
+
+    def _signature(self, files: Dict[str, Tuple[int, int, str]], table: str) -> Optional[bytes]:
+        """Read the structure signature of a table's `.DB` file, as found in a snapshot."""
+        stat = files.get(f"{table}.db", None)
+        return structure_signature(stat[2]) if stat is not None else None
+
+    def _diff(
+        self, before: Dict[str, Tuple[int, int, str]], after: Dict[str, Tuple[int, int, str]]
+    ) -> List[TableChange]:
+        """Work out which tables have changed, and how, between two snapshots."""
+        touched: Dict[str, Set[Tuple[str, str]]] = dict()
+        names: Dict[str, str] = dict()
+        for name in set(before) | set(after):
+            if before.get(name) != after.get(name):
+                table, ext = table_file(name)
+                state = "created" if name not in before else "deleted" if name not in after else "changed"
+                touched.setdefault(table, set()).add((ext, state))
+                names[table] = table_file(os.path.basename((after.get(name) or before[name])[2]))[0]
+
+        changes = list()
+        for table, files in sorted(touched.items()):
+            if (".db", "created") in files:
+                kind = CREATED
+            elif (".db", "deleted") in files:
+                kind = DROPPED
+            elif any(state != "changed" and ext != ".mb" for ext, state in files):
+                kind = STRUCTURE
+            elif (".db", "changed") in files:
+                kind = STRUCTURE if self._signature(after, table) != self.signatures.get(table) else DATA
+            else:
+                kind = DATA
+
+            if kind == DROPPED:
+                self.signatures.pop(table, None)
+            elif kind != DATA:
+                self.signatures[table] = self._signature(after, table)
+
+            changes.append(TableChange(names[table], kind))
+
+        return changes
+
+    def check(self) -> List[TableChange]:
+        """Rescan the directory now, notifying subscribers of (and returning) any changes.
+
+        A subscriber that raises is logged and skipped, so it can't stop the
+        others (or the watcher itself) from carrying on.
+        """
+        with self.lock:
+            after = self._snapshot()
+            changes = self._diff(self.files, after)
+            self.files = after
+            subscribers = list(self.subscribers)
+
+        for change in changes:
+            for callback in subscribers:
+                try:
+                    callback(change)
+                except Exception:
+                    log.exception("SchemaWatcher subscriber %r failed on %r", callback, change)
+
+        return changes
+
+    def _prime(self) -> None:
+        """Take the initial snapshot (and structure signatures) that changes are detected against."""
+        with self.lock:
+            self.files = self._snapshot()
+            tables = {table_file(name)[0] for name in self.files if name.endswith(".db")}
+            self.signatures = {table: self._signature(self.files, table) for table in tables}
+
+    def _poll(self) -> None:
+        """Rescan the directory every `interval` seconds."""
+        while not self.stopped.wait(self.interval):
+            self.check()
+
+    def _inotify(self) -> None:
+        """Rescan the directory whenever inotify reports activity in it."""
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return self._poll()
+
+        try:
+            mask = IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+            if libc.inotify_add_watch(fd, os.fsencode(self.directory), mask) < 0:
+                return self._poll()
+
+            # Catch anything that changed between priming and the watch being added
+            self.check()
+            while not self.stopped.is_set():
+                ready, _, _ = select([fd], [], [], self.interval)
+                if not ready:
+                    continue
+                try:
+                    while os.read(fd, 65536):
+                        pass
+                except BlockingIOError:
+                    pass
+                # Let a burst of writes settle before rescanning
+                self.stopped.wait(0.05)
+                self.check()
+        finally:
+            os.close(fd)
+
+    def start(self) -> "SchemaWatcher":
+        """Start watching the directory on a background thread."""
+        self._prime()
+        self.stopped.clear()
+        target = self._inotify if self.backend == "inotify" else self._poll
+        self.thread = Thread(target=target, name="paradox-watcher", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop watching the directory."""
+        self.stopped.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
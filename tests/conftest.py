@@ -8,6 +8,9 @@ from sqlalchemy.dialects import registry
 registry.register(
     "paradox.pyodbc", "sqlalchemy_paradox.pyodbc", "ParadoxDialect_pyodbc"
 )
+registry.register(
+    "paradox.native", "sqlalchemy_paradox.native", "ParadoxDialect_native"
+)
 
 pytest.register_assert_rewrite("sqlalchemy.testing.assertions")
 
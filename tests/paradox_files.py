@@ -0,0 +1,473 @@
+"""Write small synthetic Paradox tables (.DB, .PX, .Xnn / .Ynn and .MB files) for the native reader's tests."""
+# coding=utf-8
+
+import os
+import shutil
+import tempfile
+from struct import Struct, pack, pack_into
+from datetime import date, datetime, time
+from decimal import Decimal, localcontext
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy.testing import fixtures
+
+from sqlalchemy_paradox import pxfile
+
+
+# (name, type, size), the size of a BCD field being its number of decimal places
+FieldSpec = Tuple[str, int, int]
+
+# The width of each fixed-width field type, in bytes
+WIDTHS = {
+    pxfile.DATE: 4,
+    pxfile.SHORT: 2,
+    pxfile.LONG: 4,
+    pxfile.MONEY: 8,
+    pxfile.NUMBER: 8,
+    pxfile.LOGICAL: 1,
+    pxfile.TIME: 4,
+    pxfile.TIMESTAMP: 8,
+    pxfile.AUTOINCREMENT: 4,
+    pxfile.BCD: 17,
+}
+
+HEADER_SIZE = 0x800
+MB_BLOCK_SIZE = 0x1000
+
+# A suballocated (type 3) .MB block's header, its table of 5-byte entries and where its data can start
+SUBALLOCATED_HEADER = 12
+SUBALLOCATED_ENTRY = Struct("<BBHB")
+SUBALLOCATED_ENTRIES = 64
+SUBALLOCATED_DATA = -(-(SUBALLOCATED_HEADER + SUBALLOCATED_ENTRY.size * SUBALLOCATED_ENTRIES) // 16) * 16
+
+
+def width(field: FieldSpec) -> int:
+    """Get the number of bytes a field takes up in each record."""
+    return WIDTHS.get(field[1], field[2])
+
+
+def flipped_int(value: Optional[int], size: int) -> bytes:
+    """Encode an integer big-endian with its sign bit flipped, or a blank."""
+    if value is None:
+        return bytes(size)
+    sign = 1 << (8 * size - 1)
+    return ((value & ((sign << 1) - 1)) ^ sign).to_bytes(size, "big")
+
+
+def flipped_double(value: Optional[float]) -> bytes:
+    """Encode a double big-endian, positives with their sign bit flipped and negatives inverted, or a blank."""
+    if value is None:
+        return bytes(8)
+    raw = int.from_bytes(pack(">d", value), "big")
+    raw = ~raw & 0xFFFFFFFFFFFFFFFF if raw >> 63 else raw ^ (1 << 63)
+    return raw.to_bytes(8, "big")
+
+
+def bcd(value: Optional[Decimal], scale: int) -> bytes:
+    """Encode a 17-byte BCD value: a sign / scale byte, then 32 digits (inverted if negative), or a blank."""
+    if value is None:
+        return bytes(17)
+    with localcontext() as context:
+        # Wide enough for all 32 digits, where the default context would round them
+        context.prec = 32
+        digits = str(int(abs(value).scaleb(scale))).rjust(32, "0")
+    if value < 0:
+        return bytes([scale]) + bytes.fromhex("".join(f"{0xF - int(digit):x}" for digit in digits))
+    return bytes([0x80 | scale]) + bytes.fromhex(digits)
+
+
+class BlobWriter:
+    """Lay out the blocks of a table's .MB file.
+
+    Values of at least `dedicated` bytes get a (type 2) block of their own,
+    and smaller ones are packed into suballocated (type 3) blocks, up to 64 to
+    a block, as Paradox does.
+    """
+
+    def __init__(self, dedicated: int = 2048):
+        self.dedicated = dedicated
+        self.data = bytearray(MB_BLOCK_SIZE)
+        self.suballocated: Optional[int] = None
+        self.entries = 0
+        self.used = 0
+
+    def add(self, raw: bytes) -> int:
+        """Store a value, getting the pointer its record holds to it."""
+        if len(raw) >= self.dedicated:
+            return self._dedicated(raw)
+        return self._suballocated(raw)
+
+    def _dedicated(self, raw: bytes) -> int:
+        """Store a value in a block of its own."""
+        block = len(self.data)
+        body = bytes([2]) + bytes(8) + raw
+        self.data += body.ljust(-(-len(body) // MB_BLOCK_SIZE) * MB_BLOCK_SIZE, b"\x00")
+        return block | 0xFF
+
+    def _suballocated(self, raw: bytes) -> int:
+        """Store a value in the current suballocated block, starting a new one if it's full."""
+        paragraphs = -(-len(raw) // 16)
+        if (
+            self.suballocated is None
+            or self.entries == SUBALLOCATED_ENTRIES
+            or self.used + 16 * paragraphs > MB_BLOCK_SIZE
+        ):
+            self.suballocated, self.entries, self.used = len(self.data), 0, SUBALLOCATED_DATA
+            self.data += bytes(MB_BLOCK_SIZE)
+            self.data[self.suballocated] = 3
+
+        block, index = self.suballocated, self.entries
+        entry = block + SUBALLOCATED_HEADER + SUBALLOCATED_ENTRY.size * index
+        SUBALLOCATED_ENTRY.pack_into(self.data, entry, self.used // 16, paragraphs, 0, 0)
+        self.data[block + self.used : block + self.used + len(raw)] = raw
+        self.entries, self.used = index + 1, self.used + 16 * paragraphs
+        return block | index
+
+    def write(self, path: str) -> None:
+        """Write the .MB file, if any values were stored in it."""
+        if len(self.data) > MB_BLOCK_SIZE:
+            with open(path, "wb") as writer:
+                writer.write(self.data)
+
+
+def encode(field: FieldSpec, value: Any, blobs: Optional[BlobWriter] = None, encoding: str = "cp1252") -> bytes:
+    """Encode a field's value the way it's stored in a record."""
+    _, field_type, size = field
+
+    if field_type == pxfile.ALPHA:
+        return (value.encode(encoding) if value else b"").ljust(size, b"\x00")
+    if field_type in (pxfile.SHORT, pxfile.LONG, pxfile.AUTOINCREMENT):
+        return flipped_int(value, WIDTHS[field_type])
+    if field_type in (pxfile.MONEY, pxfile.NUMBER):
+        return flipped_double(value)
+    if field_type == pxfile.LOGICAL:
+        return bytes(1) if value is None else bytes([0x81 if value else 0x80])
+    if field_type == pxfile.DATE:
+        return flipped_int(value.toordinal() if value is not None else None, 4)
+    if field_type == pxfile.TIME:
+        if value is None:
+            return bytes(4)
+        seconds = (value.hour * 60 + value.minute) * 60 + value.second
+        return flipped_int(seconds * 1000 + value.microsecond // 1000, 4)
+    if field_type == pxfile.TIMESTAMP:
+        if value is None:
+            return bytes(8)
+        delta = value - pxfile.EPOCH
+        milliseconds = (delta.days * 86400 + delta.seconds) * 1000 + delta.microseconds // 1000
+        return flipped_double(float(milliseconds + pxfile.MILLISECONDS_PER_DAY))
+    if field_type == pxfile.BCD:
+        return bcd(value, size)
+    if field_type in pxfile.BLOB_TYPES:
+        if value is None:
+            return bytes(size)
+        raw = value.encode(encoding) if isinstance(value, str) else value
+        leader = size - 10
+        if len(raw) <= leader:
+            return raw.ljust(leader, b"\x00") + pack("<IIH", 0, len(raw), 0)
+        return raw[:leader].ljust(leader, b"\x00") + pack("<IIH", blobs.add(raw), len(raw), 1)
+    return (value or b"").ljust(size, b"\x00")
+
+
+def chunked(items: List[Any], size: int) -> List[List[Any]]:
+    """Split a list into runs of at most `size` items."""
+    return [items[start : start + size] for start in range(0, len(items), size)]
+
+
+def header(
+    record_size: int,
+    file_type: int,
+    block_size: int,
+    num_records: int,
+    blocks: int,
+    fields: Sequence[FieldSpec] = (),
+    key_fields: int = 0,
+    version: int = 0x0C,
+    code_page: int = 1252,
+    table_name: str = "",
+) -> bytearray:
+    """Lay out a file's header: the fixed part, and for a table (or .Xnn file) its field descriptors and names."""
+    data = bytearray(HEADER_SIZE)
+    pxfile.HEADER.pack_into(
+        data, 0, record_size, HEADER_SIZE, file_type, block_size // 0x400, num_records, blocks + 1, blocks, 1, blocks
+    )
+    pack_into("<HH", data, 0x21, len(fields), key_fields)
+    data[0x39] = version
+
+    field_info = pxfile.FIELD_INFO
+    if file_type in (0, 2, 3, 5) and version >= 5:
+        field_info += pxfile.DATA_HEADER_SIZE
+        pack_into("<H", data, pxfile.CODE_PAGE, code_page)
+
+    for number, (_, field_type, size) in enumerate(fields):
+        data[field_info + 2 * number : field_info + 2 * number + 2] = bytes([field_type, size])
+
+    position = field_info + 6 * len(fields) + 4
+    name = table_name.encode("ascii")
+    data[position : position + len(name)] = name
+    position += 261 if version >= 0x0C else 79
+    for field_name, _, _ in fields:
+        raw = field_name.encode("ascii") + b"\x00"
+        data[position : position + len(raw)] = raw
+        position += len(raw)
+
+    assert position <= HEADER_SIZE, "Too many fields for the test header"
+    return data
+
+
+def data_block(next_block: int, number: int, records: List[bytes], record_size: int, block_size: int) -> bytes:
+    """Lay out one block of records (or index entries)."""
+    body = pxfile.BLOCK_HEADER.pack(next_block, number, (len(records) - 1) * record_size) + b"".join(records)
+    return body.ljust(block_size, b"\x00")
+
+
+def write_records(
+    path: str,
+    fields: Sequence[FieldSpec],
+    rows: List[Sequence[Any]],
+    file_type: int,
+    key_fields: int = 0,
+    block_size: int = 0x800,
+    per_block: Optional[int] = None,
+    version: int = 0x0C,
+    table_name: str = "",
+    blobs: Optional[BlobWriter] = None,
+) -> List[List[Sequence[Any]]]:
+    """Write the supplied rows into a file laid out like a table, getting the rows in each of its blocks."""
+    record_size = sum(width(field) for field in fields)
+    encoding = "cp1252" if version >= 5 else "cp437"
+    records = [b"".join(encode(field, value, blobs, encoding) for field, value in zip(fields, row)) for row in rows]
+
+    capacity = per_block or (block_size - pxfile.BLOCK_HEADER.size) // record_size
+    chunks = chunked(records, capacity)
+    data = header(
+        record_size,
+        file_type,
+        block_size,
+        len(rows),
+        len(chunks),
+        fields,
+        key_fields,
+        version,
+        table_name=table_name,
+    )
+    for number, chunk in enumerate(chunks):
+        next_block = number + 2 if number + 1 < len(chunks) else 0
+        data += data_block(next_block, number, chunk, record_size, block_size)
+
+    with open(path, "wb") as writer:
+        writer.write(data)
+    return chunked(list(rows), capacity)
+
+
+def write_tree(
+    path: str,
+    key_field: Sequence[FieldSpec],
+    first_keys: List[Sequence[Any]],
+    counts: List[int],
+    file_type: int,
+    block_size: int = 0x800,
+    per_block: Optional[int] = None,
+) -> None:
+    """Write an index tree (a .PX or .Ynn file) over the data blocks whose first keys and record counts are supplied.
+
+    The lowest level's entries lead to data blocks 1, 2, ... in turn, and each
+    level above it has an entry for each block of the one below, until one
+    block (the root) is left.
+    """
+    entry_size = sum(width(field) for field in key_field) + pxfile.INDEX_ENTRY_TAIL
+    capacity = per_block or (block_size - pxfile.BLOCK_HEADER.size) // entry_size
+
+    blocks: List[List[Tuple[Sequence[Any], int, int]]] = list()
+    level = [(key, number + 1, count) for number, (key, count) in enumerate(zip(first_keys, counts))]
+    levels = 0
+    while True:
+        levels += 1
+        numbers = list()
+        for group in chunked(level, capacity) or [[]]:
+            blocks.append(group)
+            numbers.append(len(blocks))
+        if len(numbers) == 1:
+            break
+        level = [
+            (group[0][0], number, sum(count for _, _, count in group))
+            for group, number in zip(chunked(level, capacity), numbers)
+        ]
+
+    data = header(entry_size, file_type, block_size, len(first_keys), len(blocks))
+    pack_into("<HB", data, 0x1E, len(blocks), levels)
+    for group in blocks:
+        entries = [
+            b"".join(encode(field, value) for field, value in zip(key_field, key))
+            + flipped_int(child, 2)
+            + flipped_int(count, 2)
+            + bytes(2)
+            for key, child, count in group
+        ]
+        data += data_block(0, 0, entries, entry_size, block_size)
+
+    with open(path, "wb") as writer:
+        writer.write(data)
+
+
+def write_table(
+    directory: str,
+    name: str,
+    fields: Sequence[FieldSpec],
+    rows: List[Sequence[Any]],
+    key_fields: int = 0,
+    block_size: int = 0x800,
+    per_block: Optional[int] = None,
+    index_per_block: Optional[int] = None,
+    version: int = 0x0C,
+    dedicated_blobs: int = 2048,
+    fold: bool = False,
+    order: Optional[Callable[[Sequence[Any]], Any]] = None,
+) -> str:
+    """Write a table's .DB file (and its .MB file, if any values need one), getting the .DB file's path.
+
+    With `key_fields`, the rows are written in order of their leading fields
+    (ignoring case, with `fold`), or by `order` if it's supplied, and a .PX
+    index is written over them too.
+    """
+    path = os.path.join(directory, f"{name}.DB")
+    if key_fields:
+        rows = sorted(rows, key=order or (lambda row: pxfile.sort_key(row[:key_fields], fold)))
+
+    blobs = BlobWriter(dedicated_blobs)
+    chunks = write_records(
+        path,
+        fields,
+        rows,
+        pxfile.INDEXED_DB if key_fields else pxfile.NON_INDEXED_DB,
+        key_fields,
+        block_size,
+        per_block,
+        version,
+        name,
+        blobs,
+    )
+    blobs.write(os.path.join(directory, f"{name}.MB"))
+
+    if key_fields:
+        write_tree(
+            os.path.join(directory, f"{name}.PX"),
+            fields[:key_fields],
+            [chunk[0][:key_fields] for chunk in chunks],
+            [len(chunk) for chunk in chunks],
+            pxfile.PRIMARY_INDEX,
+            block_size,
+            index_per_block,
+        )
+    return path
+
+
+def write_secondary(
+    directory: str,
+    name: str,
+    fields: Sequence[FieldSpec],
+    rows: List[Sequence[Any]],
+    key_fields: int,
+    column: int,
+    suffix: str = "01",
+    fold: bool = False,
+    order: Optional[Callable[[Sequence[Any]], Any]] = None,
+    hint: bool = True,
+    file_type: int = 5,
+    block_size: int = 0x800,
+    per_block: Optional[int] = None,
+    table_per_block: Optional[int] = None,
+    index_per_block: Optional[int] = None,
+) -> str:
+    """Write a secondary index on `fields[column]` of a table written by `write_table`, getting its .Xnn file's path.
+
+    The .Xnn file's records hold the indexed value, the record's primary key
+    and (with `hint`) the data block it's in, ordered as a /CASE_INSENSITIVE
+    index would be with `fold`, or by `order` if it's supplied.
+    """
+    rows = sorted(rows, key=lambda row: pxfile.sort_key(row[:key_fields]))
+    capacity = table_per_block or (block_size - pxfile.BLOCK_HEADER.size) // sum(width(field) for field in fields)
+    blocks: Dict[Tuple[Any, ...], int] = {
+        tuple(row[:key_fields]): number // capacity + 1 for number, row in enumerate(rows)
+    }
+
+    entries = [(row[column],) + tuple(row[:key_fields]) for row in rows]
+    entries.sort(key=order or (lambda entry: pxfile.sort_key(entry, fold)))
+    if hint:
+        entries = [entry + (blocks[entry[1:]],) for entry in entries]
+
+    entry_fields = [fields[column]] + list(fields[:key_fields]) + ([("Hint", pxfile.SHORT, 2)] if hint else [])
+    xpath = os.path.join(directory, f"{name}.X{suffix}")
+    chunks = write_records(xpath, entry_fields, entries, file_type, 0, block_size, per_block)
+
+    write_tree(
+        os.path.join(directory, f"{name}.Y{suffix}"),
+        entry_fields[:1],
+        [chunk[0][:1] for chunk in chunks],
+        [len(chunk) for chunk in chunks],
+        4 if file_type in (3, 5) else 7,
+        block_size,
+        index_per_block,
+    )
+    return xpath
+
+
+# A table with a field of every (non-BLOB) type, and some known values for each of them
+EVERY_TYPE = [
+    ("ID", pxfile.LONG, 4),
+    ("Name", pxfile.ALPHA, 12),
+    ("Small", pxfile.SHORT, 2),
+    ("Ratio", pxfile.NUMBER, 8),
+    ("Price", pxfile.MONEY, 8),
+    ("Flag", pxfile.LOGICAL, 1),
+    ("Born", pxfile.DATE, 4),
+    ("Alarm", pxfile.TIME, 4),
+    ("Stamp", pxfile.TIMESTAMP, 8),
+    ("Amount", pxfile.BCD, 2),
+]
+
+EVERY_TYPE_ROWS = [
+    (
+        1,
+        "Alpha",
+        -3,
+        -2.5,
+        19.99,
+        True,
+        date(1999, 12, 31),
+        time(23, 59, 58),
+        datetime(2001, 2, 3, 4, 5, 6),
+        Decimal("-123.45"),
+    ),
+    (2, "beta", 0, 0.0, -0.01, False, date(1, 1, 1), time(0, 0, 1), datetime(1970, 1, 1), Decimal("0.01")),
+    (3, None, None, None, None, None, None, None, None, None),
+    (
+        4,
+        "Gamma",
+        32767,
+        1e300,
+        -1e-300,
+        True,
+        date(9999, 12, 31),
+        time(12, 0),
+        datetime(9999, 12, 31, 23, 59, 59),
+        Decimal("99999999999999999999999999999.99"),
+    ),
+]
+
+
+class FileTest(fixtures.TestBase):
+    """Write each test's table files to a directory of its own, and unmap any opened from it afterwards."""
+
+    def setup_method(self, method):
+        self.directory = tempfile.mkdtemp(prefix="paradox-")
+        self.opened = list()
+
+    def teardown_method(self, method):
+        for table in self.opened:
+            table.close()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def open(self, path):
+        table = pxfile.TableFile(path)
+        self.opened.append(table)
+        return table
@@ -0,0 +1,317 @@
+"""Tests for Memo / BLOB columns, through the paradox+native driver over synthetic tables."""
+# coding=utf-8
+
+import io
+import os
+import pickle
+
+from sqlalchemy import Column, Integer, LargeBinary, MetaData, String, Table, Text, create_engine, event, func, select
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import Session, undefer
+from sqlalchemy.testing import fixtures, eq_, is_, assert_raises
+
+from sqlalchemy_paradox import automap_base, defer_blob_columns, is_blob, pxfile
+from sqlalchemy_paradox.blobs import BlobParameters, BlobReader
+from sqlalchemy_paradox.pyodbc import ParadoxDialect_pyodbc
+
+from .paradox_files import FileTest, write_table
+
+
+FIELDS = [
+    ("ID", pxfile.LONG, 4),
+    ("Name", pxfile.ALPHA, 10),
+    ("Notes", pxfile.MEMO, 14),
+    ("Scan", pxfile.GRAPHIC, 10),
+]
+
+ROWS = [(number, f"doc {number}", "note " * 50 * number, bytes(range(256)) * number) for number in range(1, 4)]
+
+
+class BlobTest(FileTest):
+    """A table of documents with a Memo and a Graphic field, read through a paradox+native engine."""
+
+    def setup_method(self, method):
+        super(BlobTest, self).setup_method(method)
+        write_table(self.directory, "Docs", FIELDS, ROWS, 1)
+        self.engine = create_engine(f"paradox+native:///{self.directory}")
+
+    def teardown_method(self, method):
+        self.engine.dispose()
+        super(BlobTest, self).teardown_method(method)
+
+
+class DeferredBlobTest(BlobTest):
+    def test_reflected(self):
+        docs = Table("Docs", MetaData(), autoload_with=self.engine)
+        eq_([column.name for column in docs.c if is_blob(column)], ["Notes", "Scan"])
+        eq_([column.info["paradox_blob"] for column in docs.c], [False, False, True, True])
+
+    def test_declared(self):
+        # Columns that weren't reflected are judged by their types
+        docs = Table(
+            "Docs",
+            MetaData(),
+            Column("ID", Integer, primary_key=True),
+            Column("Name", String(10)),
+            Column("Notes", Text),
+            Column("Scan", LargeBinary),
+            Column("Summary", Text(40)),
+        )
+        eq_([column.name for column in docs.c if is_blob(column)], ["Notes", "Scan"])
+        is_(is_blob(select([docs]).alias().c.Scan), True)
+
+    def test_omitted(self):
+        docs = Table("Docs", MetaData(), autoload_with=self.engine)
+        with self.engine.connect() as connection:
+
+            def omitting(*columns):
+                statement = select(columns).order_by(docs.c.ID).execution_options(paradox_omit_blobs=True)
+                return connection.execute(statement)
+
+            result = omitting(docs)
+            eq_(result.keys(), ["ID", "Name"])
+            eq_(result.fetchall(), [row[:2] for row in ROWS])
+
+            # Unless they're asked for by name
+            eq_(omitting(docs, docs.c.Notes).keys(), ["ID", "Name", "Notes"])
+            eq_(omitting(docs.c.ID, docs.c.Scan).keys(), ["ID", "Scan"])
+
+            eq_(connection.execute(select([docs]).order_by(docs.c.ID)).fetchall(), ROWS)
+
+    def test_automap(self):
+        base = automap_base()
+        base.prepare(self.engine, reflect=True)
+        session = Session(self.engine)
+        try:
+            document = session.query(base.classes.Docs).filter_by(ID=2).one()
+            eq_(sorted(key for key in vars(document) if not key.startswith("_")), ["ID", "Name"])
+            eq_(document.Scan, ROWS[1][3])
+
+            document = session.query(base.classes.Docs).options(undefer("Notes")).filter_by(ID=3).one()
+            eq_(vars(document)["Notes"], ROWS[2][2])
+        finally:
+            session.close()
+
+        base = automap_base(defer_blobs=False)
+        base.prepare(self.engine, reflect=True)
+        session = Session(self.engine)
+        try:
+            document = session.query(base.classes.Docs).filter_by(ID=1).one()
+            eq_(vars(document)["Scan"], ROWS[0][3])
+        finally:
+            session.close()
+
+    def test_declarative(self):
+        base = defer_blob_columns(declarative_base())
+
+        class Document(base):
+            __tablename__ = "Docs"
+            ID = Column(Integer, primary_key=True)
+            Name = Column(String(10))
+            Notes = Column(Text)
+
+        session = Session(self.engine)
+        try:
+            document = session.query(Document).get(1)
+            eq_(sorted(key for key in vars(document) if not key.startswith("_")), ["ID", "Name"])
+            eq_(document.Notes, ROWS[0][2])
+        finally:
+            session.close()
+
+
+class RecordingCursor:
+    """Stands in for a pyodbc cursor, recording what it's asked to execute."""
+
+    def __init__(self):
+        self.executed = list()
+
+    def execute(self, statement, *parameters):
+        self.executed.append((statement, parameters))
+
+
+class BoundBlobTest(fixtures.TestBase):
+    docs = Table(
+        "Docs",
+        MetaData(),
+        Column("ID", Integer, primary_key=True),
+        Column("Name", String(10)),
+        Column("Notes", Text),
+        Column("Scan", LargeBinary),
+    )
+
+    def execute(self, dialect, **values):
+        cursor = RecordingCursor()
+        dialect.do_execute(cursor, self.docs.insert().compile(dialect=dialect).string, values)
+        return cursor.executed
+
+    def test_parameters(self):
+        # Placeholders are collected in the order they're rendered, not the order the values were given in
+        parameters = BlobParameters({"a": "1", "c": "'c'"}, {"d": b"d", "b": "b" * 300})
+        eq_("(%(a)s, %(b)s, %(c)s, %(d)s)" % parameters, "(1, ?, 'c', ?)")
+        eq_(parameters.bound, ["b" * 300, b"d"])
+
+    def test_bound(self):
+        # Binary values and text too long for an Alpha field are bound, everything else is inlined
+        dialect = ParadoxDialect_pyodbc(paramstyle="pyformat")
+        scan, notes = bytes(range(256)) * 40, "note " * 100
+        eq_(
+            self.execute(dialect, ID=1, Name="doc", Notes=notes, Scan=scan),
+            [("INSERT INTO `Docs` (`ID`, `Name`, `Notes`, `Scan`) VALUES (1, 'doc', ?, ?)", (notes, scan))],
+        )
+        eq_(
+            self.execute(dialect, ID=2, Name="doc", Notes="short", Scan=None),
+            [("INSERT INTO `Docs` (`ID`, `Name`, `Notes`, `Scan`) VALUES (2, 'doc', 'short', NULL)", ())],
+        )
+
+        dialect.bind_blobs = False
+        eq_(
+            self.execute(dialect, ID=3, Name="doc", Notes="short", Scan=b"\x01\x02"),
+            [("INSERT INTO `Docs` (`ID`, `Name`, `Notes`, `Scan`) VALUES (3, 'doc', 'short', 12)", ())],
+        )
+
+    def test_maxwrite(self):
+        class Connection:
+            maxwrite = 0
+
+        connection = Connection()
+        ParadoxDialect_pyodbc(blob_chunk_size=4096).on_connect()(connection)
+        eq_(connection.maxwrite, 4096)
+
+
+class BlobReaderTest(fixtures.TestBase):
+    def reader(self, value):
+        fetched = list()
+
+        def fetch():
+            fetched.append(value)
+            return value
+
+        return BlobReader(fetch, encoding="cp1252"), fetched
+
+    def test_lazy(self):
+        reader, fetched = self.reader(b"0123456789")
+        eq_(fetched, [])
+        eq_(reader.read(4), b"0123")
+        eq_(reader.read(), b"456789")
+        eq_(reader.read(4), b"")
+        eq_(len(fetched), 1)
+
+    def test_seek(self):
+        reader, _ = self.reader(bytearray(b"0123456789"))
+        eq_(len(reader), 10)
+        eq_(reader.seek(-3, io.SEEK_END), 7)
+        eq_(reader.read(), b"789")
+        reader.seek(2)
+        eq_(reader.seek(3, io.SEEK_CUR), 5)
+        eq_(reader.tell(), 5)
+        eq_(reader.read(2), b"56")
+        eq_(reader.seek(-20, io.SEEK_CUR), 0)
+
+    def test_values(self):
+        eq_(self.reader("caf\u00e9")[0].read(), b"caf\xe9")
+        eq_(self.reader(None)[0].read(), b"")
+        eq_(self.reader(memoryview(b"abc"))[0].readall(), b"abc")
+
+
+class OpenBlobTest(BlobTest):
+    def test_open(self):
+        docs = Table("Docs", MetaData(), autoload_with=self.engine)
+        executed = list()
+        event.listen(self.engine, "before_cursor_execute", lambda *args: executed.append(args[2]))
+
+        with self.engine.connect() as connection:
+            with self.engine.dialect.open_blob(connection, docs.c.Scan, docs.c.ID == 3, buffer_size=100) as scan:
+                eq_(executed, [])
+                chunks = iter(lambda: scan.read(100), b"")
+                eq_(b"".join(chunks), ROWS[2][3])
+            eq_(len(executed), 1)
+
+            with self.engine.dialect.open_blob(connection, docs.c.Notes, docs.c.ID == 2) as notes:
+                eq_(notes.readline(), ROWS[1][2])
+
+            with self.engine.dialect.open_blob(connection, docs.c.Scan, docs.c.ID == 4) as missing:
+                eq_(missing.read(), b"")
+
+
+class LazyBlobTest(BlobTest):
+    def setup_method(self, method):
+        super(LazyBlobTest, self).setup_method(method)
+        self.docs = Table("Docs", MetaData(), autoload_with=self.engine)
+        self.views = 0
+        self.view = pxfile.BlobFile.view
+
+        def counted(blob_file, *args):
+            self.views += 1
+            return self.view(blob_file, *args)
+
+        pxfile.BlobFile.view = counted
+
+    def teardown_method(self, method):
+        pxfile.BlobFile.view = self.view
+        super(LazyBlobTest, self).teardown_method(method)
+
+    def lazy(self, statement):
+        with self.engine.connect() as connection:
+            return connection.execute(statement.execution_options(paradox_lazy_blobs=True)).fetchall()
+
+    def test_handles(self):
+        docs = self.docs
+        rows = self.lazy(select([docs]).order_by(docs.c.ID))
+        eq_(self.views, 0)
+        for row, (_, _, notes, scan) in zip(rows, ROWS):
+            is_(isinstance(row.Notes, pxfile.Blob), True)
+            eq_(len(row.Scan), len(scan))
+            eq_(str(row.Notes), notes)
+            view = row.Scan.view()
+            is_(isinstance(view, memoryview), True)
+            eq_(view.tobytes(), scan)
+            eq_(row.Scan.open().read(), scan)
+        assert self.views > 0
+
+    def test_unread(self):
+        # Blobs that are never used (or belong to rows that are filtered out) are never read
+        docs = self.docs
+        eq_([row.ID for row in self.lazy(select([docs]).where(docs.c.Name != "doc 2"))], [1, 3])
+        eq_(self.views, 0)
+
+        # Without handles, only the rows returned have their blobs read
+        with self.engine.connect() as connection:
+            row, = connection.execute(select([docs]).where(docs.c.ID == 2)).fetchall()
+        eq_(row, ROWS[1])
+        eq_(self.views, 2)
+
+    def test_filtered(self):
+        # Blobs used in the WHERE clause (or in expressions) are read for it, but still returned as handles
+        docs = self.docs
+        statement = select([docs.c.ID, docs.c.Scan, func.length(docs.c.Notes)]).where(docs.c.Notes.like("note%"))
+        rows = self.lazy(statement)
+        eq_([(row[0], bytes(row[1]), row[2]) for row in rows], [(row[0], row[3], len(row[2])) for row in ROWS])
+
+        # DISTINCT compares the values themselves
+        rows = self.lazy(select([docs.c.Scan]).distinct().order_by(docs.c.Scan))
+        eq_(sorted(row.Scan for row in rows), sorted(row[3] for row in ROWS))
+
+    def test_url(self):
+        engine = create_engine(f"paradox+native:///{self.directory}?lazy_blobs=true")
+        try:
+            with engine.connect() as connection:
+                scan = connection.execute(select([self.docs.c.Scan]).where(self.docs.c.ID == 1)).scalar()
+            eq_(bytes(scan), ROWS[0][3])
+        finally:
+            engine.dispose()
+
+    def test_pickled(self):
+        docs = self.docs
+
+        # Handles passed to another process won't read a value that's since been rewritten
+        row = self.lazy(select([docs]).where(docs.c.ID == 2))[0]
+        path = os.path.join(self.directory, "Docs.MB")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        assert_raises(ValueError, bytes, pickle.loads(pickle.dumps(row.Scan)))
+
+        # Otherwise they map the .MB file themselves
+        self.engine.dispose()
+        row = self.lazy(select([docs]).where(docs.c.ID == 3))[0]
+        scan, notes = pickle.loads(pickle.dumps((row.Scan, row.Notes)))
+        eq_((str(notes), bytes(scan)), ROWS[2][2:])
@@ -0,0 +1,614 @@
+"""Tests for the client-side emulation of SQL features the Intersolv driver lacks, checked against SQLite."""
+# coding=utf-8
+
+import shutil
+import sqlite3
+import tempfile
+from collections import Counter
+
+from sqlalchemy import (
+    Column,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    and_,
+    create_engine,
+    desc,
+    exists,
+    func,
+    select,
+    union,
+    union_all,
+)
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.testing import AssertsCompiledSQL, fixtures, eq_, is_, assert_raises
+
+from sqlalchemy_paradox.emulation import (
+    DDLBatch,
+    GroupedAggregation,
+    HashJoin,
+    HashJoinPipeline,
+    ParallelCompound,
+    SemiJoinKeys,
+    WindowEmulation,
+    WindowFunction,
+    compound_branches,
+    join_chain,
+)
+from sqlalchemy_paradox.base import ParadoxExecutionContext
+from sqlalchemy_paradox.pyodbc import ParadoxDialect_pyodbc
+
+
+metadata = MetaData()
+
+orders = Table(
+    "Orders",
+    metadata,
+    Column("ID", Integer, primary_key=True),
+    Column("Grp", Integer),
+    Column("Cust", Integer),
+    Column("Name", String(10)),
+    Column("Qty", Integer),
+)
+
+customers = Table("Customers", metadata, Column("ID", Integer), Column("Region", String(5)))
+
+ORDERS = [
+    (
+        number,
+        number % 3,
+        None if number % 7 == 0 else number % 5,
+        [None, "ann", "Bob", "bob"][number % 4],
+        None if number % 6 == 0 else (number * 3) % 4,
+    )
+    for number in range(1, 41)
+]
+
+CUSTOMERS = [(1, "north"), (2, "south"), (None, "north"), (3, None), (2, "east")]
+
+o, cu = orders.c, customers.c
+
+
+def consumed(rows, seen):
+    """Yield the supplied rows, recording each one as it's taken."""
+    for row in rows:
+        seen.append(row)
+        yield row
+
+
+class Cursor:
+    """A DBAPI cursor over a list of rows, recording whether it's been closed."""
+
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.closed = False
+
+    def fetchmany(self, size):
+        chunk, self.rows = self.rows[:size], self.rows[size:]
+        return chunk
+
+    def close(self):
+        self.closed = True
+
+
+class SQLiteTest(fixtures.TestBase):
+    """Compare plans compiled by the Paradox dialect with the same statements run by SQLite."""
+
+    @classmethod
+    def setup_class(cls):
+        # In a file, so that parallel branches' connections (each in a thread of its own) see the same tables
+        cls.directory = tempfile.mkdtemp(prefix="paradox-")
+        cls.engine = create_engine(f"sqlite:///{cls.directory}/emulation.db")
+        metadata.create_all(cls.engine)
+        with cls.engine.connect() as connection:
+            connection.execute(orders.insert(), [dict(zip(o.keys(), row)) for row in ORDERS])
+            connection.execute(customers.insert(), [dict(zip(cu.keys(), row)) for row in CUSTOMERS])
+
+        # The Paradox dialect, with SQLite standing in for the driver: statements reach it with their values inlined
+        path = f"{cls.directory}/emulation.db"
+        cls.paradox_engine = create_engine(
+            "paradox+pyodbc://",
+            module=sqlite3,
+            paramstyle="pyformat",
+            creator=lambda: sqlite3.connect(path, check_same_thread=False),
+            _initialize=False,
+        )
+
+    @classmethod
+    def teardown_class(cls):
+        cls.paradox_engine.dispose()
+        cls.engine.dispose()
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def sqlite(self, statement):
+        """Run a statement through SQLite itself."""
+        with self.engine.connect() as connection:
+            return [tuple(row) for row in connection.execute(statement)]
+
+    def paradox(self, statement, dialect):
+        """Compile a statement for Paradox and run whatever gets sent to the driver through SQLite."""
+        compiled = statement.compile(dialect=dialect)
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute(compiled.string, compiled.params)
+            plan = compiled.client_plan
+            if plan is None:
+                return cursor.fetchall()
+            return plan.cursor(cursor, [column[0] for column in compiled._result_columns]).fetchall()
+        finally:
+            connection.close()
+
+
+class GroupedAggregationTest(SQLiteTest, AssertsCompiledSQL):
+    def dialect(self):
+        dialect = ParadoxDialect_pyodbc()
+        dialect.max_group_by_columns = 2
+        dialect.max_order_by_columns = 1
+        return dialect
+
+    def test_plan(self):
+        statement = (
+            select([o.Name, o.Cust, o.Grp, func.sum(o.Qty), func.count(), func.count(o.Qty.distinct())])
+            .group_by(o.Name, o.Cust, o.Grp)
+            .order_by(desc(o.Grp))
+        )
+        # Only the non-text keys pre-sort the projection, as many as the driver will order by
+        self.assert_compile(
+            statement,
+            "SELECT `Orders`.`Cust`, `Orders`.`Grp`, `Orders`.`Name`, `Orders`.`Qty` "
+            "FROM `Orders` ORDER BY `Orders`.`Cust`",
+            dialect=self.dialect(),
+        )
+        plan = statement.compile(dialect=self.dialect()).client_plan
+        eq_((plan.key_count, plan.presorted, plan.order_by), (3, 1, [(2, True)]))
+        eq_(plan.outputs, [
+            ("key", 2),
+            ("key", 0),
+            ("key", 1),
+            ("aggregate", ("sum", 3, False)),
+            ("aggregate", ("count", None, False)),
+            ("aggregate", ("count", 3, True)),
+        ])
+
+    def test_unplanned(self):
+        dialect = self.dialect()
+        is_(select([o.Cust, func.count()]).group_by(o.Cust).compile(dialect=dialect).client_plan, None)
+        statement = select([o.Name, o.Cust, o.Grp, func.count()]).group_by(o.Name, o.Cust, o.Grp)
+        is_(statement.having(func.count() > 1).compile(dialect=dialect).client_plan, None)
+        is_(statement.order_by(o.Qty).compile(dialect=dialect).client_plan, None)
+        statement = select([o.Name, o.Cust, o.Grp, func.lower(o.Name)]).group_by(o.Name, o.Cust, o.Grp)
+        is_(statement.compile(dialect=dialect).client_plan, None)
+
+    def test_matches_sqlite(self):
+        statement = (
+            select([
+                o.Name,
+                o.Cust,
+                o.Grp,
+                func.sum(o.Qty),
+                func.count(),
+                func.count(o.Qty),
+                func.count(o.Qty.distinct()),
+                func.min(o.Qty),
+                func.max(o.ID),
+                func.avg(o.Qty),
+            ])
+            .group_by(o.Name, o.Cust, o.Grp)
+            .order_by(o.Name, o.Cust, o.Grp)
+        )
+        eq_(self.paradox(statement, self.dialect()), self.sqlite(statement))
+
+        # ...with nothing to pre-sort by, every group is held until the rows run out
+        statement = select([o.Name, func.lower(o.Name), func.count()]).group_by(o.Name, func.lower(o.Name))
+        dialect = self.dialect()
+        dialect.max_group_by_columns = 1
+        eq_(Counter(self.paradox(statement, dialect)), Counter(self.sqlite(statement)))
+
+    def test_null_keys(self):
+        outputs = [("key", 0), ("key", 1), ("aggregate", ("count", None, False)), ("aggregate", ("sum", 2, False))]
+        plan = GroupedAggregation(None, 2, 1, outputs, [])
+        rows = [(None, None, 1), (None, None, None), (None, "a", 2), (1, None, 3), (1, None, 4)]
+        eq_(list(plan.evaluate(iter(rows))), [(None, None, 2, 1), (None, "a", 1, 2), (1, None, 2, 7)])
+
+    def test_empty(self):
+        plan = GroupedAggregation(None, 1, 1, [("key", 0), ("aggregate", ("count", None, False))], [])
+        eq_(list(plan.evaluate(iter(()))), [])
+        cursor = Cursor([])
+        eq_(plan.cursor(cursor, ["key", "count"]).fetchall(), [])
+
+    def test_presorted_runs_flush(self):
+        outputs = [("key", 0), ("key", 1), ("aggregate", ("max", 2, False))]
+        rows = [(1, "b", 5), (1, "a", 6), (1, "b", 7), (2, "a", 8), (2, "a", 9), (3, "c", 1)]
+
+        seen = list()
+        groups = GroupedAggregation(None, 2, 1, outputs, []).evaluate(consumed(rows, seen))
+        eq_([next(groups), next(groups)], [(1, "b", 7), (1, "a", 6)])
+        # The first run was flushed as soon as the first row of the next one turned up
+        eq_(len(seen), 4)
+        eq_(list(groups), [(2, "a", 9), (3, "c", 1)])
+
+        seen = list()
+        groups = GroupedAggregation(None, 2, 0, outputs, []).evaluate(consumed(rows, seen))
+        next(groups)
+        eq_(len(seen), len(rows))
+
+    def test_order_by(self):
+        outputs = [("aggregate", ("count", None, False)), ("key", 0)]
+        plan = GroupedAggregation(None, 1, 0, outputs, [(0, True), (1, False)])
+        cursor = Cursor([("b",), ("a",), (None,), ("a",), ("c",)])
+        eq_(plan.cursor(cursor, ["count", "key"]).fetchall(), [(2, "a"), (1, None), (1, "b"), (1, "c")])
+        plan.cursor(cursor, ["count", "key"]).close()
+        is_(cursor.closed, True)
+
+
+class WindowEmulationTest(SQLiteTest, AssertsCompiledSQL):
+    __dialect__ = ParadoxDialect_pyodbc()
+
+    def test_plan(self):
+        statement = select([
+            o.ID,
+            func.row_number().over(partition_by=o.Cust, order_by=desc(o.Qty)),
+            func.sum(o.Qty).over(partition_by=o.Cust, order_by=o.ID, rows=(None, 0)),
+            func.count().over(partition_by=o.Cust, range_=(None, None)),
+        ]).order_by(o.ID)
+        self.assert_compile(
+            statement,
+            "SELECT `Orders`.`Cust`, `Orders`.`ID`, `Orders`.`Qty` FROM `Orders` ORDER BY `Orders`.`Cust`",
+        )
+        plan = statement.compile(dialect=self.__dialect__).client_plan
+        eq_((plan.partition_count, plan.outputs, plan.order_by), (
+            1,
+            [("column", 1), ("window", 0), ("window", 1), ("window", 2)],
+            [(0, False)],
+        ))
+        eq_(
+            [(window.name, window.argument, window.order_by, window.frame) for window in plan.windows],
+            [
+                ("ROW_NUMBER", None, [(2, True)], "peers"),
+                ("SUM", 2, [(1, False)], "rows"),
+                ("COUNT", None, [], "partition"),
+            ],
+        )
+
+    def test_unplanned(self):
+        dialect = self.__dialect__
+        is_(select([o.ID]).compile(dialect=dialect).client_plan, None)
+        # Every window has to share the same partitions
+        statement = select([
+            func.row_number().over(partition_by=o.Cust, order_by=o.ID),
+            func.row_number().over(partition_by=o.Grp, order_by=o.ID),
+        ])
+        is_(statement.compile(dialect=dialect).client_plan, None)
+        statement = select([func.sum(o.Qty).over(partition_by=o.Cust, order_by=o.ID, rows=(-2, 0))])
+        is_(statement.compile(dialect=dialect).client_plan, None)
+        statement = select([func.ntile(4).over(order_by=o.ID)])
+        is_(statement.compile(dialect=dialect).client_plan, None)
+        statement = select([func.row_number().over(order_by=o.ID) + 1])
+        is_(statement.compile(dialect=dialect).client_plan, None)
+
+    def test_matches_sqlite(self):
+        statement = select([
+            o.ID,
+            o.Cust,
+            func.row_number().over(partition_by=o.Cust, order_by=[desc(o.Qty), o.ID]),
+            func.rank().over(partition_by=o.Cust, order_by=o.Qty),
+            func.dense_rank().over(partition_by=o.Cust, order_by=desc(o.Qty)),
+            func.lag(o.Qty, 1, -1).over(partition_by=o.Cust, order_by=o.ID),
+            func.lead(o.ID, 2).over(partition_by=o.Cust, order_by=o.ID),
+            func.sum(o.Qty).over(partition_by=o.Cust, order_by=o.Qty),
+            func.sum(o.Qty).over(partition_by=o.Cust, order_by=o.ID, rows=(None, 0)),
+            func.max(o.Qty).over(partition_by=o.Cust, order_by=o.Grp, range_=(None, None)),
+            func.count().over(partition_by=o.Cust),
+        ]).order_by(o.ID)
+        eq_(self.paradox(statement, self.__dialect__), self.sqlite(statement))
+
+        statement = select([o.ID, func.avg(o.Qty).over(order_by=o.Grp)]).order_by(o.ID)
+        eq_(self.paradox(statement, self.__dialect__), self.sqlite(statement))
+
+    def test_frames(self):
+        rows = [(1, 10), (2, 10), (3, 20), (4, None)]
+        by_value = [(1, False)]
+        # Values come back in the partition's order, computed in the window's (with NULLs first)
+        eq_(WindowFunction("SUM", 1, by_value, "peers").compute(rows), [20, 20, 40, None])
+        eq_(WindowFunction("SUM", 1, by_value, "rows").compute(rows), [10, 20, 40, None])
+        eq_(WindowFunction("SUM", 1, by_value, "partition").compute(rows), [40] * 4)
+        eq_(WindowFunction("COUNT", None, by_value, "peers").compute(rows), [3, 3, 4, 1])
+        eq_(WindowFunction("RANK", None, by_value, "peers").compute(rows), [2, 2, 4, 1])
+        eq_(WindowFunction("DENSE_RANK", None, [(1, True)], "peers").compute(rows), [2, 2, 1, 3])
+        eq_(WindowFunction("LEAD", 0, by_value, "peers", offset=2, default=0).compute(rows), [3, 0, 0, 2])
+
+    def test_partition_boundaries(self):
+        windows = [
+            WindowFunction("ROW_NUMBER", None, [(1, False)], "peers"),
+            WindowFunction("LAG", 1, [(1, False)], "peers"),
+        ]
+        plan = WindowEmulation(None, 1, windows, [("column", 0), ("column", 1), ("window", 0), ("window", 1)], [])
+        rows = [(None, 2), (None, 1), ("a", 3), ("b", 1), ("b", 2)]
+
+        seen = list()
+        results = plan.evaluate(consumed(rows, seen))
+        eq_([next(results), next(results)], [(None, 1, 1, None), (None, 2, 2, 1)])
+        # A partition is emitted as soon as the next one starts
+        eq_(len(seen), 3)
+        eq_(list(results), [("a", 3, 1, None), ("b", 1, 1, None), ("b", 2, 2, 1)])
+        eq_(list(plan.evaluate(iter(()))), [])
+
+
+class ParallelCompoundTest(SQLiteTest):
+    __dialect__ = ParadoxDialect_pyodbc()
+
+    def branches(self, compound):
+        """Run each of a compound select's branches through SQLite."""
+        return [lambda branch=branch: self.sqlite(branch) for branch in compound_branches(compound)]
+
+    def test_union(self):
+        for combine, distinct in ((union, True), (union_all, False)):
+            compound = combine(
+                select([o.Cust, o.Grp]).where(o.ID < 20),
+                select([o.Cust, o.Grp]).where(o.ID > 10),
+                select([o.Cust, o.Grp]).where(o.Name == "Bob"),
+            ).order_by(desc("Grp"), "Cust")
+            compiled = compound.compile(dialect=self.__dialect__)
+            eq_(compiled.compound_order_by, [(1, True), (0, False)])
+
+            parallel = ParallelCompound(self.branches(compound), distinct, compiled.compound_order_by, 2)
+            eq_(list(parallel.execute()), self.sqlite(compound))
+
+    def test_unordered(self):
+        compound = union_all(select([o.ID]).where(o.ID < 3), select([o.ID]).where(o.ID < 2))
+        parallel = ParallelCompound(self.branches(compound), False, [], 8)
+        eq_(parallel.workers, 2)
+        eq_(list(parallel.cursor(None, ["ID"])), [(1,), (2,), (1,)])
+
+    def test_context(self):
+        # Each branch runs on a connection of its own, which the engine's pool doesn't keep
+        compound = union(*(select([o.Cust, o.Grp]).where(o.Grp == grp) for grp in range(3))).order_by("Cust", "Grp")
+        with self.paradox_engine.connect() as connection:
+            for _ in range(3):
+                result = connection.execution_options(paradox_parallel_union=True).execute(compound)
+                assert result.context.client_cursor is not None
+                eq_([tuple(row) for row in result], self.sqlite(compound))
+        eq_(self.paradox_engine.pool.status().split()[-1], "1")
+
+    def test_compound_branches(self):
+        first, second, third = (select([o.ID]).where(o.Grp == grp) for grp in range(3))
+        eq_(compound_branches(union(union(first, second), third)), [first, second, third])
+        is_(compound_branches(union(union_all(first, second), third)), None)
+        is_(compound_branches(first.except_(second)), None)
+
+
+class HashJoinTest(SQLiteTest):
+    build = [(1, "a"), (2, "b"), (2, "c"), (None, "d"), (4, "e")]
+    probe = [(1, "x"), (2, "y"), (None, "z"), (3, "w")]
+
+    def join(self, rows, **kwargs):
+        join = HashJoin(lambda: iter(self.build), [0], [0], 2, **kwargs)
+        return list(join.join(iter(rows)))
+
+    def test_inner(self):
+        eq_(Counter(self.join(self.probe)), Counter([(1, "x", 1, "a"), (2, "y", 2, "b"), (2, "y", 2, "c")]))
+
+    def test_outer(self):
+        eq_(Counter(self.join(self.probe, outer=True)), Counter([
+            (1, "x", 1, "a"),
+            (2, "y", 2, "b"),
+            (2, "y", 2, "c"),
+            (None, "z", None, None),
+            (3, "w", None, None),
+        ]))
+
+    def test_grace(self):
+        probe = self.probe * 3
+        for outer in (False, True):
+            eq_(
+                Counter(self.join(probe, outer=outer, budget=1, partitions=3)),
+                Counter(self.join(probe, outer=outer)),
+            )
+        eq_(self.join(list(), budget=1), list())
+
+    def test_pipeline(self):
+        regions = [("a", "north"), ("b", None), ("c", "south")]
+        joins = [
+            HashJoin(lambda: iter(self.build), [0], [0], 2),
+            HashJoin(lambda: iter(regions), [0], [3], 2, outer=True),
+        ]
+        pipeline = HashJoinPipeline(lambda: iter(self.probe), joins, [1, 5], [(1, True), (0, False)])
+        eq_(list(pipeline.cursor(None, ["probe", "region"])), [("y", "south"), ("x", "north"), ("y", None)])
+
+    def test_context(self):
+        joined = orders.join(customers, cu.ID == o.Cust)
+        statement = select([o.ID, o.Name, cu.Region]).select_from(joined).where(o.Grp == 1).order_by(o.ID, cu.Region)
+        with self.paradox_engine.connect() as connection:
+            result = connection.execution_options(paradox_hash_join=True).execute(statement)
+            assert result.context.client_cursor is not None
+            eq_([tuple(row) for row in result], self.sqlite(statement))
+
+    def test_join_chain(self):
+        other = customers.alias("c2")
+        joined = orders.join(customers, cu.ID == o.Cust).outerjoin(other, o.Grp == other.c.ID)
+        chained = join_chain(joined)
+        eq_(
+            [(table.name, outer) for table, _, outer in chained],
+            [("Orders", False), ("Customers", False), ("c2", True)],
+        )
+        eq_([(left.name, right.name) for left, right in chained[1][1]], [("Cust", "ID")])
+
+        is_(join_chain(orders.join(customers, o.Cust > cu.ID)), None)
+        is_(join_chain(orders.join(customers, o.Cust == cu.ID, full=True)), None)
+        is_(join_chain(orders.join(customers, and_(o.Cust == cu.ID, o.Grp == 1))), None)
+
+
+class SemiJoinTest(SQLiteTest, AssertsCompiledSQL):
+    __dialect__ = ParadoxDialect_pyodbc()
+
+    def exists(self, negate=False):
+        inner = exists().where(cu.ID == o.Cust).where(cu.Region == "north")
+        return select([o.ID]).where(and_(o.Grp > 0, ~inner if negate else inner)).order_by(o.ID)
+
+    def test_subquery(self):
+        self.assert_compile(
+            self.exists().execution_options(paradox_semijoin="subquery"),
+            "SELECT `Orders`.`ID` FROM `Orders` WHERE `Orders`.`Grp` > :Grp_1 AND `Orders`.`Cust` IN (SELECT "
+            "`Customers`.`ID` FROM `Customers` WHERE `Customers`.`Region` = :Region_1) ORDER BY `Orders`.`ID`",
+        )
+        # The inner side's NULL keys would make every NOT IN unknown, and outer NULLs have no match
+        self.assert_compile(
+            self.exists(negate=True).execution_options(paradox_semijoin="subquery"),
+            "SELECT `Orders`.`ID` FROM `Orders` WHERE `Orders`.`Grp` > :Grp_1 AND (`Orders`.`Cust` IS NULL OR "
+            "`Orders`.`Cust` NOT IN (SELECT `Customers`.`ID` FROM `Customers` WHERE `Customers`.`Region` = "
+            ":Region_1 AND `Customers`.`ID` IS NOT NULL)) ORDER BY `Orders`.`ID`",
+        )
+
+    def test_opt_in(self):
+        for options in (dict(), dict(paradox_semijoin=False)):
+            compiled = self.exists().execution_options(**options).compile(dialect=self.__dialect__)
+            assert "EXISTS" in compiled.string and " IN " not in compiled.string
+
+    def test_matches_sqlite(self):
+        for negate in (False, True):
+            statement = self.exists(negate)
+            expected = self.sqlite(statement)
+            eq_(self.paradox(statement.execution_options(paradox_semijoin="subquery"), self.__dialect__), expected)
+
+            compiled = statement.execution_options(paradox_semijoin="keys").compile(dialect=self.__dialect__)
+            job, = compiled.semijoin_keys
+            connection = self.engine.raw_connection()
+            try:
+                keys = [key for key, in connection.execute(job.statement, compiled.params)]
+                query = compiled.string.replace(job.token, job.predicate(keys, self.__dialect__.render_literal))
+                eq_([tuple(row) for row in connection.execute(query, compiled.params)], expected)
+            finally:
+                connection.close()
+
+    def test_grouped(self):
+        inner = exists(select([cu.ID]).where(cu.ID == o.Cust).where(cu.Region == "north")).self_group()
+        for predicate in (inner, ~inner):
+            statement = select([o.ID]).where(predicate).order_by(o.ID)
+            rewritten = statement.execution_options(paradox_semijoin="subquery")
+            assert "EXISTS" not in rewritten.compile(dialect=self.__dialect__).string
+            eq_(self.paradox(rewritten, self.__dialect__), self.sqlite(statement))
+
+    def test_inner_join(self):
+        # The key query keeps the inner join, rather than crossing its tables
+        other = orders.alias("Other")
+        inner = select([cu.ID]).select_from(customers.join(other, other.c.ID == cu.ID))
+        statement = select([o.ID]).where(exists(inner.where(cu.ID == o.Cust).where(other.c.Qty > 1))).order_by(o.ID)
+        rewritten = statement.execution_options(paradox_semijoin="subquery")
+        self.assert_compile(
+            rewritten,
+            "SELECT `Orders`.`ID` FROM `Orders` WHERE `Orders`.`Cust` IN (SELECT `Customers`.`ID` FROM `Customers` "
+            "JOIN `Orders` AS `Other` ON `Other`.`ID` = `Customers`.`ID` WHERE `Other`.`Qty` > :Qty_1) "
+            "ORDER BY `Orders`.`ID`",
+        )
+        eq_(self.paradox(rewritten, self.__dialect__), self.sqlite(statement))
+
+    def test_keys_executemany(self):
+        # Each set of parameters could match different keys, which can't all be inlined into one statement
+        context = ParadoxExecutionContext.__new__(ParadoxExecutionContext)
+        context.compiled = self.exists().execution_options(paradox_semijoin="keys").compile(dialect=self.__dialect__)
+        context.executemany = True
+        assert_raises(InvalidRequestError, context._inline_semijoin_keys)
+
+    def test_unrewritten(self):
+        dialect = self.__dialect__
+        other = orders.alias("Other")
+        for inner in (
+            exists().where(cu.ID > o.Cust),
+            exists().where(cu.ID == o.Cust).where(cu.Region == o.Name),
+            exists(select([cu.ID]).where(cu.ID == o.Cust).group_by(cu.ID)),
+            # The inner join takes in an outer table
+            exists(select([cu.ID]).select_from(customers.join(orders, o.Cust == cu.ID)).where(cu.ID == other.c.ID)),
+        ):
+            statement = select([o.ID]).where(inner).execution_options(paradox_semijoin="subquery")
+            compiled = statement.compile(dialect=dialect)
+            assert "EXISTS" in compiled.string
+
+    def test_keys_predicate(self):
+        literal = str
+        job = SemiJoinKeys("[TOKEN]", "`Cust`", "", negate=False, chunk_size=2)
+        eq_(job.predicate([3, None, 1, 3, 2], literal), "(`Cust` IN (3, 1) OR `Cust` IN (2))")
+        eq_(job.predicate([None], literal), "1 = 0")
+
+        job = SemiJoinKeys("[TOKEN]", "`Cust`", "", negate=True)
+        eq_(job.predicate([1, None, 2], literal), "(`Cust` IS NULL OR NOT (`Cust` IN (1, 2)))")
+        eq_(job.predicate([None], literal), "1 = 1")
+        eq_(SemiJoinKeys("[TOKEN]", "`Cust`", "", negate=False, chunk_size=0).chunk_size, 1)
+
+
+class Connection:
+    """Just enough of a connection for `ddl_batch`, recording the statements executed on it."""
+
+    def __init__(self):
+        self.info = dict()
+        self.executed = list()
+        self.connection = self
+
+    def cursor(self):
+        return self
+
+    def execute(self, statement):
+        self.executed.append(statement)
+
+    def close(self):
+        pass
+
+
+class DDLBatchTest(fixtures.TestBase):
+    statements = [
+        ("Orders", "CREATE INDEX `ByCust` ON `Orders` (`Cust`)"),
+        ("Orders", "CREATE UNIQUE INDEX `PRIMARY` ON `Orders` (`ID`)"),
+        ("Customers", "CREATE INDEX PRIMARY ON `Customers` (`ID`)"),
+        ("Items", "CREATE INDEX `Primary` ON `Items` (`ID`)"),
+        ("ORDERS", "CREATE INDEX `ByGrp` ON `Orders` (`Grp`)"),
+        ("Customers", "CREATE INDEX `ByRegion` ON `Customers` (`Region`)"),
+    ]
+
+    def batch(self, defer_indexes=False):
+        batch = DDLBatch(defer_indexes)
+        for table_name, statement in self.statements:
+            batch.add(table_name, statement)
+        return batch
+
+    def test_build(self):
+        executed = list()
+        self.batch().build(executed.append)
+        eq_(executed, [self.statements[index][1] for index in (1, 2, 3, 0, 4, 5)])
+
+    def test_flush_primary_only(self):
+        batch, executed = self.batch(), list()
+        batch.discard("items")
+        batch.build(executed.append, secondary=False)
+        eq_(executed, [self.statements[1][1], self.statements[2][1]])
+
+        batch.build(executed.append, secondary=False)
+        eq_(len(executed), 2)
+        batch.build(executed.append)
+        eq_(executed[2:], [self.statements[index][1] for index in (0, 4, 5)])
+        batch.build(executed.append)
+        eq_(len(executed), 5)
+
+    def test_ddl_batch(self):
+        dialect, connection = ParadoxDialect_pyodbc(), Connection()
+        with dialect.ddl_batch(connection, defer_indexes=True) as batch:
+            is_(connection.info["paradox_ddl_batch"], batch)
+            is_(batch.defer_indexes, True)
+            for table_name, statement in self.statements:
+                batch.add(table_name, statement)
+            eq_(connection.executed, [])
+        eq_(connection.executed, [self.statements[index][1] for index in (1, 2, 3, 0, 4, 5)])
+        eq_(connection.info, dict())
+
+    def test_rollback(self):
+        dialect, connection = ParadoxDialect_pyodbc(), Connection()
+
+        def fail():
+            with dialect.ddl_batch(connection) as batch:
+                for table_name, statement in self.statements:
+                    batch.add(table_name, statement)
+                raise RuntimeError("load failed")
+
+        assert_raises(RuntimeError, fail)
+        eq_(connection.executed, [])
+        eq_(connection.info, dict())
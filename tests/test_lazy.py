@@ -0,0 +1,115 @@
+"""Tests for on-demand table reflection, through the paradox+native driver over synthetic tables."""
+# coding=utf-8
+
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.testing import eq_, is_, assert_raises
+
+from sqlalchemy_paradox import LazyParadoxMetaData, pxfile
+from sqlalchemy_paradox.watcher import SchemaWatcher
+
+from .paradox_files import FileTest, write_table
+from .test_reflection import catalog_calls
+
+
+FIELDS = [("ID", pxfile.LONG, 4), ("Name", pxfile.ALPHA, 10)]
+
+NAMES = ["Alpha", "Bravo", "Charlie"]
+
+
+class LazyMetaDataTest(FileTest):
+    def setup_method(self, method):
+        super(LazyMetaDataTest, self).setup_method(method)
+        for name in NAMES:
+            self.write(name, FIELDS)
+        self.engine = create_engine(f"paradox+native:///{self.directory}")
+
+    def teardown_method(self, method):
+        self.engine.dispose()
+        super(LazyMetaDataTest, self).teardown_method(method)
+
+    def write(self, name, fields, rows=2):
+        values = [(number, "name", "notes")[: len(fields)] for number in range(rows)]
+        return write_table(self.directory, name, fields, values, 1)
+
+    def test_on_demand(self):
+        with catalog_calls("tables", "columns") as calls:
+            tables = LazyParadoxMetaData(self.engine)
+            eq_(dict(calls), dict())
+
+            # Listing (or checking for) tables takes a single catalog call, and reflects nothing
+            eq_(sorted(tables), NAMES)
+            is_("charlie" in tables, True)
+            is_("Delta" in tables, False)
+            eq_(dict(calls), {"tables": 1})
+            eq_(tables.tables, dict())
+
+            alpha = tables["ALPHA"]
+            eq_(alpha.name, "Alpha")
+            eq_([column.name for column in alpha.columns], ["ID", "Name"])
+            eq_([column.name for column in alpha.primary_key], ["ID"])
+            is_(tables.get("alpha"), alpha)
+            eq_(calls["columns"], 1)
+            eq_(list(tables.tables), ["Alpha"])
+
+        is_(tables.get("Delta"), None)
+        assert_raises(KeyError, tables.__getitem__, "Delta")
+
+    def test_concurrent(self):
+        # Every thread gets the same table, which is reflected only once
+        tables = LazyParadoxMetaData(self.engine)
+        found, barrier = list(), threading.Barrier(4, timeout=5)
+
+        def look_up():
+            barrier.wait()
+            found.append(tables["Bravo"])
+
+        with catalog_calls("columns") as calls:
+            threads = [threading.Thread(target=look_up) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        eq_(calls["columns"], 1)
+        eq_(len(found), 4)
+        is_(all(table is found[0] for table in found), True)
+
+    def test_warmup(self):
+        tables = LazyParadoxMetaData(self.engine, hot_tables=["charlie", "Delta"])
+        tables.warmup_thread.join(timeout=5)
+        eq_(list(tables.tables), ["Charlie"])
+
+        tables = LazyParadoxMetaData(self.engine, hot_tables=["charlie"], warmup=False)
+        is_(tables.warmup_thread, None)
+        eq_(tables.tables, dict())
+
+    def test_watched(self):
+        watcher = SchemaWatcher(self.directory, interval=60).start()
+        try:
+            tables = LazyParadoxMetaData(self.engine, watcher=watcher)
+            alpha, bravo = tables["Alpha"], tables["Bravo"]
+            eq_(len(tables), 3)
+
+            # Changes to a table's data leave it be, but a change to its structure has it reflected again
+            self.write("Bravo", FIELDS, rows=200)
+            self.write("Alpha", FIELDS + [("Notes", pxfile.ALPHA, 20)])
+            with catalog_calls("columns") as calls:
+                watcher.check()
+                eq_(sorted(tables.tables), ["Bravo"])
+                is_(tables["Bravo"], bravo)
+
+                restructured = tables["Alpha"]
+                assert restructured is not alpha
+                eq_([column.name for column in restructured.columns], ["ID", "Name", "Notes"])
+                eq_(calls["columns"], 1)
+
+            # Tables created (or dropped) since the directory was listed are found once the watcher's seen them
+            self.write("Delta", FIELDS)
+            is_("Delta" in tables, False)
+            watcher.check()
+            is_("Delta" in tables, True)
+            eq_(len(tables), 4)
+        finally:
+            watcher.stop()
@@ -0,0 +1,521 @@
+"""Tests for the paradox+native driver's query planning and evaluation, against synthetic tables."""
+# coding=utf-8
+
+import shutil
+import tempfile
+from collections import Counter
+from datetime import date, timedelta
+
+from sqlalchemy import (
+    Column,
+    Date,
+    Float,
+    Integer,
+    MetaData,
+    SmallInteger,
+    String,
+    Table,
+    Text,
+    and_,
+    create_engine,
+    func,
+    literal,
+    not_,
+    or_,
+    select,
+)
+from sqlalchemy.testing import fixtures, eq_, is_
+
+from sqlalchemy_paradox import dbapi, pxfile, vectorized
+from sqlalchemy_paradox.native import SelectQuery
+
+from .paradox_files import write_secondary, write_table
+
+
+FIELDS = [
+    ("ID", pxfile.LONG, 4),
+    ("Customer", pxfile.ALPHA, 10),
+    ("Qty", pxfile.SHORT, 2),
+    ("Price", pxfile.MONEY, 8),
+    ("Placed", pxfile.DATE, 4),
+    ("Notes", pxfile.MEMO, 14),
+]
+
+CUSTOMERS = ["Acme", "acme", "Bolt", "Crane", None, "delta"]
+
+ROWS = [
+    (
+        number,
+        CUSTOMERS[number % len(CUSTOMERS)],
+        None if number % 11 == 0 else (number * 7) % 23 - 5,
+        None if number % 9 == 0 else number * 0.75,
+        None if number % 13 == 0 else date(2020, 1, 1) + timedelta(days=number % 60),
+        None if number % 5 == 0 else "note " * (number % 5 * 2),
+    )
+    for number in range(300, 0, -1)
+]
+
+metadata = MetaData()
+
+orders = Table(
+    "Orders",
+    metadata,
+    Column("ID", Integer, primary_key=True),
+    Column("Customer", String(10)),
+    Column("Qty", SmallInteger),
+    Column("Price", Float),
+    Column("Placed", Date),
+    Column("Notes", Text),
+)
+
+pairs = Table("Pairs", metadata, Column("Grp", Integer, primary_key=True), Column("Seq", Integer, primary_key=True))
+
+c = orders.c
+
+# WHERE clauses, and the rows (as dicts) each of them matches
+CRITERIA = [
+    (c.ID == 150, lambda row: row["ID"] == 150),
+    (c.ID.between(40, 75), lambda row: 40 <= row["ID"] <= 75),
+    (and_(c.ID >= 280, c.Qty > 0), lambda row: row["ID"] >= 280 and (row["Qty"] or 0) > 0),
+    (c.ID < 10, lambda row: row["ID"] < 10),
+    (literal(295) <= c.ID, lambda row: row["ID"] >= 295),
+    (c.Customer == "acme", lambda row: row["Customer"] == "acme"),
+    (c.Customer.in_(["Bolt", "delta"]), lambda row: row["Customer"] in ("Bolt", "delta")),
+    (c.Customer.like("Ac%"), lambda row: (row["Customer"] or "").startswith("Ac")),
+    (c.Customer.is_(None), lambda row: row["Customer"] is None),
+    (c.Customer < "b", lambda row: row["Customer"] is not None and row["Customer"] < "b"),
+    (c.Customer.between("B", "d"), lambda row: row["Customer"] is not None and "B" <= row["Customer"] <= "d"),
+    (not_(c.Customer.like("B%")), lambda row: row["Customer"] is not None and row["Customer"][0] != "B"),
+    (c.Qty.between(-2, 3), lambda row: row["Qty"] is not None and -2 <= row["Qty"] <= 3),
+    (c.Qty == 7, lambda row: row["Qty"] == 7),
+    (c.Price > 100.5, lambda row: row["Price"] is not None and row["Price"] > 100.5),
+    (c.Placed >= date(2020, 2, 1), lambda row: row["Placed"] is not None and row["Placed"] >= date(2020, 2, 1)),
+    (or_(c.ID == 3, c.Qty == 0), lambda row: row["ID"] == 3 or row["Qty"] == 0),
+    (c.Notes.is_(None), lambda row: row["Notes"] is None),
+    (and_(c.Customer == "Crane", c.Qty < 0), lambda row: row["Customer"] == "Crane" and (row["Qty"] or 0) < 0),
+]
+
+
+class NativeTest(fixtures.TestBase):
+    """Query a table (with a primary index and two secondary ones) written to a directory for the class."""
+
+    @classmethod
+    def setup_class(cls):
+        cls.directory = tempfile.mkdtemp(prefix="paradox-")
+        write_table(cls.directory, "Orders", FIELDS, ROWS, 1, per_block=8, index_per_block=4)
+        write_secondary(cls.directory, "Orders", FIELDS, ROWS, 1, 1, "01", fold=True, table_per_block=8)
+        write_secondary(cls.directory, "Orders", FIELDS, ROWS, 1, 2, "02", table_per_block=8, index_per_block=4)
+        cls.rows = sorted(ROWS)
+        cls.engines = [create_engine(f"paradox+native:///{cls.directory}")]
+        if vectorized.numpy is not None:
+            cls.engines.append(create_engine(f"paradox+native:///{cls.directory}?vectorized=true"))
+
+    @classmethod
+    def teardown_class(cls):
+        for engine in cls.engines:
+            engine.dispose()
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def query(self, statement):
+        """Run a statement through each engine, checking they agree, and get its rows."""
+        results = list()
+        for engine in self.engines:
+            with engine.connect() as connection:
+                results.append([tuple(row) for row in connection.execute(statement)])
+        for result in results[1:]:
+            eq_(result, results[0])
+        return results[0]
+
+    def brute_force(self, predicate):
+        names = [name for name, _, _ in FIELDS]
+        return [row for row in self.rows if predicate(dict(zip(names, row)))]
+
+
+class QueryTest(NativeTest):
+    def test_filters_match_a_scan(self):
+        for clause, predicate in CRITERIA:
+            eq_(self.query(select([orders]).where(clause).order_by(c.ID)), self.brute_force(predicate), str(clause))
+
+    def test_projected_filters_match_a_scan(self):
+        for clause, predicate in CRITERIA:
+            eq_(
+                self.query(select([c.Price, c.ID]).where(clause).order_by(c.ID.desc())),
+                [(row[3], row[0]) for row in reversed(self.brute_force(predicate))],
+                str(clause),
+            )
+
+    def test_ordered_by_indexes(self):
+        eq_(self.query(select([c.ID]).order_by(c.ID.desc()).limit(5)), [(300,), (299,), (298,), (297,), (296,)])
+        eq_(self.query(select([c.ID]).order_by(c.ID).offset(10).limit(2)), [(11,), (12,)])
+        eq_(
+            [qty for qty, in self.query(select([c.Qty]).order_by(c.Qty).limit(40))],
+            sorted((row[2] for row in self.rows), key=lambda qty: (qty is not None, qty))[:40],
+        )
+
+    def test_aggregates(self):
+        eq_(self.query(select([func.count()]).select_from(orders)), [(300,)])
+        eq_(self.query(select([func.min(c.ID), func.max(c.ID)])), [(1, 300)])
+        eq_(self.query(select([func.count(c.Qty), func.sum(c.Qty)]).where(c.ID <= 30)), [
+            (len([row for row in self.rows[:30] if row[2] is not None]), sum(row[2] or 0 for row in self.rows[:30]))
+        ])
+        eq_(
+            dict(self.query(select([c.Customer, func.count()]).group_by(c.Customer))),
+            Counter(row[1] for row in self.rows),
+        )
+
+    def test_get(self):
+        for engine in self.engines:
+            with engine.connect() as connection:
+                eq_(tuple(engine.dialect.get(connection, orders, 42)), self.rows[41])
+                is_(engine.dialect.get(connection, orders, 301), None)
+
+
+class PlanTest(NativeTest):
+    def plan(self, statement):
+        return SelectQuery(statement, {}, [])
+
+    def test_key_range(self):
+        eq_(self.plan(select([orders]).where(c.ID == 7))._key_range(["id"]), ((7,), (7,)))
+        eq_(self.plan(select([orders]).where(and_(c.ID >= 5, c.ID < 9)))._key_range(["id"]), ((5,), (9,)))
+        eq_(self.plan(select([orders]).where(c.ID.between(5, 9)))._key_range(["id"]), ((5,), (9,)))
+        eq_(self.plan(select([orders]).where(literal(5) <= c.ID))._key_range(["id"]), ((5,), None))
+        eq_(self.plan(select([orders]).where(and_(c.ID > 3, c.ID > 5)))._key_range(["id"]), ((5,), None))
+        is_(self.plan(select([orders]).where(c.Qty == 7))._key_range(["id"]), None)
+        is_(self.plan(select([orders]).where(or_(c.ID == 7, c.ID == 8)))._key_range(["id"]), None)
+        is_(self.plan(select([orders]))._key_range(["id"]), None)
+
+    def test_partial_key_range(self):
+        grp, seq = pairs.c.Grp, pairs.c.Seq
+        eq_(self.plan(select([pairs]).where(and_(grp == 2, seq.between(3, 5))))._key_range(["grp", "seq"]), (
+            (2, 3),
+            (2, 5),
+        ))
+        eq_(self.plan(select([pairs]).where(and_(grp > 2, seq == 5)))._key_range(["grp", "seq"]), ((2,), None))
+        is_(self.plan(select([pairs]).where(seq == 5))._key_range(["grp", "seq"]), None)
+
+    def test_equal_only_key_range(self):
+        statement = select([orders]).where(c.Customer > "B")
+        is_(self.plan(statement)._key_range(["customer"], ["customer"]), None)
+        statement = select([orders]).where(c.Customer == "acme")
+        eq_(self.plan(statement)._key_range(["customer"], ["customer"]), (("acme",), ("acme",)))
+
+    def test_pushdown(self):
+        table = pxfile.TableFile(f"{self.directory}/Orders.DB")
+        try:
+            pushdown = self.plan(select([orders]).where(and_(c.ID > 5, c.Customer.like("Ac%"))))._pushdown(table)
+            eq_(pushdown, ("and", ("compare", "id", "gt", 5), ("prefix", "customer", b"Ac")))
+
+            # The parts that can't be tested a block at a time are left for each record
+            pushdown = self.plan(select([orders]).where(and_(c.ID > 5, func.lower(c.Customer) == "x")))
+            eq_(pushdown._pushdown(table), ("and", ("compare", "id", "gt", 5)))
+
+            # ...so an OR or a NOT of them can't be tested at all
+            statement = select([orders]).where(or_(c.ID > 5, func.lower(c.Customer) == "x"))
+            is_(self.plan(statement)._pushdown(table), None)
+            statement = select([orders]).where(not_(and_(c.ID > 5, func.lower(c.Customer) == "x")))
+            is_(self.plan(statement)._pushdown(table), None)
+
+            eq_(self.plan(select([orders]).where(~c.ID.in_([1, 2])))._pushdown(table), ("not", ("in", "id", (1, 2))))
+            eq_(self.plan(select([orders]).where(c.Placed.is_(None)))._pushdown(table), ("null", "placed"))
+            eq_(
+                self.plan(select([orders]).where(c.Qty.between(1, 2)))._pushdown(table),
+                ("and", ("compare", "qty", "ge", 1), ("compare", "qty", "le", 2)),
+            )
+            # Integers too big for a double to hold exactly, and comparisons of mismatched types, aren't pushed down
+            is_(self.plan(select([orders]).where(c.ID == 2 ** 60))._pushdown(table), None)
+            is_(self.plan(select([orders]).where(c.Customer == 5))._pushdown(table), None)
+            is_(self.plan(select([orders]))._pushdown(table), None)
+        finally:
+            table.close()
+
+    def test_key_extremes(self):
+        connection = dbapi.connect(self.directory)
+        try:
+            table = connection.table("Orders")
+
+            query = self.plan(select([func.min(c.ID), func.max(c.ID)]))
+            fields = query._projection(table.fields)
+            eq_(fields, [0])
+            eq_(query._key_extremes(connection, table, fields), [(1,), (300,)])
+
+            eq_(self.plan(select([func.max(c.ID)]))._key_extremes(connection, table, [0]), [(300,)])
+            is_(self.plan(select([func.max(c.ID)]).where(c.ID < 5))._key_extremes(connection, table, [0]), None)
+            is_(self.plan(select([func.count(c.ID)]))._key_extremes(connection, table, [0]), None)
+            is_(self.plan(select([func.max(c.Qty)]))._key_extremes(connection, table, [2]), None)
+        finally:
+            connection.close()
+
+
+NAMES = ["apple", "Apricot", "banana", "Blueberry", "cherry", "Cranberry", "date", "Durian", "elder", "Fig", "grape"]
+
+fruit = Table("Fruit", MetaData(), Column("Name", String(12), primary_key=True), Column("Qty", SmallInteger))
+
+basket = Table("Basket", MetaData(), Column("ID", Integer, primary_key=True), Column("Name", String(12)))
+
+# WHERE clauses on a name, and the names each of them matches
+NAME_CRITERIA = [
+    (lambda name: name < "b", lambda value: value < "b"),
+    (lambda name: name.between("D", "h"), lambda value: "D" <= value <= "h"),
+    (lambda name: name >= "c", lambda value: value >= "c"),
+    (lambda name: name == "Fig", lambda value: value == "Fig"),
+    (lambda name: name == "fig", lambda value: value == "fig"),
+    (lambda name: name.in_(["date", "Durian"]), lambda value: value in ("date", "Durian")),
+]
+
+
+class FoldedIndexTest(fixtures.TestBase):
+    """Query tables whose text keys are in case-insensitive order, as /CASE_INSENSITIVE indexes keep them.
+
+    Fruit's primary key is its name, in a folded .PX index; Basket's names
+    are in a folded secondary index.
+    """
+
+    @classmethod
+    def setup_class(cls):
+        cls.directory = tempfile.mkdtemp(prefix="paradox-")
+        cls.rows = [(name, number) for number, name in enumerate(NAMES + ["Guava"])]
+        fields = [("Name", pxfile.ALPHA, 12), ("Qty", pxfile.SHORT, 2)]
+        write_table(cls.directory, "Fruit", fields, cls.rows, 1, per_block=2, index_per_block=2, fold=True)
+
+        cls.basket = [(number, name) for number, name in enumerate(NAMES + ["Guava"], 1)]
+        fields = [("ID", pxfile.LONG, 4), ("Name", pxfile.ALPHA, 12)]
+        blocks = dict(per_block=2, index_per_block=2)
+        write_table(cls.directory, "Basket", fields, cls.basket, 1, **blocks)
+        write_secondary(cls.directory, "Basket", fields, cls.basket, 1, 1, fold=True, table_per_block=2, **blocks)
+        cls.engine = create_engine(f"paradox+native:///{cls.directory}")
+
+    @classmethod
+    def teardown_class(cls):
+        cls.engine.dispose()
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def query(self, statement):
+        with self.engine.connect() as connection:
+            return [tuple(row) for row in connection.execute(statement)]
+
+    def test_folded(self):
+        # Neither index is taken to be case-sensitive, or out of order, whether or not its keys show it's folded yet
+        connection = dbapi.connect(self.directory)
+        try:
+            table = connection.table("Basket")
+            index, = table.secondary_indexes
+            for tree in (connection.table("Fruit").primary_index, index.tree):
+                eq_((tree.cased, tree.disordered), (False, False))
+            is_(index.stale, False)
+
+            # The first lookup finds the secondary index's keys only in order folded, and falls back to a scan.
+            # After that, equal text is found whatever its case, leaving the WHERE clause to tell cases apart
+            is_(connection.secondary_range(table, index, ("FIG",), ("FIG",)), None)
+            is_(index.tree.fold, True)
+            eq_(list(connection.secondary_range(table, index, ("FIG",), ("FIG",))), [(10, "Fig")])
+        finally:
+            connection.close()
+
+    def test_filters_match_a_scan(self):
+        for table, rows, name, position, order in (
+            (fruit, self.rows, fruit.c.Name, 0, fruit.c.Qty),
+            (basket, self.basket, basket.c.Name, 1, basket.c.ID),
+        ):
+            for clause, predicate in NAME_CRITERIA:
+                eq_(
+                    self.query(select([table]).where(clause(name)).order_by(order)),
+                    [row for row in rows if predicate(row[position])],
+                    f"{table.name}: {clause(name)}",
+                )
+
+    def test_ordered(self):
+        # The indexes' order isn't the query's, so rows are sorted case-sensitively after they're read
+        names = sorted(name for name, _ in self.rows)
+        eq_(self.query(select([fruit.c.Name]).order_by(fruit.c.Name)), [(name,) for name in names])
+        eq_(self.query(select([fruit.c.Name]).order_by(fruit.c.Name.desc()).limit(2)), [("grape",), ("elder",)])
+        eq_(self.query(select([func.min(fruit.c.Name), func.max(fruit.c.Name)])), [("Apricot", "grape")])
+        eq_(self.query(select([basket.c.Name]).order_by(basket.c.Name).limit(3)), [(name,) for name in names[:3]])
+
+    def test_get(self):
+        with self.engine.connect() as connection:
+            eq_(tuple(self.engine.dialect.get(connection, fruit, "Durian")), ("Durian", 7))
+            is_(self.engine.dialect.get(connection, fruit, "durian"), None)
+
+
+words = Table("Words", MetaData(), Column("Word", String(4), primary_key=True), Column("Qty", SmallInteger))
+
+people = Table("People", MetaData(), Column("ID", Integer, primary_key=True), Column("Name", String(4)))
+
+
+class DisorderedIndexTest(fixtures.TestBase):
+    """Read tables whose indexes turn out to be out of order only past the blocks checked when they're opened."""
+
+    # The first block shows the keys are in case-sensitive order, the middle one isn't in either order
+    names = ["B1", "a1", "a2", "bc", "bb", "ba", "c1", "c2", "c3"]
+
+    @classmethod
+    def setup_class(cls):
+        cls.directory = tempfile.mkdtemp(prefix="paradox-")
+
+        def order(row):
+            return cls.names.index(row[0])
+
+        cls.words = [(name, number) for number, name in enumerate(cls.names)]
+        fields = [("Word", pxfile.ALPHA, 4), ("Qty", pxfile.SHORT, 2)]
+        blocks = dict(per_block=1, index_per_block=3)
+        write_table(cls.directory, "Words", fields, cls.words, 1, order=order, **blocks)
+        write_secondary(cls.directory, "Words", fields, cls.words, 1, 1, hint=False, table_per_block=1, **blocks)
+
+        cls.people = [(number, name) for number, name in enumerate(cls.names, 1)]
+        fields = [("ID", pxfile.LONG, 4), ("Name", pxfile.ALPHA, 4)]
+        write_table(cls.directory, "People", fields, cls.people, 1, per_block=2)
+        write_secondary(cls.directory, "People", fields, cls.people, 1, 1, order=order, table_per_block=2, **blocks)
+        cls.engine = create_engine(f"paradox+native:///{cls.directory}")
+
+    @classmethod
+    def teardown_class(cls):
+        cls.engine.dispose()
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def query(self, statement):
+        with self.engine.connect() as connection:
+            return [tuple(row) for row in connection.execute(statement)]
+
+    def test_unbounded_ranges(self):
+        connection = dbapi.connect(self.directory)
+        try:
+            table = connection.table("Words")
+            is_(table.primary_index.cased, True)
+            is_(connection.key_range(table, None, None), None)
+            # Its keys were known to be in case-sensitive order, so it isn't searched case-insensitively instead
+            is_(table.primary_index.fold, False)
+            is_(table.primary_index.disordered, True)
+
+            table = connection.table("People")
+            index, = table.secondary_indexes
+            is_(index.tree.cased, True)
+            is_(connection.secondary_range(table, index, None, None), None)
+        finally:
+            connection.close()
+
+    def test_ordered(self):
+        # Each index would be read in order, then found out of order part way: the table's scanned and sorted instead
+        eq_(self.query(select([words]).order_by(words.c.Word.desc())), sorted(self.words, reverse=True))
+        by_name = sorted(self.people, key=lambda row: row[1])
+        eq_(self.query(select([people]).order_by(people.c.Name).limit(4)), by_name[:4])
+
+    def test_unhinted_secondary(self):
+        # Without hints, records are found through the primary index, and failing that by scanning the table
+        eq_(self.query(select([words]).where(words.c.Qty.between(2, 5))), self.words[2:6])
+
+
+class ParallelScanTest(fixtures.TestBase):
+    """Scan a table big enough to be split across worker processes, and compare it with a serial scan."""
+
+    @classmethod
+    def setup_class(cls):
+        cls.directory = tempfile.mkdtemp(prefix="paradox-")
+        write_table(cls.directory, "Orders", FIELDS, ROWS, 1, per_block=4)
+        cls.connection = dbapi.connect(cls.directory, scan_workers=4)
+        cls.table = cls.connection.table("Orders")
+        cls.serial = [tuple(map(pxfile.load, record)) for record in cls.table.records()]
+
+    @classmethod
+    def teardown_class(cls):
+        cls.connection.close()
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def scan(self, **kwargs):
+        return [tuple(map(pxfile.load, record)) for record in self.connection.scan(self.table, **kwargs)]
+
+    def test_ordered(self):
+        assert self.table.header.file_blocks >= dbapi.PARALLEL_MIN_BLOCKS
+        eq_(self.scan(), self.serial)
+        assert self.connection._executor is not None
+        eq_(self.scan(fields=[0, 5]), [(record[0], record[5]) for record in self.serial])
+
+    def test_unordered(self):
+        records = self.scan(ordered=False)
+        eq_(sorted(records), sorted(self.serial))
+        eq_(len(records), len(ROWS))
+
+    def test_vectorized(self):
+        if vectorized.numpy is None:
+            return
+        eq_(self.scan(vectorized=True), self.serial)
+        records = self.scan(vectorized=True, ordered=False, fields=[0, 2])
+        eq_(sorted(records), [(record[0], record[2]) for record in self.serial])
+
+    def test_abandoned(self):
+        # A scan that's only partly read doesn't leave the pool busy for the next one
+        scan = self.connection.scan(self.table)
+        eq_([tuple(map(pxfile.load, next(scan))) for _ in range(3)], self.serial[:3])
+        scan.close()
+        eq_(self.scan(), self.serial)
+
+    def test_queries(self):
+        # Through the dialect, with workers set in the URL or per statement, queries match a serial scan's results
+        serial = create_engine(f"paradox+native:///{self.directory}")
+        parallel = create_engine(f"paradox+native:///{self.directory}?scan_workers=4&scan_ordered=false")
+        statements = [
+            select([orders]),
+            select([orders.c.Customer, func.count(), func.sum(orders.c.Qty)]).group_by(orders.c.Customer),
+            select([orders]).where(orders.c.Qty > 3).order_by(orders.c.Price.desc(), orders.c.ID),
+        ]
+        parallel_records, scans = pxfile.parallel_records, list()
+
+        def counted(*args, **kwargs):
+            scans.append(args[3])
+            return parallel_records(*args, **kwargs)
+
+        pxfile.parallel_records = counted
+        try:
+            for statement in statements:
+                with serial.connect() as connection:
+                    expected = [tuple(row) for row in connection.execute(statement)]
+                    per_statement = statement.execution_options(paradox_scan_workers=4)
+                    eq_([tuple(row) for row in connection.execute(per_statement)], expected)
+                with parallel.connect() as connection:
+                    eq_(Counter(tuple(row) for row in connection.execute(statement)), Counter(expected))
+            # The aggregate and the sorted query needn't be read in table order
+            eq_(scans, [True, False, False, False, False, False])
+        finally:
+            pxfile.parallel_records = parallel_records
+            serial.dispose()
+            parallel.dispose()
+
+
+class LastKeyTest(NativeTest):
+    def test_last_key(self):
+        engine = self.engines[0]
+        dialect = engine.dialect
+        eq_(dialect.last_key(engine, "orders"), 300)
+        with engine.connect() as connection:
+            eq_(dialect.last_key(connection, "ORDERS"), 300)
+
+        # Tables without a primary index (or any records, or at all) have no last key to read
+        write_table(self.directory, "Unkeyed", FIELDS, ROWS[:5])
+        write_table(self.directory, "Empty", FIELDS, [], 1)
+        for table_name in ("Unkeyed", "Empty", "Missing"):
+            is_(dialect.last_key(engine, table_name), None)
+
+    def context(self, dialect, connection, statement):
+        """Set up the context an INSERT would be executed in, short of executing it (the reader's read-only)."""
+        context = dialect.execution_ctx_cls.__new__(dialect.execution_ctx_cls)
+        context.dialect, context.root_connection = dialect, connection
+        context.compiled = statement.compile(dialect=dialect)
+        context.isinsert = context.compiled.isinsert
+        return context
+
+    def test_lastrowid(self):
+        engine = create_engine(f"paradox+native:///{self.directory}", lastrowid_from_index=True)
+        dialect = engine.dialect
+        is_(dialect.postfetch_lastrowid, True)
+        try:
+            with engine.connect() as connection:
+                eq_(self.context(dialect, connection, orders.insert()).get_lastrowid(), 300)
+
+                # Only for inserts into tables keyed by an autoincrementing integer
+                is_(self.context(dialect, connection, orders.update()).get_lastrowid(), None)
+                is_(self.context(dialect, connection, fruit.insert()).get_lastrowid(), None)
+                is_(self.context(dialect, connection, pairs.insert()).get_lastrowid(), None)
+
+                dialect.lastrowid_from_index = False
+                is_(self.context(dialect, connection, orders.insert()).get_lastrowid(), None)
+        finally:
+            engine.dispose()
@@ -0,0 +1,262 @@
+"""Tests for the native reader's parsing of Paradox table, index and BLOB files."""
+# coding=utf-8
+
+import os
+from decimal import Decimal
+
+from sqlalchemy.testing import fixtures, eq_, is_, assert_raises
+
+from sqlalchemy_paradox import pxfile
+
+from .paradox_files import EVERY_TYPE, EVERY_TYPE_ROWS, FileTest, write_secondary, write_table
+
+
+class DecoderTest(fixtures.TestBase):
+    def test_flipped_int(self):
+        eq_(pxfile.flipped_int(b"\x80\x00\x00\x2a"), 42)
+        eq_(pxfile.flipped_int(b"\x7f\xff\xff\xff"), -1)
+        eq_(pxfile.flipped_int(b"\x80\x00"), 0)
+        eq_(pxfile.flipped_int(b"\xff\xff"), 32767)
+        eq_(pxfile.flipped_int(b"\x00\x01"), -32767)
+        is_(pxfile.flipped_int(b"\x00\x00\x00\x00"), None)
+
+    def test_flipped_double(self):
+        eq_(pxfile.flipped_double(bytes.fromhex("bff0000000000000")), 1.0)
+        eq_(pxfile.flipped_double(bytes.fromhex("400fffffffffffff")), -1.0)
+        eq_(pxfile.flipped_double(bytes.fromhex("c009000000000000")), 3.125)
+        eq_(pxfile.flipped_double(bytes.fromhex("8000000000000000")), 0.0)
+        is_(pxfile.flipped_double(bytes(8)), None)
+
+    def test_decode_bcd(self):
+        eq_(pxfile.decode_bcd(bytes([0x82]) + bytes.fromhex("12345".rjust(32, "0")), 2), Decimal("123.45"))
+        eq_(pxfile.decode_bcd(bytes([0x02]) + bytes.fromhex("edcba".rjust(32, "f")), 2), Decimal("-123.45"))
+        eq_(pxfile.decode_bcd(bytes([0x80]) + bytes.fromhex("7".rjust(32, "0")), 0), Decimal("7"))
+        is_(pxfile.decode_bcd(bytes(17), 2), None)
+
+
+class HeaderTest(FileTest):
+    def test_parse_header(self):
+        path = write_table(self.directory, "Every", EVERY_TYPE, EVERY_TYPE_ROWS)
+        with open(path, "rb") as reader:
+            header = pxfile.parse_header(reader.read())
+
+        eq_(header.file_type, pxfile.NON_INDEXED_DB)
+        eq_(header.num_records, 4)
+        eq_(header.block_size, 0x800)
+        eq_(header.record_size, 68)
+        eq_(header.pk_fields, 0)
+        eq_(header.version, 0x0C)
+        eq_(header.encoding, "cp1252")
+        eq_(header.table_name, "Every")
+        eq_([field.name for field in header.fields], [name for name, _, _ in EVERY_TYPE])
+        eq_(header.fields[-1], pxfile.Field("Amount", pxfile.BCD, 2, 51, 17))
+        eq_(header.fields[-1].type_name, pxfile.TYPE_NAMES[pxfile.BCD])
+
+    def test_parse_old_header(self):
+        # Before version 5 there's no data header (and so no code page), and the table name takes 79 bytes
+        fields = [("ID", pxfile.LONG, 4), ("Name", pxfile.ALPHA, 8)]
+        path = write_table(self.directory, "Old", fields, [(1, "one")], key_fields=1, version=4)
+        table = self.open(path)
+
+        eq_(table.header.encoding, "cp437")
+        eq_(table.header.pk_fields, 1)
+        eq_(table.header.table_name, "Old")
+        eq_(table.fields, (pxfile.Field("ID", pxfile.LONG, 4, 0, 4), pxfile.Field("Name", pxfile.ALPHA, 8, 4, 8)))
+        eq_(list(table.records()), [(1, "one")])
+
+    def test_truncated_header(self):
+        assert_raises(ValueError, pxfile.parse_header, bytes(0x20))
+
+    def test_table_stats(self):
+        fields = [("ID", pxfile.LONG, 4), ("Name", pxfile.ALPHA, 10)]
+        rows = [(number, f"name {number}") for number in range(40)]
+        path = write_table(self.directory, "Stats", fields, rows, key_fields=1, per_block=4)
+        stats = pxfile.table_stats(path)
+
+        eq_(stats.rows, 40)
+        eq_(stats.blocks, 10)
+        eq_(stats.block_size, 0x800)
+        eq_(stats.record_size, 14)
+        eq_(stats.utilization, 40 / (10 * ((0x800 - 6) // 14)))
+        eq_(stats.size, os.path.getsize(path))
+        eq_(self.open(path).stats, stats)
+
+        assert_raises(ValueError, pxfile.table_stats, os.path.join(self.directory, "Stats.PX"))
+
+
+class RecordTest(FileTest):
+    def test_every_type(self):
+        table = self.open(write_table(self.directory, "Every", EVERY_TYPE, EVERY_TYPE_ROWS))
+        eq_(list(table.records()), EVERY_TYPE_ROWS)
+
+    def test_projected_fields(self):
+        table = self.open(write_table(self.directory, "Every", EVERY_TYPE, EVERY_TYPE_ROWS))
+        eq_(list(table.records(fields=[9, 0])), [(row[9], row[0]) for row in EVERY_TYPE_ROWS])
+
+    def test_blocks(self):
+        fields = [("ID", pxfile.LONG, 4)]
+        table = self.open(write_table(self.directory, "Blocks", fields, [(n,) for n in range(10)], per_block=3))
+
+        eq_(list(table.blocks()), [1, 2, 3, 4])
+        eq_([table.block_records(block)[1] for block in table.blocks()], [3, 3, 3, 1])
+        eq_(list(table.records([2, 4])), [(3,), (4,), (5,), (9,)])
+        eq_(list(table.records([2], reverse=True)), [(5,), (4,), (3,)])
+        eq_(table.find(table.blocks(), (7,)), (7,))
+        is_(table.find(table.blocks(), (10,)), None)
+
+
+class BlobTest(FileTest):
+    fields = [("ID", pxfile.LONG, 4), ("Notes", pxfile.MEMO, 20), ("Data", pxfile.BLOB, 20)]
+
+    def write(self, rows):
+        return self.open(write_table(self.directory, "Docs", self.fields, rows, key_fields=1))
+
+    def test_inline(self):
+        table = self.write([(1, "short", b"tiny"), (2, None, None)])
+        values = list(table.records())
+
+        eq_([pxfile.load(value) for value in values[0]], [1, "short", b"tiny"])
+        eq_(values[1], (2, None, None))
+        assert not os.path.exists(os.path.join(self.directory, "Docs.MB"))
+
+    def test_dedicated_blocks(self):
+        # Values too big to suballocate get a (type 2) block of their own
+        data = bytes(range(256)) * 12
+        table = self.write([(1, "x" * 3000, data)])
+        _, notes, blob = next(table.records())
+
+        eq_(blob.pointer & 0xFF, 0xFF)
+        eq_(table.blobs.data[blob.pointer & 0xFFFFFF00], 2)
+        eq_(str(notes), "x" * 3000)
+        eq_(bytes(blob), data)
+        eq_(bytes(blob.view()), data)
+        eq_(blob.open().read(), data)
+        eq_(len(blob), len(data))
+
+    def test_suballocated_blocks(self):
+        # Smaller values are packed into (type 3) blocks, 64 to a block
+        rows = [(number, f"note {number} " * 5, bytes([number]) * (20 + number)) for number in range(40)]
+        table = self.write(rows)
+        values = list(table.records())
+
+        eq_([(number, str(notes), bytes(blob)) for number, notes, blob in values], rows)
+
+        pointers = [value.pointer for _, notes, blob in values for value in (notes, blob)]
+        eq_({table.blobs.data[pointer & 0xFFFFFF00] for pointer in pointers}, {3})
+        eq_(len({pointer & 0xFFFFFF00 for pointer in pointers}), 2)
+        eq_(sorted(pointer & 0xFF for pointer in pointers)[:3], [0, 0, 1])
+
+    def test_unexpected_block_type(self):
+        table = self.write([(1, "y" * 100, None)])
+        # The .MB file's header block isn't one a value can be in
+        assert_raises(ValueError, table.blobs.locate, 0x01, 10)
+
+
+class IndexTreeTest(FileTest):
+    fields = [("ID", pxfile.LONG, 4), ("Name", pxfile.ALPHA, 10)]
+
+    def test_descend(self):
+        rows = [(number, f"name {number}") for number in range(1, 41)]
+        table = self.open(write_table(self.directory, "Keyed", self.fields, rows, 1, per_block=4, index_per_block=3))
+        tree = table.primary_index
+
+        eq_(tree.levels, 3)
+        eq_(len(tree.key_fields), 1)
+        eq_(list(tree.data_blocks()), list(range(1, 11)))
+        eq_(list(tree.data_blocks((9,), (16,))), [3, 4])
+        eq_(list(tree.data_blocks((9,), (16,), reverse=True)), [4, 3])
+        eq_(list(tree.data_blocks((41,))), [10])
+        eq_(list(tree.data_blocks(high=(0,))), [])
+        for number in range(1, 41):
+            eq_(table.find(tree.data_blocks((number,), (number,)), (number,)), rows[number - 1])
+
+    def test_partial_key(self):
+        fields = [("Grp", pxfile.SHORT, 2), ("Seq", pxfile.LONG, 4)]
+        rows = [(group, seq) for group in range(1, 6) for seq in range(7)]
+        table = self.open(write_table(self.directory, "Pairs", fields, rows, 2, per_block=3, index_per_block=2))
+        tree = table.primary_index
+
+        eq_(tree.levels, 4)
+        for group in range(1, 6):
+            found = [row for row in table.records(tree.data_blocks((group,), (group,))) if row[0] == group]
+            eq_(found, [row for row in rows if row[0] == group])
+
+    def test_not_an_index(self):
+        table = self.open(write_table(self.directory, "Keyed", self.fields, [(1, "one")], 1))
+        assert_raises(ValueError, pxfile.IndexTree, table.path, table)
+
+
+class SecondaryIndexTest(FileTest):
+    fields = [("ID", pxfile.LONG, 4), ("Name", pxfile.ALPHA, 10)]
+
+    def write(self, names, **kwargs):
+        rows = [(number, name) for number, name in enumerate(names, 1)]
+        kwargs.setdefault("per_block", 1)
+        kwargs.setdefault("index_per_block", 3)
+        table = self.open(write_table(self.directory, "People", self.fields, rows, 1, per_block=2))
+        write_secondary(self.directory, "People", self.fields, rows, 1, 1, table_per_block=2, **kwargs)
+        return table
+
+    def test_lookup(self):
+        # The first block's keys are only in order case-insensitively, so that's found when it's opened
+        names = ["carol", "alice", "Bob", None, "bob", "dave", "Alice"]
+        table = self.write(names, fold=True)
+        index, = table.secondary_indexes
+
+        is_(index.tree.fold, True)
+        eq_(index.fields, ["Name"])
+        eq_(index.name, "Name")
+        eq_(index.hint, 2)
+        is_(index.stale, False)
+        eq_(list(index.records(("BOB",), ("BOB",))), [(3, "Bob"), (5, "bob")])
+        eq_(list(index.records(("b",), ("c",))), [(3, "Bob"), (5, "bob")])
+        eq_([row[1] for row in index.records()], [None, "alice", "Alice", "Bob", "bob", "carol", "dave"])
+
+    def test_duplicates(self):
+        # Equal values can run on across several of the .Xnn file's blocks
+        table = self.write(["bob", "al", "bob", "bob", "cy", "al"])
+        index, = table.secondary_indexes
+
+        eq_(list(index.records(("bob",), ("bob",))), [(1, "bob"), (3, "bob"), (4, "bob")])
+        eq_(list(index.records(("al",), ("al",))), [(2, "al"), (6, "al")])
+        eq_(list(index.records(low=("bob",))), [(1, "bob"), (3, "bob"), (4, "bob"), (5, "cy")])
+
+    def test_without_hints(self):
+        # Records are found through the primary index instead
+        table = self.write(["carol", "Alice", "bob", "dave"], hint=False)
+        index, = table.secondary_indexes
+
+        is_(index.hint, None)
+        eq_(list(index.records(("bob",), ("dave",))), [(3, "bob"), (1, "carol"), (4, "dave")])
+
+    def test_folded_on_first_lookup(self):
+        # The first and last paths are in order either way, the middle block only case-insensitively
+        names = ["a1", "a2", "a3", "ba", "Bb", "bc", "c1", "c2", "c3"]
+        table = self.write(names, fold=True)
+        index, = table.secondary_indexes
+        is_(index.tree.fold, False)
+
+        assert_raises(pxfile.IndexOrderError, list, index.records(("bb",), ("bb",)))
+        is_(index.tree.fold, True)
+        is_(index.tree.disordered, False)
+        is_(index.stale, False)
+        eq_(list(index.records(("bb",), ("bb",))), [(5, "Bb")])
+
+    def test_disordered(self):
+        names = ["a1", "a2", "a3", "bc", "bb", "ba", "c1", "c2", "c3"]
+        # The middle block's keys are out of order even case-insensitively
+        table = self.write(names, order=lambda entry: names.index(entry[0]))
+        index, = table.secondary_indexes
+
+        assert_raises(pxfile.IndexOrderError, list, index.records(("bc",), ("bc",)))
+        assert_raises(pxfile.IndexOrderError, list, index.records(("bc",), ("bc",)))
+        is_(index.tree.disordered, True)
+        is_(index.stale, True)
+        assert_raises(pxfile.IndexOrderError, list, index.tree.data_blocks())
+
+    def test_out_of_date(self):
+        table = self.write(["carol", "Alice", "bob"])
+        # An index holding fewer records than its table no longer describes it
+        write_secondary(self.directory, "People", self.fields, [(1, "carol")], 1, 1)
+        index, = self.open(table.path).secondary_indexes
+        is_(index.stale, True)
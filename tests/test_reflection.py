@@ -0,0 +1,210 @@
+"""Tests for the dialect's reflection and catalog calls, through the paradox+native driver over synthetic tables."""
+# coding=utf-8
+
+import shutil
+import tempfile
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, inspect
+from sqlalchemy.testing import fixtures, eq_, is_
+
+from sqlalchemy_paradox import dbapi, pxfile
+from sqlalchemy_paradox.watcher import CREATED, TableChange
+
+from .paradox_files import write_secondary, write_table
+
+
+FIELDS = [("ID", pxfile.LONG, 4), ("Name", pxfile.ALPHA, 10)]
+
+NAMES = ["Alpha", "Bravo", "Charlie", "Delta", "Echo"]
+
+
+@contextmanager
+def opened_cursors():
+    """Collect the native DBAPI connections that cursors are opened on (and the cursors) while the block runs."""
+    cursors = list()
+    original = dbapi.Connection.cursor
+
+    def cursor(connection):
+        opened = original(connection)
+        cursors.append((connection, opened))
+        return opened
+
+    dbapi.Connection.cursor = cursor
+    try:
+        yield cursors
+    finally:
+        dbapi.Connection.cursor = original
+
+
+@contextmanager
+def catalog_calls(*methods):
+    """Count the calls made to some of the native DBAPI cursor's catalog methods while the block runs."""
+    calls = Counter()
+
+    def counted(method):
+        original = getattr(dbapi.Cursor, method)
+
+        def count(self, *args, **kwargs):
+            calls[method] += 1
+            return original(self, *args, **kwargs)
+
+        return original, count
+
+    originals = dict()
+    for method in methods:
+        originals[method], replacement = counted(method)
+        setattr(dbapi.Cursor, method, replacement)
+    try:
+        yield calls
+    finally:
+        for method, original in originals.items():
+            setattr(dbapi.Cursor, method, original)
+
+
+class CatalogTest(fixtures.TestBase):
+    """A directory of keyed tables, read through a paradox+native engine."""
+
+    @classmethod
+    def setup_class(cls):
+        cls.directory = tempfile.mkdtemp(prefix="paradox-")
+        for name in NAMES:
+            rows = [(1, name.lower()), (2, name.upper())]
+            write_table(cls.directory, name, FIELDS, rows, 1)
+            if name == "Alpha":
+                write_secondary(cls.directory, name, FIELDS, rows, 1, 1)
+
+    @classmethod
+    def teardown_class(cls):
+        shutil.rmtree(cls.directory, ignore_errors=True)
+
+    def setup_method(self, method):
+        self.engine = create_engine(f"paradox+native:///{self.directory}")
+
+    def teardown_method(self, method):
+        self.engine.dispose()
+
+    @staticmethod
+    def metadata(names=NAMES):
+        """Describe (some of) the directory's tables."""
+        metadata = MetaData()
+        for name in names:
+            Table(name, metadata, Column("ID", Integer, primary_key=True), Column("Name", String(10)))
+        return metadata
+
+
+class HasTableTest(CatalogTest):
+    def test_create_all(self):
+        # Every table exists, so nothing's created, but each one's looked for first
+        with catalog_calls("tables") as calls:
+            self.metadata().create_all(self.engine)
+        eq_(calls["tables"], 1)
+
+    def test_listing(self):
+        dialect = self.engine.dialect
+        with self.engine.connect() as connection, catalog_calls("tables") as calls:
+            is_(dialect.has_table(connection, "alpha"), True)
+            is_(dialect.has_table(connection, "ECHO"), True)
+            is_(dialect.has_table(connection, "Foxtrot"), False)
+            eq_(calls["tables"], 1)
+
+            dialect._drop_table_listing(connection)
+            is_(dialect.has_table(connection, "Alpha"), True)
+            eq_(calls["tables"], 2)
+
+            # A table created by anything else is picked up once a SchemaWatcher's reported it
+            dialect._schema_changed(self.directory, TableChange("Foxtrot", CREATED))
+            is_(dialect.has_table(connection, "Alpha"), True)
+            eq_(calls["tables"], 3)
+
+        with self.engine.connect() as connection, catalog_calls("tables") as calls:
+            is_(dialect.has_table(connection, "Alpha"), True)
+            eq_(calls["tables"], 1)
+
+
+class CatalogCursorTest(CatalogTest):
+    def test_reflect_table(self):
+        # Every catalog call made while reflecting a table shares one cursor, on the connection reflected through
+        with self.engine.connect() as connection, opened_cursors() as cursors:
+            table = Table("Alpha", MetaData(), autoload_with=connection)
+            eq_(len(cursors), 1)
+            is_(cursors[0][0], connection.connection.connection)
+            is_(cursors[0][1].connection, None)
+            is_("paradox_catalog_cursor" in connection.info, False)
+
+        eq_([column.name for column in table.primary_key], ["ID"])
+        eq_(len(table.indexes), 1)
+
+    def test_separate_calls(self):
+        # Outside of reflecting a whole table, each call opens (and closes) a cursor of its own
+        with self.engine.connect() as connection, opened_cursors() as cursors:
+            inspector = inspect(connection)
+            eq_(sorted(inspector.get_table_names()), NAMES)
+            eq_(inspector.get_pk_constraint("Bravo")["constrained_columns"], ["ID"])
+            eq_(len(cursors), 2)
+            for dbapi_connection, cursor in cursors:
+                is_(dbapi_connection, connection.connection.connection)
+                is_(cursor.connection, None)
+
+        with opened_cursors() as cursors:
+            eq_(len(inspect(self.engine).get_columns("Charlie")), 2)
+            eq_(len(cursors), 1)
+            is_(cursors[0][1].connection, None)
+
+
+class MultiColumnsTest(CatalogTest):
+    def test_single_call(self):
+        dialect = self.engine.dialect
+        with self.engine.connect() as connection, catalog_calls("columns") as calls:
+            inspector = inspect(connection)
+            reflected = dict(dialect.get_multi_columns(connection, info_cache=inspector.info_cache))
+            eq_(calls["columns"], 1)
+            eq_(sorted(name for _, name in reflected), NAMES)
+            for columns in reflected.values():
+                eq_([column["name"] for column in columns], ["ID", "Name"])
+
+            # Each table's columns are then served from the Inspector's cache, by any case of its name
+            for name in NAMES:
+                eq_(inspector.get_columns(name.upper()), reflected[(None, name)])
+            eq_(calls["columns"], 1)
+
+    def test_filter_names(self):
+        dialect = self.engine.dialect
+        with self.engine.connect() as connection, catalog_calls("columns", "tables") as calls:
+            reflected = dialect.get_multi_columns(connection, filter_names=["alpha", "Echo"])
+        eq_([name for (_, name), _ in reflected], ["alpha", "Echo"])
+        eq_(dict(calls), {"columns": 1})
+
+
+class ReflectTest(CatalogTest):
+    def test_keys_and_indexes(self):
+        # Each table's primary key and indexes take a catalog call of their own, made on several connections at once
+        barrier, lock, threads = threading.Barrier(2, timeout=5), threading.Lock(), list()
+        metadata = MetaData()
+        with catalog_calls("columns", "primaryKeys", "statistics") as calls:
+            primary_keys = dbapi.Cursor.primaryKeys
+
+            def concurrent(cursor, *args, **kwargs):
+                with lock:
+                    threads.append(threading.current_thread().name)
+                    first = len(threads) <= 2
+                if first:
+                    # The first two lookups only return once they're both under way
+                    barrier.wait()
+                return primary_keys(cursor, *args, **kwargs)
+
+            dbapi.Cursor.primaryKeys = concurrent
+            try:
+                metadata.reflect(self.engine)
+            finally:
+                dbapi.Cursor.primaryKeys = primary_keys
+
+        eq_(dict(calls), {"columns": 1, "primaryKeys": len(NAMES), "statistics": len(NAMES)})
+        assert all(name.startswith("paradox-reflect") for name in threads), threads
+        eq_(sorted(metadata.tables), NAMES)
+        for table in metadata.tables.values():
+            eq_([column.name for column in table.primary_key], ["ID"])
+        eq_([[column.name for column in index.columns] for index in metadata.tables["Alpha"].indexes], [["Name"]])
+        eq_(metadata.tables["Bravo"].indexes, set())
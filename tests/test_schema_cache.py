@@ -0,0 +1,103 @@
+"""Tests for the persistent reflection cache, against synthetic tables."""
+# coding=utf-8
+
+import os
+import threading
+
+from sqlalchemy.testing import eq_, is_
+
+from sqlalchemy_paradox import pxfile
+from sqlalchemy_paradox.schema_cache import ReflectionCache
+
+from .paradox_files import FileTest, write_table
+
+
+FIELDS = [("ID", pxfile.LONG, 4), ("Name", pxfile.ALPHA, 10)]
+
+COLUMNS = [{"name": "ID", "nullable": True}, {"name": "Name", "nullable": True}]
+
+
+class ReflectionCacheTest(FileTest):
+    def setup_method(self, method):
+        super(ReflectionCacheTest, self).setup_method(method)
+        self.tables = os.path.join(self.directory, "tables")
+        self.cache_dir = os.path.join(self.directory, "cache")
+        os.mkdir(self.tables)
+        self.write(2)
+
+    def write(self, rows):
+        return write_table(self.tables, "People", FIELDS, [(number, "name") for number in range(rows)], 1)
+
+    def cache(self):
+        return ReflectionCache(self.tables, self.cache_dir)
+
+    def test_unpicklable(self):
+        # Whatever can't be pickled just isn't persisted, and leaves nothing behind
+        cache = self.cache()
+        cache.put("People", "get_columns", threading.Lock())
+        cache.flush()
+        is_(cache.dirty, True)
+        eq_(os.listdir(self.cache_dir), [])
+
+        cache.put("People", "get_columns", COLUMNS)
+        cache.flush()
+        is_(cache.dirty, False)
+        eq_(os.listdir(self.cache_dir), [cache.path.name])
+
+    def test_round_trip(self):
+        cache = self.cache()
+        is_(cache.get("People", "get_columns"), None)
+        cache.put("People", "get_columns", COLUMNS)
+        cache.put("Nobody", "get_columns", COLUMNS)
+        cache.flush()
+
+        # A new process (or dialect) finds what the last one reflected, by any case of the table's name
+        cache = self.cache()
+        eq_(cache.get("PEOPLE", "get_columns"), COLUMNS)
+        is_(cache.get("People", "get_indexes"), None)
+        # Tables without a .DB file aren't cached at all
+        is_(cache.get("Nobody", "get_columns"), None)
+
+        # Each directory gets a cache file of its own
+        other = os.path.join(self.directory, "other")
+        os.mkdir(other)
+        is_(ReflectionCache(other, self.cache_dir).get("People", "get_columns"), None)
+
+    def test_size_changed(self):
+        cache = self.cache()
+        cache.put("People", "get_columns", COLUMNS)
+        cache.flush()
+
+        self.write(200)
+        is_(self.cache().get("People", "get_columns"), None)
+
+    def test_mtime_changed(self):
+        cache = self.cache()
+        cache.put("People", "get_columns", COLUMNS)
+        cache.flush()
+
+        path = os.path.join(self.tables, "People.PX")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        is_(self.cache().get("People", "get_columns"), None)
+
+    def test_watched(self):
+        # While a SchemaWatcher's invalidating tables as they change, their files are only stat'ed once
+        cache = self.cache()
+        cache.watched = True
+        cache.put("People", "get_columns", COLUMNS)
+        self.write(200)
+        eq_(cache.get("People", "get_columns"), COLUMNS)
+
+        cache.invalidate("People")
+        is_(cache.get("People", "get_columns"), None)
+        cache.flush()
+
+    def test_unreadable(self):
+        os.mkdir(self.cache_dir)
+        cache = self.cache()
+        cache.path.write_bytes(b"not a pickle")
+        is_(cache.get("People", "get_columns"), None)
+        cache.put("People", "get_columns", COLUMNS)
+        cache.flush()
+        eq_(self.cache().get("People", "get_columns"), COLUMNS)
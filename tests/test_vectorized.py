@@ -0,0 +1,162 @@
+"""Tests for the native reader's NumPy column-at-a-time decoding."""
+# coding=utf-8
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from sqlalchemy.testing import eq_, assert_raises
+
+from sqlalchemy_paradox import pxfile, vectorized
+
+from .paradox_files import EVERY_TYPE, EVERY_TYPE_ROWS, FileTest, write_table
+
+numpy = pytest.importorskip("numpy")
+
+
+FIELDS = [
+    ("ID", pxfile.LONG, 4),
+    ("Name", pxfile.ALPHA, 8),
+    ("Small", pxfile.SHORT, 2),
+    ("Price", pxfile.MONEY, 8),
+    ("Born", pxfile.DATE, 4),
+]
+
+ROWS = [
+    (
+        number,
+        None if number % 7 == 0 else f"{'ab' if number % 3 else 'ba'}{number}",
+        None if number % 5 == 0 else number - 15,
+        None if number % 4 == 0 else number * 1.5,
+        None if number % 6 == 0 else date(1999, 12, 1 + number),
+    )
+    for number in range(1, 31)
+]
+
+OPERATORS = {
+    "eq": lambda left, right: left == right,
+    "ne": lambda left, right: left != right,
+    "lt": lambda left, right: left < right,
+    "le": lambda left, right: left <= right,
+    "gt": lambda left, right: left > right,
+    "ge": lambda left, right: left >= right,
+}
+
+
+def matches(predicate, row):
+    """Evaluate a `block_mask` predicate against a row decoded in Python, blanks matching no comparison."""
+    kind = predicate[0]
+    if kind == "and":
+        return all(matches(each, row) for each in predicate[1:])
+    if kind == "or":
+        return any(matches(each, row) for each in predicate[1:])
+    if kind == "not":
+        return not matches(predicate[1], row)
+
+    value = row[[name.casefold() for name, _, _ in FIELDS].index(predicate[1])]
+    if kind == "null":
+        return value is None
+    if value is None:
+        return False
+    if kind == "in":
+        return value in predicate[2]
+    if kind == "prefix":
+        return value.encode("cp1252").startswith(predicate[2])
+    return OPERATORS[predicate[2]](value, predicate[3])
+
+
+class DecodeTest(FileTest):
+    def test_record_dtype(self):
+        table = self.open(write_table(self.directory, "Every", EVERY_TYPE, EVERY_TYPE_ROWS))
+        dtype = vectorized.record_dtype(table.fields, table.header.record_size)
+
+        eq_(dtype.itemsize, 68)
+        eq_(dtype.names, tuple(f"f{number}" for number in range(10)))
+        eq_([dtype.fields[name][1] for name in dtype.names], [field.offset for field in table.fields])
+        eq_(
+            [dtype.fields[name][0].str for name in dtype.names],
+            [">u4", "|S12", ">u2", ">u8", ">u8", "|u1", ">u4", ">u4", ">u8", "|V17"],
+        )
+
+    def test_decode_column(self):
+        table = self.open(write_table(self.directory, "Every", EVERY_TYPE, EVERY_TYPE_ROWS))
+        columns = next(vectorized.column_batches(table))
+
+        eq_(
+            [columns[name].dtype.str.lstrip("<>=|") for name, _, _ in EVERY_TYPE],
+            ["i4", "U12", "i2", "f8", "f8", "b1", "M8[D]", "m8[ms]", "M8[us]", "O"],
+        )
+        for name, _, _ in EVERY_TYPE[1:]:
+            eq_(list(numpy.ma.getmaskarray(columns[name])), [False, False, True, False])
+
+        eq_(columns["Small"].data[[0, 3]].tolist(), [-3, 32767])
+        eq_(columns["Born"][0], numpy.datetime64("1999-12-31"))
+        eq_(columns["Stamp"][0], numpy.datetime64("2001-02-03T04:05:06"))
+        eq_(columns["Alarm"][0], numpy.timedelta64((23 * 60 + 59) * 60 + 58, "s"))
+        eq_(columns["Amount"][0], Decimal("-123.45"))
+
+    def test_records_match_row_decoders(self):
+        table = self.open(write_table(self.directory, "Every", EVERY_TYPE, EVERY_TYPE_ROWS * 3, per_block=2))
+        expected = list(table.records())
+
+        eq_(list(vectorized.records(table, batch_blocks=2)), expected)
+        eq_(list(vectorized.records(table, blocks=[4, 2])), list(table.records([4, 2])))
+        eq_(list(vectorized.records(table, fields=[8, 1])), [(row[8], row[1]) for row in expected])
+        eq_(list(vectorized.records(table, fields=[])), [()] * len(expected))
+
+    def test_blob_columns(self):
+        fields = [("ID", pxfile.LONG, 4), ("Notes", pxfile.MEMO, 14)]
+        rows = [(number, None if number % 3 == 0 else "memo " * number) for number in range(1, 10)]
+        table = self.open(write_table(self.directory, "Docs", fields, rows))
+
+        eq_([tuple(map(pxfile.load, row)) for row in vectorized.records(table)], rows)
+
+    def test_missing_blocks(self):
+        table = self.open(write_table(self.directory, "Every", EVERY_TYPE, EVERY_TYPE_ROWS))
+        assert_raises(ValueError, vectorized.block_rows, table, [1, 2])
+
+
+class BlockMaskTest(FileTest):
+    predicates = [
+        ("compare", "id", "eq", 7),
+        ("compare", "small", "lt", 0),
+        ("compare", "small", "lt", 100000),
+        ("compare", "price", "ge", 30.0),
+        ("compare", "born", "gt", date(1999, 12, 20)),
+        ("compare", "name", "ne", "ab4"),
+        ("in", "id", (1, 5, 99)),
+        ("in", "name", ("ab2", "ba3", "zz")),
+        ("prefix", "name", b"ba"),
+        ("prefix", "name", b"much too long"),
+        ("null", "price"),
+        ("not", ("null", "born")),
+        ("not", ("compare", "id", "gt", 10)),
+        ("and", ("compare", "id", "gt", 10), ("or", ("null", "small"), ("compare", "price", "lt", 30.0))),
+        ("and",),
+        ("or",),
+    ]
+
+    def test_block_mask(self):
+        table = self.open(write_table(self.directory, "Masked", FIELDS, ROWS, per_block=4))
+        rows = vectorized.block_rows(table, list(table.blocks()))
+        columns = vectorized.Columns(table, vectorized.record_dtype(table.fields, table.header.record_size), rows)
+
+        for predicate in self.predicates:
+            mask = vectorized.block_mask(predicate, table, rows, columns)
+            eq_(mask.tolist(), [matches(predicate, row) for row in ROWS], predicate)
+
+    def test_filtered_records(self):
+        table = self.open(write_table(self.directory, "Masked", FIELDS, ROWS, per_block=4))
+
+        for predicate in self.predicates:
+            eq_(
+                list(vectorized.records(table, batch_blocks=3, where=predicate)),
+                [row for row in table.records() if matches(predicate, row)],
+                predicate,
+            )
+
+    def test_unknown_predicate(self):
+        table = self.open(write_table(self.directory, "Masked", FIELDS, ROWS))
+        rows = vectorized.block_rows(table, [1])
+        columns = vectorized.Columns(table, vectorized.record_dtype(table.fields, table.header.record_size), rows)
+        assert_raises(ValueError, vectorized.block_mask, ("like", "name", "a%"), table, rows, columns)
@@ -0,0 +1,126 @@
+"""Tests for detecting changes to a directory's tables, against synthetic tables."""
+# coding=utf-8
+
+import os
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.testing import eq_, is_
+
+from sqlalchemy_paradox import pxfile
+from sqlalchemy_paradox.watcher import CREATED, DATA, DROPPED, STRUCTURE, SchemaWatcher, TableChange
+
+from .paradox_files import FileTest, write_secondary, write_table
+
+
+FIELDS = [("ID", pxfile.LONG, 4), ("Name", pxfile.ALPHA, 10)]
+
+
+class SchemaWatcherTest(FileTest):
+    def setup_method(self, method):
+        super(SchemaWatcherTest, self).setup_method(method)
+        self.write("Alpha")
+        self.write("Bravo")
+        self.watchers = list()
+
+    def teardown_method(self, method):
+        for watcher in self.watchers:
+            watcher.stop()
+        super(SchemaWatcherTest, self).teardown_method(method)
+
+    def write(self, name, fields=FIELDS, rows=2):
+        values = [(number, "name", "notes")[: len(fields)] for number in range(rows)]
+        return write_table(self.directory, name, fields, values, 1)
+
+    def watch(self, backend="poll"):
+        # Polling only every minute leaves the checking to each test. With inotify,
+        # the interval is just how often it notices being stopped
+        interval = 60 if backend == "poll" else 0.1
+        watcher = SchemaWatcher(self.directory, interval=interval, backend=backend).start()
+        self.watchers.append(watcher)
+        return watcher
+
+    def test_unchanged(self):
+        watcher = self.watch()
+        eq_(watcher.check(), [])
+
+    def test_data(self):
+        watcher = self.watch()
+        self.write("Alpha", rows=200)
+        eq_(watcher.check(), [TableChange("Alpha", DATA)])
+        eq_(watcher.check(), [])
+
+        # As is a change to (or the appearance of) a table's blob file alone
+        with open(os.path.join(self.directory, "Bravo.MB"), "ab") as writer:
+            writer.write(bytes(0x1000))
+        eq_(watcher.check(), [TableChange("Bravo", DATA)])
+
+    def test_structure(self):
+        watcher = self.watch()
+        self.write("Alpha", FIELDS + [("Notes", pxfile.ALPHA, 20)])
+        eq_(watcher.check(), [TableChange("Alpha", STRUCTURE)])
+
+        # Indexes appearing or disappearing change a table's structure, if not its .DB file
+        write_secondary(self.directory, "Bravo", FIELDS, [(0, "name"), (1, "name")], 1, 1)
+        eq_(watcher.check(), [TableChange("Bravo", STRUCTURE)])
+        os.remove(os.path.join(self.directory, "Bravo.X01"))
+        os.remove(os.path.join(self.directory, "Bravo.Y01"))
+        eq_(watcher.check(), [TableChange("Bravo", STRUCTURE)])
+
+    def test_created_and_dropped(self):
+        watcher = self.watch()
+        self.write("Charlie")
+        for extension in ("DB", "PX"):
+            os.remove(os.path.join(self.directory, f"Alpha.{extension}"))
+        eq_(watcher.check(), [TableChange("Alpha", DROPPED), TableChange("Charlie", CREATED)])
+
+    def test_subscribers(self):
+        # A subscriber that fails is skipped, without stopping the others from hearing about the change
+        watcher, heard = self.watch(), list()
+
+        def fail(change):
+            raise RuntimeError(change)
+
+        watcher.subscribe(fail)
+        watcher.subscribe(heard.append)
+        self.write("Alpha", rows=200)
+        eq_(watcher.check(), [TableChange("Alpha", DATA)])
+        eq_(heard, [TableChange("Alpha", DATA)])
+
+        watcher.unsubscribe(heard.append)
+        self.write("Alpha", rows=300)
+        watcher.check()
+        eq_(len(heard), 1)
+
+    def test_inotify(self):
+        watcher, heard = self.watch("inotify"), list()
+        watcher.subscribe(heard.append)
+        self.write("Charlie")
+
+        deadline = time.monotonic() + 5
+        while not heard and time.monotonic() < deadline:
+            time.sleep(0.05)
+        eq_(heard, [TableChange("Charlie", CREATED)])
+
+    def test_dialect(self):
+        # A dialect watching its directory forgets what it's reflected about tables whose structure changes
+        engine = create_engine(f"paradox+native:///{self.directory}")
+        dialect = engine.dialect
+        try:
+            watcher = dialect.watch_schema(engine, interval=60)
+            self.watchers.append(watcher)
+            is_(dialect.watch_schema(engine), watcher)
+
+            self.write("Alpha", rows=200)
+            watcher.check()
+            eq_((dialect.schema_generation("alpha"), dialect.schema_generation()), (0, 0))
+
+            self.write("Alpha", FIELDS + [("Notes", pxfile.ALPHA, 20)])
+            watcher.check()
+            eq_((dialect.schema_generation("alpha"), dialect.schema_generation()), (1, 0))
+
+            self.write("Charlie")
+            watcher.check()
+            eq_((dialect.schema_generation("CHARLIE"), dialect.schema_generation()), (1, 1))
+        finally:
+            engine.dispose()